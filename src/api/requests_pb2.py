@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='open_vario',
   syntax='proto3',
   serialized_options=_b('H\003'),
-  serialized_pb=_b('\n\x0erequests.proto\x12\nopen_vario\"\x9a\x01\n\x0e\x43onnectRequest\x12N\n\x15notification_endpoint\x18\x01 \x01(\x0b\x32/.open_vario.ConnectRequest.NotificationEndpoint\x1a\x38\n\x14NotificationEndpoint\x12\x12\n\nip_address\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\r\"\x13\n\x11\x44isconnectRequest\"\x14\n\x12ListSensorsRequest\"\xb3\x01\n\x13UpdateSensorRequest\x12\n\n\x02id\x18\x01 \x01(\r\x12\x14\n\nuint_value\x18\x02 \x01(\rH\x00\x12\x13\n\tint_value\x18\x03 \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x04 \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\x05 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x06 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x07 \x01(\x08H\x00\x42\x08\n\x06Values\"\x1d\n\x0bPingRequest\x12\x0e\n\x06number\x18\x01 \x01(\r\"\xcf\x01\n\x17\x43onfigValueWriteRequest\x12\x10\n\x08group_id\x18\x01 \x01(\r\x12\x10\n\x08value_id\x18\x02 \x01(\r\x12\x14\n\nuint_value\x18\x03 \x01(\rH\x00\x12\x13\n\tint_value\x18\x04 \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x05 \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\x06 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x07 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x08 \x01(\x08H\x00\x42\x08\n\x06Values\"<\n\x16\x43onfigValueReadRequest\x12\x10\n\x08group_id\x18\x01 \x01(\r\x12\x10\n\x08value_id\x18\x02 \x01(\r\"\x90\x03\n\x0bSimuRequest\x12-\n\x07\x63onnect\x18\x01 \x01(\x0b\x32\x1a.open_vario.ConnectRequestH\x00\x12\x33\n\ndisconnect\x18\x02 \x01(\x0b\x32\x1d.open_vario.DisconnectRequestH\x00\x12\x36\n\x0clist_sensors\x18\x03 \x01(\x0b\x32\x1e.open_vario.ListSensorsRequestH\x00\x12\x38\n\rupdate_sensor\x18\x04 \x01(\x0b\x32\x1f.open_vario.UpdateSensorRequestH\x00\x12\'\n\x04ping\x18\x05 \x01(\x0b\x32\x17.open_vario.PingRequestH\x00\x12;\n\x0c\x63onfig_write\x18\x06 \x01(\x0b\x32#.open_vario.ConfigValueWriteRequestH\x00\x12\x39\n\x0b\x63onfig_read\x18\x07 \x01(\x0b\x32\".open_vario.ConfigValueReadRequestH\x00\x42\n\n\x08RequestsB\x02H\x03\x62\x06proto3')
+  serialized_pb=_b('\n\x0erequests.proto\x12\nopen_vario\"\x9a\x01\n\x0e\x43onnectRequest\x12N\n\x15notification_endpoint\x18\x01 \x01(\x0b\x32/.open_vario.ConnectRequest.NotificationEndpoint\x1a\x38\n\x14NotificationEndpoint\x12\x12\n\nip_address\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\r\"\x13\n\x11\x44isconnectRequest\"\x14\n\x12ListSensorsRequest\"\xb3\x01\n\x13UpdateSensorRequest\x12\n\n\x02id\x18\x01 \x01(\r\x12\x14\n\nuint_value\x18\x02 \x01(\rH\x00\x12\x13\n\tint_value\x18\x03 \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x04 \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\x05 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x06 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x07 \x01(\x08H\x00\x42\x08\n\x06Values\"H\n\x14UpdateSensorsRequest\x12\x30\n\x07sensors\x18\x01 \x03(\x0b\x32\x1f.open_vario.UpdateSensorRequest\"\x1d\n\x0bPingRequest\x12\x0e\n\x06number\x18\x01 \x01(\r\"\xcf\x01\n\x17\x43onfigValueWriteRequest\x12\x10\n\x08group_id\x18\x01 \x01(\r\x12\x10\n\x08value_id\x18\x02 \x01(\r\x12\x14\n\nuint_value\x18\x03 \x01(\rH\x00\x12\x13\n\tint_value\x18\x04 \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x05 \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\x06 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x07 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x08 \x01(\x08H\x00\x42\x08\n\x06Values\"<\n\x16\x43onfigValueReadRequest\x12\x10\n\x08group_id\x18\x01 \x01(\r\x12\x10\n\x08value_id\x18\x02 \x01(\r\"\xcc\x03\n\x0bSimuRequest\x12-\n\x07\x63onnect\x18\x01 \x01(\x0b\x32\x1a.open_vario.ConnectRequestH\x00\x12\x33\n\ndisconnect\x18\x02 \x01(\x0b\x32\x1d.open_vario.DisconnectRequestH\x00\x12\x36\n\x0clist_sensors\x18\x03 \x01(\x0b\x32\x1e.open_vario.ListSensorsRequestH\x00\x12\x38\n\rupdate_sensor\x18\x04 \x01(\x0b\x32\x1f.open_vario.UpdateSensorRequestH\x00\x12\'\n\x04ping\x18\x05 \x01(\x0b\x32\x17.open_vario.PingRequestH\x00\x12;\n\x0c\x63onfig_write\x18\x06 \x01(\x0b\x32#.open_vario.ConfigValueWriteRequestH\x00\x12\x39\n\x0b\x63onfig_read\x18\x07 \x01(\x0b\x32\".open_vario.ConfigValueReadRequestH\x00\x12:\n\x0eupdate_sensors\x18\x08 \x01(\x0b\x32 .open_vario.UpdateSensorsRequestH\x00\x42\n\n\x08RequestsB\x02H\x03\x62\x06proto3')
 )
 
 
@@ -217,6 +217,37 @@ _UPDATESENSORREQUEST = _descriptor.Descriptor(
 )
 
 
+_UPDATESENSORSREQUEST = _descriptor.Descriptor(
+  name='UpdateSensorsRequest',
+  full_name='open_vario.UpdateSensorsRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='sensors', full_name='open_vario.UpdateSensorsRequest.sensors', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=412,
+  serialized_end=484,
+)
+
+
 _PINGREQUEST = _descriptor.Descriptor(
   name='PingRequest',
   full_name='open_vario.PingRequest',
@@ -243,8 +274,8 @@ _PINGREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=412,
-  serialized_end=441,
+  serialized_start=486,
+  serialized_end=515,
 )
 
 
@@ -326,8 +357,8 @@ _CONFIGVALUEWRITEREQUEST = _descriptor.Descriptor(
       name='Values', full_name='open_vario.ConfigValueWriteRequest.Values',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=444,
-  serialized_end=651,
+  serialized_start=518,
+  serialized_end=725,
 )
 
 
@@ -364,8 +395,8 @@ _CONFIGVALUEREADREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=653,
-  serialized_end=713,
+  serialized_start=727,
+  serialized_end=787,
 )
 
 
@@ -425,6 +456,13 @@ _SIMUREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='update_sensors', full_name='open_vario.SimuRequest.update_sensors', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -440,8 +478,8 @@ _SIMUREQUEST = _descriptor.Descriptor(
       name='Requests', full_name='open_vario.SimuRequest.Requests',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=716,
-  serialized_end=1116,
+  serialized_start=790,
+  serialized_end=1250,
 )
 
 _CONNECTREQUEST_NOTIFICATIONENDPOINT.containing_type = _CONNECTREQUEST
@@ -464,6 +502,7 @@ _UPDATESENSORREQUEST.fields_by_name['string_value'].containing_oneof = _UPDATESE
 _UPDATESENSORREQUEST.oneofs_by_name['Values'].fields.append(
   _UPDATESENSORREQUEST.fields_by_name['bool_value'])
 _UPDATESENSORREQUEST.fields_by_name['bool_value'].containing_oneof = _UPDATESENSORREQUEST.oneofs_by_name['Values']
+_UPDATESENSORSREQUEST.fields_by_name['sensors'].message_type = _UPDATESENSORREQUEST
 _CONFIGVALUEWRITEREQUEST.oneofs_by_name['Values'].fields.append(
   _CONFIGVALUEWRITEREQUEST.fields_by_name['uint_value'])
 _CONFIGVALUEWRITEREQUEST.fields_by_name['uint_value'].containing_oneof = _CONFIGVALUEWRITEREQUEST.oneofs_by_name['Values']
@@ -489,6 +528,7 @@ _SIMUREQUEST.fields_by_name['update_sensor'].message_type = _UPDATESENSORREQUEST
 _SIMUREQUEST.fields_by_name['ping'].message_type = _PINGREQUEST
 _SIMUREQUEST.fields_by_name['config_write'].message_type = _CONFIGVALUEWRITEREQUEST
 _SIMUREQUEST.fields_by_name['config_read'].message_type = _CONFIGVALUEREADREQUEST
+_SIMUREQUEST.fields_by_name['update_sensors'].message_type = _UPDATESENSORSREQUEST
 _SIMUREQUEST.oneofs_by_name['Requests'].fields.append(
   _SIMUREQUEST.fields_by_name['connect'])
 _SIMUREQUEST.fields_by_name['connect'].containing_oneof = _SIMUREQUEST.oneofs_by_name['Requests']
@@ -510,10 +550,14 @@ _SIMUREQUEST.fields_by_name['config_write'].containing_oneof = _SIMUREQUEST.oneo
 _SIMUREQUEST.oneofs_by_name['Requests'].fields.append(
   _SIMUREQUEST.fields_by_name['config_read'])
 _SIMUREQUEST.fields_by_name['config_read'].containing_oneof = _SIMUREQUEST.oneofs_by_name['Requests']
+_SIMUREQUEST.oneofs_by_name['Requests'].fields.append(
+  _SIMUREQUEST.fields_by_name['update_sensors'])
+_SIMUREQUEST.fields_by_name['update_sensors'].containing_oneof = _SIMUREQUEST.oneofs_by_name['Requests']
 DESCRIPTOR.message_types_by_name['ConnectRequest'] = _CONNECTREQUEST
 DESCRIPTOR.message_types_by_name['DisconnectRequest'] = _DISCONNECTREQUEST
 DESCRIPTOR.message_types_by_name['ListSensorsRequest'] = _LISTSENSORSREQUEST
 DESCRIPTOR.message_types_by_name['UpdateSensorRequest'] = _UPDATESENSORREQUEST
+DESCRIPTOR.message_types_by_name['UpdateSensorsRequest'] = _UPDATESENSORSREQUEST
 DESCRIPTOR.message_types_by_name['PingRequest'] = _PINGREQUEST
 DESCRIPTOR.message_types_by_name['ConfigValueWriteRequest'] = _CONFIGVALUEWRITEREQUEST
 DESCRIPTOR.message_types_by_name['ConfigValueReadRequest'] = _CONFIGVALUEREADREQUEST
@@ -556,6 +600,13 @@ UpdateSensorRequest = _reflection.GeneratedProtocolMessageType('UpdateSensorRequ
   ))
 _sym_db.RegisterMessage(UpdateSensorRequest)
 
+UpdateSensorsRequest = _reflection.GeneratedProtocolMessageType('UpdateSensorsRequest', (_message.Message,), dict(
+  DESCRIPTOR = _UPDATESENSORSREQUEST,
+  __module__ = 'requests_pb2'
+  # @@protoc_insertion_point(class_scope:open_vario.UpdateSensorsRequest)
+  ))
+_sym_db.RegisterMessage(UpdateSensorsRequest)
+
 PingRequest = _reflection.GeneratedProtocolMessageType('PingRequest', (_message.Message,), dict(
   DESCRIPTOR = _PINGREQUEST,
   __module__ = 'requests_pb2'
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='open_vario',
   syntax='proto3',
   serialized_options=_b('H\003'),
-  serialized_pb=_b('\n\x0fresponses.proto\x12\nopen_vario\"!\n\x0f\x43onnectResponse\x12\x0e\n\x06\x61\x63\x63\x65pt\x18\x01 \x01(\x08\"\x14\n\x12\x44isconnectResponse\"\xcf\x03\n\x13ListSensorsResponse\x12\x37\n\x07sensors\x18\x01 \x03(\x0b\x32&.open_vario.ListSensorsResponse.Sensor\x1a\xa1\x01\n\x06Sensor\x12\n\n\x02id\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x38\n\x04type\x18\x03 \x01(\x0e\x32*.open_vario.ListSensorsResponse.SensorType\x12\x43\n\nvalue_type\x18\x04 \x01(\x0e\x32/.open_vario.ListSensorsResponse.SensorValueType\"_\n\nSensorType\x12\x0e\n\nST_UNKNOWN\x10\x00\x12\x0f\n\x0bST_PRESSURE\x10\x01\x12\x12\n\x0eST_TEMPERATURE\x10\x02\x12\x0f\n\x0bST_ALTITUDE\x10\x04\x12\x0b\n\x07ST_GNSS\x10\x08\"z\n\x0fSensorValueType\x12\x0f\n\x0bSVT_UNKNOWN\x10\x00\x12\x0c\n\x08SVT_UINT\x10\x01\x12\x0b\n\x07SVT_INT\x10\x02\x12\r\n\tSVT_FLOAT\x10\x03\x12\x0e\n\nSVT_DOUBLE\x10\x04\x12\x0e\n\nSVT_STRING\x10\x05\x12\x0c\n\x08SVT_BOOL\x10\x06\"\'\n\x14UpdateSensorResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x1e\n\x0cPingResponse\x12\x0e\n\x06number\x18\x01 \x01(\r\"+\n\x18\x43onfigValueWriteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x98\x05\n\x17\x43onfigValueReadResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x18\n\x10value_group_name\x18\x02 \x01(\t\x12\x12\n\nvalue_name\x18\x03 \x01(\t\x12\x12\n\nvalue_type\x18\x04 \x01(\t\x12\x12\n\nvalue_size\x18\x05 \x01(\r\x12\x13\n\x0bhas_min_max\x18\x06 \x01(\x08\x12\x15\n\ris_reset_only\x18\x07 \x01(\x08\x12\x14\n\nuint_value\x18\n \x01(\rH\x00\x12\x13\n\tint_value\x18\x0b \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x0c \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\r \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x0e \x01(\tH\x00\x12\x14\n\nbool_value\x18\x0f \x01(\x08H\x00\x12\x18\n\x0euint_min_value\x18\x14 \x01(\rH\x01\x12\x17\n\rint_min_value\x18\x15 \x01(\x11H\x01\x12\x19\n\x0f\x66loat_min_value\x18\x16 \x01(\x02H\x01\x12\x1a\n\x10\x64ouble_min_value\x18\x17 \x01(\x01H\x01\x12\x1a\n\x10string_min_value\x18\x18 \x01(\tH\x01\x12\x18\n\x0e\x62ool_min_value\x18\x19 \x01(\x08H\x01\x12\x18\n\x0euint_max_value\x18\x1e \x01(\rH\x02\x12\x17\n\rint_max_value\x18\x1f \x01(\x11H\x02\x12\x19\n\x0f\x66loat_max_value\x18  \x01(\x02H\x02\x12\x1a\n\x10\x64ouble_max_value\x18! \x01(\x01H\x02\x12\x1a\n\x10string_max_value\x18\" \x01(\tH\x02\x12\x18\n\x0e\x62ool_max_value\x18# \x01(\x08H\x02\x42\x08\n\x06ValuesB\x0b\n\tMinValuesB\x0b\n\tMaxValues\"\x99\x03\n\x0cSimuResponse\x12.\n\x07\x63onnect\x18\x01 \x01(\x0b\x32\x1b.open_vario.ConnectResponseH\x00\x12\x34\n\ndisconnect\x18\x02 \x01(\x0b\x32\x1e.open_vario.DisconnectResponseH\x00\x12\x37\n\x0clist_sensors\x18\x03 \x01(\x0b\x32\x1f.open_vario.ListSensorsResponseH\x00\x12\x39\n\rupdate_sensor\x18\x04 \x01(\x0b\x32 .open_vario.UpdateSensorResponseH\x00\x12(\n\x04ping\x18\x05 \x01(\x0b\x32\x18.open_vario.PingResponseH\x00\x12<\n\x0c\x63onfig_write\x18\x06 \x01(\x0b\x32$.open_vario.ConfigValueWriteResponseH\x00\x12:\n\x0b\x63onfig_read\x18\x07 \x01(\x0b\x32#.open_vario.ConfigValueReadResponseH\x00\x42\x0b\n\tResponsesB\x02H\x03\x62\x06proto3')
+  serialized_pb=_b('\n\x0fresponses.proto\x12\nopen_vario\"!\n\x0f\x43onnectResponse\x12\x0e\n\x06\x61\x63\x63\x65pt\x18\x01 \x01(\x08\"\x14\n\x12\x44isconnectResponse\"\xcf\x03\n\x13ListSensorsResponse\x12\x37\n\x07sensors\x18\x01 \x03(\x0b\x32&.open_vario.ListSensorsResponse.Sensor\x1a\xa1\x01\n\x06Sensor\x12\n\n\x02id\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x38\n\x04type\x18\x03 \x01(\x0e\x32*.open_vario.ListSensorsResponse.SensorType\x12\x43\n\nvalue_type\x18\x04 \x01(\x0e\x32/.open_vario.ListSensorsResponse.SensorValueType\"_\n\nSensorType\x12\x0e\n\nST_UNKNOWN\x10\x00\x12\x0f\n\x0bST_PRESSURE\x10\x01\x12\x12\n\x0eST_TEMPERATURE\x10\x02\x12\x0f\n\x0bST_ALTITUDE\x10\x04\x12\x0b\n\x07ST_GNSS\x10\x08\"z\n\x0fSensorValueType\x12\x0f\n\x0bSVT_UNKNOWN\x10\x00\x12\x0c\n\x08SVT_UINT\x10\x01\x12\x0b\n\x07SVT_INT\x10\x02\x12\r\n\tSVT_FLOAT\x10\x03\x12\x0e\n\nSVT_DOUBLE\x10\x04\x12\x0e\n\nSVT_STRING\x10\x05\x12\x0c\n\x08SVT_BOOL\x10\x06\"\'\n\x14UpdateSensorResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"(\n\x15UpdateSensorsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x1e\n\x0cPingResponse\x12\x0e\n\x06number\x18\x01 \x01(\r\"+\n\x18\x43onfigValueWriteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x98\x05\n\x17\x43onfigValueReadResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x18\n\x10value_group_name\x18\x02 \x01(\t\x12\x12\n\nvalue_name\x18\x03 \x01(\t\x12\x12\n\nvalue_type\x18\x04 \x01(\t\x12\x12\n\nvalue_size\x18\x05 \x01(\r\x12\x13\n\x0bhas_min_max\x18\x06 \x01(\x08\x12\x15\n\ris_reset_only\x18\x07 \x01(\x08\x12\x14\n\nuint_value\x18\n \x01(\rH\x00\x12\x13\n\tint_value\x18\x0b \x01(\x11H\x00\x12\x15\n\x0b\x66loat_value\x18\x0c \x01(\x02H\x00\x12\x16\n\x0c\x64ouble_value\x18\r \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x0e \x01(\tH\x00\x12\x14\n\nbool_value\x18\x0f \x01(\x08H\x00\x12\x18\n\x0euint_min_value\x18\x14 \x01(\rH\x01\x12\x17\n\rint_min_value\x18\x15 \x01(\x11H\x01\x12\x19\n\x0f\x66loat_min_value\x18\x16 \x01(\x02H\x01\x12\x1a\n\x10\x64ouble_min_value\x18\x17 \x01(\x01H\x01\x12\x1a\n\x10string_min_value\x18\x18 \x01(\tH\x01\x12\x18\n\x0e\x62ool_min_value\x18\x19 \x01(\x08H\x01\x12\x18\n\x0euint_max_value\x18\x1e \x01(\rH\x02\x12\x17\n\rint_max_value\x18\x1f \x01(\x11H\x02\x12\x19\n\x0f\x66loat_max_value\x18  \x01(\x02H\x02\x12\x1a\n\x10\x64ouble_max_value\x18! \x01(\x01H\x02\x12\x1a\n\x10string_max_value\x18\" \x01(\tH\x02\x12\x18\n\x0e\x62ool_max_value\x18# \x01(\x08H\x02\x42\x08\n\x06ValuesB\x0b\n\tMinValuesB\x0b\n\tMaxValues\"\xd6\x03\n\x0cSimuResponse\x12.\n\x07\x63onnect\x18\x01 \x01(\x0b\x32\x1b.open_vario.ConnectResponseH\x00\x12\x34\n\ndisconnect\x18\x02 \x01(\x0b\x32\x1e.open_vario.DisconnectResponseH\x00\x12\x37\n\x0clist_sensors\x18\x03 \x01(\x0b\x32\x1f.open_vario.ListSensorsResponseH\x00\x12\x39\n\rupdate_sensor\x18\x04 \x01(\x0b\x32 .open_vario.UpdateSensorResponseH\x00\x12(\n\x04ping\x18\x05 \x01(\x0b\x32\x18.open_vario.PingResponseH\x00\x12<\n\x0c\x63onfig_write\x18\x06 \x01(\x0b\x32$.open_vario.ConfigValueWriteResponseH\x00\x12:\n\x0b\x63onfig_read\x18\x07 \x01(\x0b\x32#.open_vario.ConfigValueReadResponseH\x00\x12;\n\x0eupdate_sensors\x18\x08 \x01(\x0b\x32!.open_vario.UpdateSensorsResponseH\x00\x42\x0b\n\tResponsesB\x02H\x03\x62\x06proto3')
 )
 
 
@@ -271,6 +271,37 @@ _UPDATESENSORRESPONSE = _descriptor.Descriptor(
 )
 
 
+_UPDATESENSORSRESPONSE = _descriptor.Descriptor(
+  name='UpdateSensorsResponse',
+  full_name='open_vario.UpdateSensorsResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='success', full_name='open_vario.UpdateSensorsResponse.success', index=0,
+      number=1, type=8, cpp_type=7, label=1,
+      has_default_value=False, default_value=False,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=595,
+  serialized_end=635,
+)
+
+
 _PINGRESPONSE = _descriptor.Descriptor(
   name='PingResponse',
   full_name='open_vario.PingResponse',
@@ -297,8 +328,8 @@ _PINGRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=595,
-  serialized_end=625,
+  serialized_start=637,
+  serialized_end=667,
 )
 
 
@@ -328,8 +359,8 @@ _CONFIGVALUEWRITERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=627,
-  serialized_end=670,
+  serialized_start=669,
+  serialized_end=712,
 )
 
 
@@ -536,8 +567,8 @@ _CONFIGVALUEREADRESPONSE = _descriptor.Descriptor(
       name='MaxValues', full_name='open_vario.ConfigValueReadResponse.MaxValues',
       index=2, containing_type=None, fields=[]),
   ],
-  serialized_start=673,
-  serialized_end=1337,
+  serialized_start=715,
+  serialized_end=1379,
 )
 
 
@@ -597,6 +628,13 @@ _SIMURESPONSE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='update_sensors', full_name='open_vario.SimuResponse.update_sensors', index=7,
+      number=8, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -612,8 +650,8 @@ _SIMURESPONSE = _descriptor.Descriptor(
       name='Responses', full_name='open_vario.SimuResponse.Responses',
       index=0, containing_type=None, fields=[]),
   ],
-  serialized_start=1340,
-  serialized_end=1749,
+  serialized_start=1382,
+  serialized_end=1852,
 )
 
 _LISTSENSORSRESPONSE_SENSOR.fields_by_name['type'].enum_type = _LISTSENSORSRESPONSE_SENSORTYPE
@@ -683,6 +721,7 @@ _SIMURESPONSE.fields_by_name['update_sensor'].message_type = _UPDATESENSORRESPON
 _SIMURESPONSE.fields_by_name['ping'].message_type = _PINGRESPONSE
 _SIMURESPONSE.fields_by_name['config_write'].message_type = _CONFIGVALUEWRITERESPONSE
 _SIMURESPONSE.fields_by_name['config_read'].message_type = _CONFIGVALUEREADRESPONSE
+_SIMURESPONSE.fields_by_name['update_sensors'].message_type = _UPDATESENSORSRESPONSE
 _SIMURESPONSE.oneofs_by_name['Responses'].fields.append(
   _SIMURESPONSE.fields_by_name['connect'])
 _SIMURESPONSE.fields_by_name['connect'].containing_oneof = _SIMURESPONSE.oneofs_by_name['Responses']
@@ -704,10 +743,14 @@ _SIMURESPONSE.fields_by_name['config_write'].containing_oneof = _SIMURESPONSE.on
 _SIMURESPONSE.oneofs_by_name['Responses'].fields.append(
   _SIMURESPONSE.fields_by_name['config_read'])
 _SIMURESPONSE.fields_by_name['config_read'].containing_oneof = _SIMURESPONSE.oneofs_by_name['Responses']
+_SIMURESPONSE.oneofs_by_name['Responses'].fields.append(
+  _SIMURESPONSE.fields_by_name['update_sensors'])
+_SIMURESPONSE.fields_by_name['update_sensors'].containing_oneof = _SIMURESPONSE.oneofs_by_name['Responses']
 DESCRIPTOR.message_types_by_name['ConnectResponse'] = _CONNECTRESPONSE
 DESCRIPTOR.message_types_by_name['DisconnectResponse'] = _DISCONNECTRESPONSE
 DESCRIPTOR.message_types_by_name['ListSensorsResponse'] = _LISTSENSORSRESPONSE
 DESCRIPTOR.message_types_by_name['UpdateSensorResponse'] = _UPDATESENSORRESPONSE
+DESCRIPTOR.message_types_by_name['UpdateSensorsResponse'] = _UPDATESENSORSRESPONSE
 DESCRIPTOR.message_types_by_name['PingResponse'] = _PINGRESPONSE
 DESCRIPTOR.message_types_by_name['ConfigValueWriteResponse'] = _CONFIGVALUEWRITERESPONSE
 DESCRIPTOR.message_types_by_name['ConfigValueReadResponse'] = _CONFIGVALUEREADRESPONSE
@@ -750,6 +793,13 @@ UpdateSensorResponse = _reflection.GeneratedProtocolMessageType('UpdateSensorRes
   ))
 _sym_db.RegisterMessage(UpdateSensorResponse)
 
+UpdateSensorsResponse = _reflection.GeneratedProtocolMessageType('UpdateSensorsResponse', (_message.Message,), dict(
+  DESCRIPTOR = _UPDATESENSORSRESPONSE,
+  __module__ = 'responses_pb2'
+  # @@protoc_insertion_point(class_scope:open_vario.UpdateSensorsResponse)
+  ))
+_sym_db.RegisterMessage(UpdateSensorsResponse)
+
 PingResponse = _reflection.GeneratedProtocolMessageType('PingResponse', (_message.Message,), dict(
   DESCRIPTOR = _PINGRESPONSE,
   __module__ = 'responses_pb2'
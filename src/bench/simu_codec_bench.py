@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import timeit
+from api.requests_pb2 import SimuRequest
+from api.responses_pb2 import SimuResponse
+from api.notifications_pb2 import SimuNotification
+from com.simu_protocol import SimuSensorValueType
+from com.simu_encoder import SimuUpdateSensorEncoder
+
+
+####################################################
+#### Data types
+
+SIMU_CODEC_UPDATE_VALUES = [ ("uint_value", SimuSensorValueType.UINT, 101325),
+                             ("int_value", SimuSensorValueType.INT, -125),
+                             ("float_value", SimuSensorValueType.FLOAT, 21.5),
+                             ("double_value", SimuSensorValueType.DOUBLE, 45.18765),
+                             ("string_value", SimuSensorValueType.STRING, "$GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*6A"),
+                             ("bool_value", SimuSensorValueType.BOOL, True) ]
+'''
+    Values of the UpdateSensorRequest benchmarks : [ (name of the oneof field, value type, value) ]
+'''
+
+SIMU_CODEC_CHECK_VALUES = [ ("uint_value", SimuSensorValueType.UINT, [ 0, 1, 127, 128, 300, 16383, 16384, 101325, 0xFFFFFFFF, 12.7 ]),
+                            ("int_value", SimuSensorValueType.INT, [ 0, 1, -1, 63, -64, 64, -65, -125, 0x7FFFFFFF, -0x80000000, -3.9 ]),
+                            ("float_value", SimuSensorValueType.FLOAT, [ 0., -0., 1., -21.5, 1e-45, 3.4028234e38, 1e39, -1e39, 0.1, 7 ]),
+                            ("double_value", SimuSensorValueType.DOUBLE, [ 0., -0., 45.18765, -1e308, 5e-324, 0.1, 7 ]),
+                            ("string_value", SimuSensorValueType.STRING, [ "", "a", "x" * 127, "x" * 128, "x" * 20000, u"\u00b0C", 12 ]),
+                            ("bool_value", SimuSensorValueType.BOOL, [ True, False, 0, 1, 2 ]) ]
+'''
+    Values of the fast encoder check : [ (name of the oneof field, value type, [ values ]) ]
+'''
+
+SIMU_CODEC_CHECK_IDS = [ 0, 1, 3, 127, 128, 0xFFFFFFFF ]
+'''
+    Sensor ids of the fast encoder check
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuCodecBenchmark(object):
+    '''
+        Microbenchmarks of the protobuf encoding and decoding of the simulator messages,
+        for the protobuf backend selected when the api modules have been imported
+    '''
+
+    def __init__(self, number=10000, repeat=5):
+        '''
+            Constructor
+
+            @param number: Number of operations of each timing
+            @type number: int
+            @param repeat: Number of timings of each benchmark, the best one is kept
+            @type repeat: int
+        '''
+
+        self.__number = number
+        '''
+            Number of operations of each timing
+        '''
+        self.__repeat = repeat
+        '''
+            Number of timings of each benchmark
+        '''
+
+        return
+
+    def run(self):
+        '''
+            Run all the benchmarks
+
+            @return: Time per operation (nanoseconds) by benchmark name
+            @rtype: {string:float}
+        '''
+
+        ret = {}
+
+        # Request encoding, one benchmark per value type
+        encoder = SimuUpdateSensorEncoder()
+        for field, value_type, value in SIMU_CODEC_UPDATE_VALUES:
+            ret["encode_update_sensor_" + field] = self.__time(self.__encode_update_sensor(field, value))
+            ret["encode_update_sensor_" + field + "_reuse"] = self.__time(self.__encode_update_sensor_reuse(field, value))
+            ret["encode_update_sensor_" + field + "_fast"] = self.__time(lambda: encoder.encode_update_sensor(3, value, value_type))
+        ret["encode_update_sensors_4"] = self.__time(self.__encode_update_sensors(4))
+        sensors = [ (id, 101325, SimuSensorValueType.UINT) for id in range(4) ]
+        ret["encode_update_sensors_4_fast"] = self.__time(lambda: encoder.encode_update_sensors(sensors))
+        ret["encode_ping"] = self.__time(self.__encode_ping())
+
+        # Notification decoding, one benchmark per notification type
+        for notif_type, notif in self.__build_notifications():
+            ret["decode_notification_" + notif_type] = self.__time(self.__decode(SimuNotification, notif.SerializeToString()))
+            ret["decode_notification_" + notif_type + "_reuse"] = self.__time(self.__decode_reuse(SimuNotification, notif.SerializeToString()))
+
+        # Response decoding
+        ret["decode_update_sensor_response"] = self.__time(self.__decode(SimuResponse, self.__build_update_sensor_response().SerializeToString()))
+        ret["decode_list_sensors_response_64"] = self.__time(self.__decode(SimuResponse, self.__build_list_sensors_response(64).SerializeToString()))
+        ret["decode_config_read_response"] = self.__time(self.__decode(SimuResponse, self.__build_config_read_response().SerializeToString()))
+
+        return ret
+
+    def check_encoder(self):
+        '''
+            Check that the fast encoder output is identical to the protobuf serialization
+
+            @return: Mismatching updates, empty if the check has succeed
+            @rtype: [ (int, value, SimuSensorValueType) ]
+        '''
+
+        ret = []
+        encoder = SimuUpdateSensorEncoder()
+        updates = []
+        for field, value_type, values in SIMU_CODEC_CHECK_VALUES:
+            for id in SIMU_CODEC_CHECK_IDS:
+                for value in values:
+                    updates.append((id, value, value_type))
+                    req = SimuRequest()
+                    req.update_sensor.id = id
+                    setattr(req.update_sensor, field, self.__convert(field, value))
+                    data = encoder.encode_update_sensor(id, value, value_type)
+                    if (data == None) or (not (data == req.SerializeToString())):
+                        ret.append((id, value, value_type))
+
+        # Multiple sensors request
+        req = SimuRequest()
+        for id, value, value_type in updates:
+            update_sensor = req.update_sensors.sensors.add()
+            update_sensor.id = id
+            setattr(update_sensor, SIMU_CODEC_CHECK_VALUES[value_type.value - 1][0], self.__convert(SIMU_CODEC_CHECK_VALUES[value_type.value - 1][0], value))
+        data = encoder.encode_update_sensors(updates)
+        if (data == None) or (not (data == req.SerializeToString())):
+            ret.append(("update_sensors", len(updates), None))
+
+        # Out of range values are rejected
+        for id, value, value_type in ((1, -1, SimuSensorValueType.UINT), (1, 0x100000000, SimuSensorValueType.UINT),
+                                      (1, 0x80000000, SimuSensorValueType.INT), (1, -0x80000001, SimuSensorValueType.INT),
+                                      (1, "x", SimuSensorValueType.DOUBLE), (-1, 0, SimuSensorValueType.UINT),
+                                      (1, 0, SimuSensorValueType.UNKNOWN)):
+            if not (encoder.encode_update_sensor(id, value, value_type) == None):
+                ret.append((id, value, value_type))
+
+        return ret
+
+    def __convert(self, field, value):
+        '''
+            Convert a sensor value as SimuProtocol does before setting it in a message field
+
+            @param field: Name of the value field
+            @type field: string
+            @param value: Sensor value
+            @type value: int or float or bool or string
+
+            @return: Converted value
+            @rtype: int or float or bool or string
+        '''
+
+        if field in ("uint_value", "int_value"):
+            ret = int(value)
+        elif field in ("float_value", "double_value"):
+            ret = float(value)
+        elif field == "bool_value":
+            ret = bool(value)
+        elif isinstance(value, unicode):
+            ret = value
+        else:
+            ret = str(value)
+
+        return ret
+
+    def __time(self, operation):
+        '''
+            Time an operation
+
+            @param operation: Operation to time
+            @type operation: function()
+
+            @return: Best time per operation (nanoseconds)
+            @rtype: float
+        '''
+
+        timings = timeit.Timer(operation).repeat(self.__repeat, self.__number)
+        return 1000000000. * min(timings) / self.__number
+
+    def __encode_update_sensor(self, field, value):
+        '''
+            Build the operation encoding a new UpdateSensorRequest
+
+            @param field: Name of the value field
+            @type field: string
+            @param value: Sensor value
+            @type value: int or float or bool or string
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        def operation():
+            req = SimuRequest()
+            req.update_sensor.id = 3
+            setattr(req.update_sensor, field, value)
+            return req.SerializeToString()
+
+        return operation
+
+    def __encode_update_sensor_reuse(self, field, value):
+        '''
+            Build the operation encoding a reused UpdateSensorRequest
+
+            @param field: Name of the value field
+            @type field: string
+            @param value: Sensor value
+            @type value: int or float or bool or string
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        req = SimuRequest()
+        update_sensor = req.update_sensor
+        update_sensor.id = 3
+
+        def operation():
+            setattr(update_sensor, field, value)
+            return req.SerializeToString()
+
+        return operation
+
+    def __encode_update_sensors(self, count):
+        '''
+            Build the operation encoding a new UpdateSensorsRequest
+
+            @param count: Number of sensors in the request
+            @type count: int
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        def operation():
+            req = SimuRequest()
+            sensors = req.update_sensors.sensors
+            for id in range(count):
+                update_sensor = sensors.add()
+                update_sensor.id = id
+                update_sensor.uint_value = 101325
+            return req.SerializeToString()
+
+        return operation
+
+    def __encode_ping(self):
+        '''
+            Build the operation encoding a new PingRequest
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        def operation():
+            req = SimuRequest()
+            req.ping.number = 1234
+            return req.SerializeToString()
+
+        return operation
+
+    def __decode(self, message_type, data):
+        '''
+            Build the operation decoding a message into a new message object
+
+            @param message_type: Type of the message
+            @type message_type: protobuf message class
+            @param data: Serialized message
+            @type data: string
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        def operation():
+            message = message_type()
+            message.ParseFromString(data)
+            return message
+
+        return operation
+
+    def __decode_reuse(self, message_type, data):
+        '''
+            Build the operation decoding a message into a reused message object
+
+            @param message_type: Type of the message
+            @type message_type: protobuf message class
+            @param data: Serialized message
+            @type data: string
+
+            @return: Operation
+            @rtype: function()
+        '''
+
+        message = message_type()
+
+        def operation():
+            message.ParseFromString(data)
+            return message
+
+        return operation
+
+    def __build_notifications(self):
+        '''
+            Build a notification of each type with all its fields set
+
+            @return: Notifications by type
+            @rtype: [ (string, SimuNotification) ]
+        '''
+
+        ret = []
+        notif = SimuNotification()
+        notif.pressure.pressure = 101325
+        notif.pressure.min_pressure = 95000
+        notif.pressure.max_pressure = 102000
+        ret.append(("pressure", notif))
+
+        notif = SimuNotification()
+        notif.temperature.temperature = -125
+        notif.temperature.min_temperature = -200
+        notif.temperature.max_temperature = 250
+        ret.append(("temperature", notif))
+
+        notif = SimuNotification()
+        notif.altitude.main_altitude = 1234
+        notif.altitude.altitude_1 = 1234
+        notif.altitude.altitude_2 = 1200
+        notif.altitude.altitude_3 = -50
+        notif.altitude.altitude_4 = 3000
+        notif.altitude.min_altitude = 800
+        notif.altitude.max_altitude = 2500
+        ret.append(("altitude", notif))
+
+        notif = SimuNotification()
+        notif.vario.vario = 25
+        notif.vario.min_vario = -40
+        notif.vario.max_vario = 55
+        ret.append(("vario", notif))
+
+        notif = SimuNotification()
+        notif.navigation.speed = 123
+        notif.navigation.latitude = 45.18765
+        notif.navigation.longitude = 5.72451
+        notif.navigation.track_angle = 2745
+        notif.navigation.min_speed = 80
+        notif.navigation.max_speed = 150
+        ret.append(("navigation", notif))
+
+        return ret
+
+    def __build_update_sensor_response(self):
+        '''
+            Build an UpdateSensorResponse
+
+            @return: Response
+            @rtype: SimuResponse
+        '''
+
+        rsp = SimuResponse()
+        rsp.update_sensor.success = True
+        return rsp
+
+    def __build_list_sensors_response(self, count):
+        '''
+            Build a ListSensorsResponse
+
+            @param count: Number of sensors
+            @type count: int
+
+            @return: Response
+            @rtype: SimuResponse
+        '''
+
+        rsp = SimuResponse()
+        for id in range(count):
+            sensor = rsp.list_sensors.sensors.add()
+            sensor.id = id
+            sensor.name = "sensor_" + str(id)
+            sensor.type = 1 << (id % 4)
+            sensor.value_type = 1 + (id % 6)
+
+        return rsp
+
+    def __build_config_read_response(self):
+        '''
+            Build a ConfigValueReadResponse with all its fields set
+
+            @return: Response
+            @rtype: SimuResponse
+        '''
+
+        rsp = SimuResponse()
+        config_read = rsp.config_read
+        config_read.success = True
+        config_read.value_group_name = "Barometric altimeter"
+        config_read.value_name = "Sea level reference pressure"
+        config_read.value_type = "double"
+        config_read.value_size = 8
+        config_read.has_min_max = True
+        config_read.is_reset_only = False
+        config_read.double_value = 101325.
+        config_read.double_min_value = 90000.
+        config_read.double_max_value = 110000.
+
+        return rsp
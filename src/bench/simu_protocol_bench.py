@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import gc
+import sys
+import time
+from api.notifications_pb2 import SimuNotification
+from com.simu_protocol import SimuProtocol, SimuSensorValueType
+from com.simu_sync_protocol import SimuSyncProtocol, SimuSyncProtocolListener
+from com.simu_async_protocol import AsyncSimuProtocol
+from com.simu_time import monotonic, process_time, PROCESS_TIME_RESOLUTION
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuBenchMeasure(object):
+    '''
+        Measures the elapsed time, the CPU time and the retained allocations of a benchmark step.
+        The retained allocations are the growth of the allocation counter between the start and
+        the end of the measure, garbage collected, so they show what each message leaves behind
+        and not the temporary allocations
+    '''
+
+    MIN_CPU_RESOLUTIONS = 100
+    '''
+        Minimum CPU time of a measure for its CPU time to be reported, in resolutions of the CPU clock
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__start = 0.
+        '''
+            Monotonic time at the start of the measure
+        '''
+        self.__cpu_start = 0.
+        '''
+            Process CPU time at the start of the measure
+        '''
+        self.__blocks_start = 0
+        '''
+            Allocation counter at the start of the measure
+        '''
+
+        return
+
+    @staticmethod
+    def get_allocation_counter():
+        '''
+            Get the name of the allocation counter of the interpreter : the number of allocated
+            memory blocks when available (Python >= 3.4), the number of objects tracked by the
+            garbage collector otherwise
+
+            @return: Name of the allocation counter
+            @rtype: string
+        '''
+
+        ret = "gc_objects"
+        if hasattr(sys, "getallocatedblocks"):
+            ret = "allocated_blocks"
+
+        return ret
+
+    def start(self):
+        '''
+            Start the measure
+        '''
+
+        self.__blocks_start = self.__get_blocks()
+        self.__cpu_start = self.__get_cpu()
+        self.__start = monotonic()
+
+        return
+
+    def stop(self, count):
+        '''
+            Stop the measure
+
+            @param count: Number of messages processed during the measure
+            @type count: int
+
+            @return: Elapsed time (seconds), rate (messages per second), CPU time per message
+                     (microseconds, None if the measure is too short for the resolution of the CPU clock)
+                     and retained allocations per message
+            @rtype: {string:float}
+        '''
+
+        elapsed = monotonic() - self.__start
+        cpu = self.__get_cpu() - self.__cpu_start
+        blocks = self.__get_blocks() - self.__blocks_start
+
+        count = max(1, count)
+        ret = { "elapsed" : elapsed,
+                "rate" : count / elapsed if elapsed > 0 else 0.,
+                "cpu_us_per_msg" : None,
+                "retained_per_msg" : float(blocks) / count }
+        if cpu >= self.MIN_CPU_RESOLUTIONS * PROCESS_TIME_RESOLUTION:
+            ret["cpu_us_per_msg"] = 1000000. * cpu / count
+
+        return ret
+
+    def __get_cpu(self):
+        '''
+            Get the CPU time consumed by the process, all threads included
+
+            @return: CPU time (seconds)
+            @rtype: float
+        '''
+
+        return process_time()
+
+    def __get_blocks(self):
+        '''
+            Get the allocation counter after a garbage collection
+
+            @return: Allocation counter
+            @rtype: int
+        '''
+
+        gc.collect()
+        if hasattr(sys, "getallocatedblocks"):
+            ret = sys.getallocatedblocks()
+        else:
+            ret = len(gc.get_objects())
+
+        return ret
+
+
+class SimuProtocolBenchmark(object):
+    '''
+        Benchmark of the simulator protocol against an Open Vario simulated instance, usually
+        a SimuFakeInstance without notifications and without impairments
+    '''
+
+    def __init__(self, target_ip, target_port, host_port, count=10000, window_size=16, keepalive_duration=5.):
+        '''
+            Constructor
+
+            @param target_ip: IP address of the Open Vario simulated instance
+            @type target_ip: string
+            @param target_port: Port of the Open Vario simulated instance
+            @type target_port: int
+            @param host_port: Port of the simulator
+            @type host_port: int
+            @param count: Number of messages of each benchmark step
+            @type count: int
+            @param window_size: Maximum number of requests awaiting a response for the throughput step
+            @type window_size: int
+            @param keepalive_duration: Idle time of the keep-alive step (seconds), 0 to skip the step
+            @type keepalive_duration: float
+        '''
+
+        self.__target_ip = target_ip
+        '''
+            IP address of the Open Vario simulated instance
+        '''
+        self.__target_port = target_port
+        '''
+            Port of the Open Vario simulated instance
+        '''
+        self.__host_port = host_port
+        '''
+            Port of the simulator
+        '''
+        self.__count = count
+        '''
+            Number of messages of each benchmark step
+        '''
+        self.__window_size = window_size
+        '''
+            Maximum number of requests awaiting a response for the throughput step
+        '''
+        self.__keepalive_duration = keepalive_duration
+        '''
+            Idle time of the keep-alive step (seconds)
+        '''
+
+        return
+
+    def run(self):
+        '''
+            Run all the benchmark steps
+
+            @return: Results by step name, None if the Open Vario simulated instance is not reachable
+            @rtype: {string:{string:value}}
+        '''
+
+        ret = None
+        sync_results = self.__run_sync()
+        if not (sync_results == None):
+            async_results = self.__run_async()
+            if not (async_results == None):
+                ret = sync_results
+                ret.update(async_results)
+                ret["environment"] = { "python" : sys.version.split()[0],
+                                       "protobuf" : self.__get_protobuf_backend(),
+                                       "allocation_counter" : SimuBenchMeasure.get_allocation_counter(),
+                                       "count" : self.__count,
+                                       "window_size" : self.__window_size }
+
+        return ret
+
+    @staticmethod
+    def percentiles(values):
+        '''
+            Compute the latency statistics of a list of round-trip times
+
+            @param values: Round-trip times (seconds)
+            @type values: [float]
+
+            @return: Min, p50, p95, p99 and max latencies (microseconds)
+            @rtype: {string:float}
+        '''
+
+        ret = {}
+        values = sorted(values)
+        if values:
+            last = len(values) - 1
+            for name, ratio in (("min", 0.), ("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.)):
+                ret[name] = 1000000. * values[int(round(last * ratio))]
+
+        return ret
+
+    def __run_sync(self):
+        '''
+            Round-trip latency steps, using the synchronous protocol and its receive thread
+
+            @return: Results by step name, None if the connection failed
+            @rtype: {string:{string:value}}
+        '''
+
+        ret = None
+        sync_protocol = SimuSyncProtocol(SimuProtocol(self.__target_ip, self.__target_port, self.__host_port))
+        if sync_protocol.connect(SimuSyncProtocolListener()):
+
+            ret = {}
+            sensor = self.__find_sensor(sync_protocol.get_sensors_list())
+
+            # Sensors list round-trip, the cached sensor list is bypassed
+            count = max(1, self.__count // 10)
+            ret["get_sensors_list"] = self.__measure_round_trips(count, lambda: sync_protocol.get_sensors_list(True))
+
+            # Sensor update round-trip
+            if not (sensor == None):
+                ret["update_sensor_latency"] = self.__measure_round_trips(self.__count,
+                                                                          lambda: sync_protocol.update_sensor(sensor[0], 0, sensor[1]))
+
+            # Keep-alive : the connection must survive an idle period
+            if self.__keepalive_duration > 0:
+                time.sleep(self.__keepalive_duration)
+                ret["keepalive"] = { "duration" : self.__keepalive_duration,
+                                     "connected" : sync_protocol.is_connected() and (not (sync_protocol.get_sensors_list(True) == None)) }
+
+            sync_protocol.close()
+
+        return ret
+
+    def __run_async(self):
+        '''
+            Throughput and decoding steps, using the asynchronous protocol without receive thread
+
+            @return: Results by step name, None if the connection failed
+            @rtype: {string:{string:value}}
+        '''
+
+        ret = None
+        protocol = AsyncSimuProtocol(self.__target_ip, self.__target_port, self.__host_port, self.__window_size,
+                                     max_notifications=self.__count)
+        future = protocol.connect()
+        if protocol.wait(future, 2.) and future.result():
+
+            ret = {}
+            future = protocol.get_sensors_list()
+            protocol.wait(future, 2.)
+            sensor = self.__find_sensor(future.result())
+
+            # Pipelined sensor updates
+            if not (sensor == None):
+                ret["update_sensor_throughput"] = self.__measure_throughput(protocol, sensor)
+
+            # Notification decoding
+            ret["notification_decoding"] = self.__measure_decoding(protocol)
+
+            protocol.close()
+
+        return ret
+
+    def __find_sensor(self, sensors):
+        '''
+            Find a sensor with a numeric value type to update
+
+            @param sensors: List of sensors
+            @type sensors: [ SimuSensor ]
+
+            @return: Id and value type of the sensor, None if not found
+            @rtype: (int, SimuSensorValueType)
+        '''
+
+        ret = None
+        for id, _, _, value_type in (sensors or []):
+            if value_type in (SimuSensorValueType.UINT, SimuSensorValueType.INT):
+                ret = (id, value_type)
+                break
+
+        return ret
+
+    def __measure_round_trips(self, count, request):
+        '''
+            Send requests one at a time and measure their round-trip time
+
+            @param count: Number of requests
+            @type count: int
+            @param request: Sends a request and waits for its response, returns None on timeout
+            @type request: function() -> object
+
+            @return: Step results
+            @rtype: {string:value}
+        '''
+
+        round_trips = []
+        lost = 0
+        measure = SimuBenchMeasure()
+        measure.start()
+        for _ in range(count):
+            start = monotonic()
+            result = request()
+            if result == None:
+                lost += 1
+            else:
+                round_trips.append(monotonic() - start)
+        ret = measure.stop(count)
+        ret["count"] = count
+        ret["lost"] = lost
+        ret["latency_us"] = self.percentiles(round_trips)
+
+        return ret
+
+    def __measure_throughput(self, protocol, sensor):
+        '''
+            Send pipelined sensor updates and measure the sustained update rate
+
+            @param protocol: Connected protocol
+            @type protocol: AsyncSimuProtocol
+            @param sensor: Id and value type of the sensor to update
+            @type sensor: (int, SimuSensorValueType)
+
+            @return: Step results
+            @rtype: {string:value}
+        '''
+
+        results = { "succeed" : 0, "failed" : 0, "lost" : 0 }
+        round_trips = []
+
+        def on_response(start, future):
+            round_trips.append(monotonic() - start)
+            if future.result() == None:
+                results["lost"] += 1
+            elif future.result():
+                results["succeed"] += 1
+            else:
+                results["failed"] += 1
+
+        count = self.__count
+        sent = 0
+        measure = SimuBenchMeasure()
+        measure.start()
+        while (results["succeed"] + results["failed"] + results["lost"] < count) and protocol.is_connected():
+
+            # Fill the request window
+            while sent < count:
+                start = monotonic()
+                future = protocol.update_sensor(sensor[0], sent & 0xFFFF, sensor[1])
+                if future == None:
+                    break
+                future.add_done_callback(lambda future, start=start: on_response(start, future))
+                sent += 1
+
+            # Process the responses
+            protocol.poll(0.1)
+
+        ret = measure.stop(count)
+        ret.update(results)
+        ret["count"] = count
+        ret["latency_us"] = self.percentiles(round_trips)
+
+        return ret
+
+    def __measure_decoding(self, protocol):
+        '''
+            Measure the decoding of notification datagrams through the protocol receive path
+
+            @param protocol: Connected protocol
+            @type protocol: AsyncSimuProtocol
+
+            @return: Step results
+            @rtype: {string:value}
+        '''
+
+        # One datagram of each notification type
+        notifs = [ SimuNotification() for _ in range(5) ]
+        notifs[0].pressure.pressure = 101325
+        notifs[1].temperature.temperature = -125
+        notifs[2].altitude.main_altitude = 1234
+        notifs[3].vario.vario = 25
+        notifs[4].navigation.speed = 123
+        notifs[4].navigation.latitude = 45.1
+        notifs[4].navigation.longitude = 5.7
+        datagrams = [ memoryview(bytearray(SimuProtocol.NOTIFICATION_FRAME + notif.SerializeToString())) for notif in notifs ]
+
+        count = self.__count
+        decoded = 0
+        measure = SimuBenchMeasure()
+        measure.start()
+        for index in range(count):
+            protocol.process_datagram(datagrams[index % len(datagrams)])
+            if (index % 256) == 255:
+                for _ in protocol.notifications():
+                    decoded += 1
+        for _ in protocol.notifications():
+            decoded += 1
+        ret = measure.stop(count)
+        ret["count"] = count
+        ret["decoded"] = decoded
+
+        return ret
+
+    def __get_protobuf_backend(self):
+        '''
+            Get the protobuf implementation in use
+
+            @return: Protobuf implementation name
+            @rtype: string
+        '''
+
+        try:
+            from google.protobuf.internal import api_implementation
+            ret = api_implementation.Type()
+        except ImportError:
+            ret = "unknown"
+
+        return ret
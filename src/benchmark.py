@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+import json
+import time
+from multiprocessing import Process
+from bench.simu_protocol_bench import SimuProtocolBenchmark
+from com.simu_fake_instance import SimuFakeInstance
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+def run_fake_instance(port):
+    '''
+        Run a fake instance without notifications in a dedicated process
+
+        @param port: Port of the fake instance
+        @type port: int
+    '''
+
+    instance = SimuFakeInstance(port, notification_period=0)
+    if instance.open():
+        instance.run()
+
+    return
+
+
+class SimuBenchmarkApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        # The fake instance runs in its own process so that its CPU time is not measured
+        fake_instance = None
+        if args.fake_instance:
+            fake_instance = Process(target=run_fake_instance, args=(args.target_port,))
+            fake_instance.daemon = True
+            fake_instance.start()
+            time.sleep(0.5)
+
+        benchmark = SimuProtocolBenchmark(args.target_ip, args.target_port, args.host_port,
+                                          args.count, args.window_size, args.keepalive)
+        results = benchmark.run()
+
+        if not (fake_instance == None):
+            fake_instance.terminate()
+            fake_instance.join()
+
+        if results == None:
+            print "Unable to connect to the Open Vario simulated instance"
+        else:
+            output = json.dumps(results, indent=4, sort_keys=True)
+            if args.output == None:
+                print output
+            else:
+                with open(args.output, "w") as output_file:
+                    output_file.write(output + "\n")
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Benchmark the simulator protocol")
+    parser.add_argument("--target-ip", default="127.0.0.1", help="IP address of the Open Vario simulated instance")
+    parser.add_argument("--target-port", type=int, default=45678, help="Port of the Open Vario simulated instance")
+    parser.add_argument("--host-port", type=int, default=45679, help="Port of the simulator")
+    parser.add_argument("--fake-instance", action="store_true", help="Start a fake instance on the target port")
+    parser.add_argument("--count", type=int, default=10000, help="Number of messages of each benchmark step")
+    parser.add_argument("--window-size", type=int, default=16, help="Maximum number of requests awaiting a response for the throughput step")
+    parser.add_argument("--keepalive", type=float, default=5., help="Idle time of the keep-alive step in seconds, 0 to skip it")
+    parser.add_argument("--output", default=None, help="JSON results file, printed if not set")
+
+    SimuBenchmarkApp().start(parser.parse_args())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class SimuCodecBenchmarkApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        if args.child:
+
+            # The protobuf backend is selected by the environment of this process
+            from google.protobuf.internal import api_implementation
+            from bench.simu_codec_bench import SimuCodecBenchmark
+            benchmark = SimuCodecBenchmark(args.number, args.repeat)
+            results = { "backend" : api_implementation.Type(),
+                        "encoder_mismatches" : [ repr(update) for update in benchmark.check_encoder() ],
+                        "results" : benchmark.run() }
+            print json.dumps(results)
+
+        else:
+
+            # The protobuf backend can only be selected before its first import,
+            # each backend is benchmarked in a dedicated process
+            results = {}
+            for backend in args.backends.split(","):
+                env = dict(os.environ)
+                env["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = backend
+                command = [ sys.executable, os.path.abspath(__file__), "--child",
+                            "--number", str(args.number), "--repeat", str(args.repeat) ]
+                try:
+                    output = subprocess.check_output(command, env=env)
+                    child_results = json.loads(output.splitlines()[-1])
+                    if child_results["backend"] == backend:
+                        results[backend] = child_results["results"]
+                        for update in child_results["encoder_mismatches"]:
+                            print "Fast encoder mismatch with the " + backend + " backend : " + update
+                    else:
+                        print "Backend " + backend + " not available"
+                except (subprocess.CalledProcessError, ValueError, IndexError):
+                    print "Backend " + backend + " failed"
+
+            self.__print_table(results)
+            if not (args.output == None):
+                with open(args.output, "w") as output_file:
+                    output_file.write(json.dumps(results, indent=4, sort_keys=True) + "\n")
+
+        return
+
+    def __print_table(self, results):
+        '''
+            Print the results as a table
+
+            @param results: Time per operation (nanoseconds) by benchmark name by backend
+            @type results: {string:{string:float}}
+        '''
+
+        backends = sorted(results.keys())
+        names = set()
+        for backend in backends:
+            names.update(results[backend].keys())
+
+        print "benchmark".ljust(48) + "".join([ (backend + " (ns)").rjust(16) for backend in backends ])
+        for name in sorted(names):
+            line = name.ljust(48)
+            for backend in backends:
+                value = results[backend].get(name)
+                if value == None:
+                    line += "-".rjust(16)
+                else:
+                    line += ("%.0f" % value).rjust(16)
+            print line
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Benchmark the protobuf encoding and decoding of the simulator messages")
+    parser.add_argument("--backends", default="python,cpp", help="Comma separated protobuf backends to compare (python, cpp, upb)")
+    parser.add_argument("--number", type=int, default=10000, help="Number of operations of each timing")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timings of each benchmark, the best one is kept")
+    parser.add_argument("--output", default=None, help="JSON results file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    SimuCodecBenchmarkApp().start(parser.parse_args())
@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import select
+from collections import deque
+from com.simu_protocol import SimuProtocol, SimuProtocolListener
+from com.simu_time import monotonic
+
+####################################################
+#### Data types
+
+
+
+####################################################
+#### Classes
+
+
+class SimuFuture(object):
+    '''
+        Result of a request, available once the response has been received
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__done = False
+        '''
+            Indicates if the result is available
+        '''
+
+        self.__result = None
+        '''
+            Result of the request
+        '''
+
+        self.__callbacks = []
+        '''
+            Functions to call when the result is available
+        '''
+
+        return
+
+    def done(self):
+        '''
+            Indicate if the result is available
+
+            @return: True if the result is available, False otherwise
+            @rtype: bool
+        '''
+
+        return self.__done
+
+    def result(self):
+        '''
+            Get the result of the request
+
+            @return: Result of the request, None if not available
+            @rtype: object
+        '''
+
+        return self.__result
+
+    def set_result(self, result):
+        '''
+            Set the result of the request and call the registered callbacks
+
+            @param result: Result of the request
+            @type result: object
+        '''
+
+        if not self.__done:
+            self.__result = result
+            self.__done = True
+            for callback in self.__callbacks:
+                callback(self)
+            self.__callbacks = []
+
+        return
+
+    def add_done_callback(self, callback):
+        '''
+            Register a function to call when the result is available,
+            the function is called immediately if the result is already available
+
+            @param callback: Function to call
+            @type callback: function(SimuFuture)
+        '''
+
+        if self.__done:
+            callback(self)
+        else:
+            self.__callbacks.append(callback)
+
+        return
+
+
+class AsyncSimuProtocol(SimuProtocolListener):
+    '''
+        Simulator asynchronous protocol : requests return futures and the received
+        data is processed by the caller's event loop instead of a receive thread
+    '''
+
+    def __init__(self, target_ip, target_port, host_port, window_size=16, request_timeout=1.5, max_notifications=1024, udp_socket=None):
+        '''
+            Constructor
+
+            @param target_ip: IP address of the Open Vario simulated instance
+            @type target_ip: string
+            @param target_port: Port of the Open Vario simulated instance
+            @type target_port: int
+            @param host_port: Port of the simulator
+            @type host_port: int
+            @param window_size: Maximum number of requests awaiting a response
+            @type window_size: int
+            @param request_timeout: Maximum time to wait for a response (seconds)
+            @type request_timeout: float
+            @param max_notifications: Maximum number of received notifications kept until they are read,
+                                      the oldest ones are dropped
+            @type max_notifications: int
+            @param udp_socket: Socket shared with other protocol instances, None to use a dedicated socket.
+                               The datagrams received on a shared socket must be given to process_datagram
+            @type udp_socket: UdpSocket
+        '''
+
+        self.__simu_protocol = SimuProtocol(target_ip, target_port, host_port, window_size, request_timeout, False, udp_socket)
+        '''
+            Simulation protocol instance to use for communication
+        '''
+
+        self.__notifications = deque(maxlen=max_notifications)
+        '''
+            Received notifications not yet read : [ SimuValues ]
+        '''
+
+        self.__connect_future = None
+        '''
+            Future of the pending connection process
+        '''
+
+        self.__is_connected = False
+        '''
+            Indicate if the simulator protocol is connected
+        '''
+
+        return
+
+    def is_connected(self):
+        '''
+            Indicate if the simulator protocol is connected
+
+            @return: True if the simulator protocol is connected, False otherwise
+            @rtype: bool
+        '''
+
+        return self.__is_connected
+
+    def fileno(self):
+        '''
+            Get the file descriptor to wait for received data
+
+            @return: File descriptor, None if the protocol is not connected or uses a shared socket
+            @rtype: int
+        '''
+
+        return self.__simu_protocol.fileno()
+
+    def get_target_address(self):
+        '''
+            Get the address of the Open Vario simulated instance
+
+            @return: IP address and port of the Open Vario simulated instance
+            @rtype: (string, int)
+        '''
+
+        return self.__simu_protocol.get_target_address()
+
+    def get_next_timeout(self):
+        '''
+            Get the time until the next protocol timeout to check
+
+            @return: Time until the next timeout to check (seconds), None if there is nothing to check
+            @rtype: float
+        '''
+
+        return self.__simu_protocol.get_next_timeout()
+
+    def connect(self):
+        '''
+            Start the connection process to the Open Vario simulated instance
+
+            @return: Future of the connection status
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        self.__connect_future = future
+        if not self.__simu_protocol.connect(self):
+            self.__connect_future = None
+            future.set_result(False)
+
+        return future
+
+    def close(self):
+        '''
+            Close the connection with the Open Vario simulated instance
+
+            @return: True if the connection has been closed, False otherwise
+            @rtype: bool
+        '''
+
+        self.__is_connected = False
+        ret = self.__simu_protocol.close()
+        return ret
+
+    def get_sensors(self):
+        '''
+            Get the sensor registry of the current connection session
+
+            @return: Sensor registry, None if the sensor list has not been received since the connection
+            @rtype: SimuSensorRegistry
+        '''
+
+        return self.__simu_protocol.get_sensors()
+
+    def get_sensors_list(self, refresh=False):
+        '''
+            Get the sensor list of the Open Vario simulated instance, requested once per connection session.
+            The future is already done when the sensor list is known
+
+            @param refresh: Indicates if the sensor list must be requested even if it is already known
+            @type refresh: bool
+
+            @return: Future of the list of sensors (None if no response received),
+                     None if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.get_sensors_list(future.set_result, refresh):
+            future = None
+
+        return future
+
+    def update_sensor(self, id, value, value_type):
+        '''
+            Update a sensor value of the Open Vario simulated instance
+
+            @param id: Id of the sensor
+            @type id: int
+            @param value: Value of the sensor
+            @type value: int or float or bool or string
+            @param value_type: Value type of the sensor
+            @type value_type: SimuSensorValueType
+
+            @return: Future of the update status (None if no response received),
+                     None if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.update_sensor(id, value, value_type, future.set_result):
+            future = None
+
+        return future
+
+    def update_sensors(self, sensors):
+        '''
+            Update several sensor values of the Open Vario simulated instance in a single request
+
+            @param sensors: Sensors to update
+            @type sensors: [ (int, int or float or bool or string, SimuSensorValueType) ]
+
+            @return: Future of the update status (None if no response received),
+                     None if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.update_sensors(sensors, future.set_result):
+            future = None
+
+        return future
+
+    def update_sensor_value(self, sensor, value):
+        '''
+            Update a sensor value of the Open Vario simulated instance, the value type being
+            the one of the sensor list. The value is checked before sending the request
+
+            @param sensor: Id or name of the sensor
+            @type sensor: int or string
+            @param value: Value of the sensor, its type must match the value type of the sensor
+            @type value: int or float or bool or string
+
+            @return: Future of the update status (None if no response received), None if the value
+                     has been rejected or if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.update_sensor_value(sensor, value, future.set_result):
+            future = None
+
+        return future
+
+    def update_sensor_values(self, values, batch=False):
+        '''
+            Update several sensor values of the Open Vario simulated instance, with a request per value
+            unless the batch is requested, the value types being the ones of the sensor list. The values
+            are checked before sending the requests
+
+            @param values: Sensors to update
+            @type values: [ (int or string, int or float or bool or string) ]
+            @param batch: Indicates if the values are sent in a single update_sensors request, which needs a
+                          firmware handling it, otherwise an update_sensor request is sent per value
+            @type batch: bool
+
+            @return: Future of the update status (None if no response received), None if a value
+                     has been rejected or if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.update_sensor_values(values, future.set_result, batch):
+            future = None
+
+        return future
+
+    def get_config(self):
+        '''
+            Get the configuration values read or written during the current connection session
+
+            @return: Configuration cache
+            @rtype: SimuConfigCache
+        '''
+
+        return self.__simu_protocol.get_config()
+
+    def read_config(self, group_id, value_id):
+        '''
+            Read a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+
+            @return: Future of the configuration value (False if the value does not exist, None if no
+                     response received), None if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.read_config(group_id, value_id, future.set_result):
+            future = None
+
+        return future
+
+    def write_config(self, group_id, value_id, value, value_type):
+        '''
+            Write a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param value: Configuration value
+            @type value: int or float or bool or string
+            @param value_type: Value type of the configuration value
+            @type value_type: SimuSensorValueType
+
+            @return: Future of the write status (None if no response received),
+                     None if the request could not be sent
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.write_config(group_id, value_id, value, value_type, future.set_result):
+            future = None
+
+        return future
+
+    def dump_config(self):
+        '''
+            Read all the configuration values of the Open Vario simulated instance
+
+            @return: Future of the configuration values (None if a response has not been received),
+                     None if the dump could not be started
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.dump_config(future.set_result):
+            future = None
+
+        return future
+
+    def restore_config(self, values):
+        '''
+            Apply configuration values to the Open Vario simulated instance, only the values
+            which differ from the values of the instance are written
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+
+            @return: Future of the written values ([] if the configuration was already up to date,
+                     False if a value is not known by the instance or a write has failed, None if a
+                     response has not been received or a read has been sent again), None if the restore
+                     could not be started
+            @rtype: SimuFuture
+        '''
+
+        future = SimuFuture()
+        if not self.__simu_protocol.restore_config(values, future.set_result):
+            future = None
+
+        return future
+
+    def notifications(self):
+        '''
+            Iterate over the received notifications not yet read
+
+            @return: Iterator over the notifications
+            @rtype: iterator over SimuValues
+        '''
+
+        notifications = self.__notifications
+        while notifications:
+            yield notifications.popleft()
+
+        return
+
+    def process(self):
+        '''
+            Process the received data and the timeouts without blocking
+
+            @return: Number of processed datagrams
+            @rtype: int
+        '''
+
+        return self.__simu_protocol.process()
+
+    def process_datagram(self, data):
+        '''
+            Process a datagram received from the Open Vario simulated instance on a shared socket
+
+            @param data: Received datagram, only valid during the call when it is a view on a receive buffer
+            @type data: string or memoryview
+        '''
+
+        self.__simu_protocol.process_datagram(data)
+        return
+
+    def poll(self, timeout):
+        '''
+            Wait for received data and process it, the wait ends early when a protocol timeout has to be checked
+
+            @param timeout: Maximum time to wait for data (seconds)
+            @type timeout: float
+
+            @return: Number of processed datagrams
+            @rtype: int
+        '''
+
+        fd = self.fileno()
+        if not (fd == None):
+
+            # Do not wait beyond the next protocol timeout
+            next_timeout = self.get_next_timeout()
+            if not (next_timeout == None):
+                timeout = min(timeout, next_timeout)
+            select.select([fd], [], [], timeout)
+
+        return self.process()
+
+    def wait(self, future, timeout):
+        '''
+            Process the received data until a future is done
+
+            @param future: Future to wait for
+            @type future: SimuFuture
+            @param timeout: Maximum time to wait (seconds)
+            @type timeout: float
+
+            @return: True if the future is done, False otherwise
+            @rtype: bool
+        '''
+
+        deadline = monotonic() + timeout
+        remaining = timeout
+        while (not future.done()) and (remaining > 0) and (not (self.fileno() == None)):
+            self.poll(remaining)
+            remaining = deadline - monotonic()
+
+        return future.done()
+
+    def on_connect(self, success):
+        '''
+            Called at the end of the connection process
+
+            @param success: Indicates if the connection process has succeed
+            @type success: bool
+        '''
+
+        self.__is_connected = success
+        future = self.__connect_future
+        self.__connect_future = None
+        if not (future == None):
+            future.set_result(success)
+
+        return
+
+    def on_close(self):
+        '''
+            Called when the connection has been closed
+        '''
+
+        self.__is_connected = False
+        return
+
+    def on_notification(self, values):
+        '''
+            Called when values have been received
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+
+        self.__notifications.append(values)
+        return
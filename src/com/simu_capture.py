@@ -0,0 +1,912 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import mmap
+import os
+import select
+import sys
+import struct
+import time
+from array import array
+from bisect import bisect_right
+from threading import Lock
+from udp_socket import UdpSocket
+from api.requests_pb2 import SimuRequest
+from api.responses_pb2 import SimuResponse
+from api.notifications_pb2 import SimuNotification
+from com.simu_time import monotonic
+
+
+####################################################
+#### Data types
+
+# Capture file layout, all the fields are little endian :
+#
+#  - File header : magic "OVSCAP", format version (uint8), reserved (uint8),
+#                  wall clock time of the capture start (double, seconds since epoch)
+#  - Records : record type (uint8), timestamp (double, seconds since the capture start),
+#              payload size (uint32), payload
+#
+# The payload of a TX record is a serialized SimuRequest, the payload of a RX record is
+# the received datagram including its 'R' or 'N' frame tag. Every CAPTURE_INDEX_PERIOD
+# frames an index record is written, its payload is the offset of the previous index
+# record (0 if none), the timestamp and the offset of the first frame following the
+# previous index record and the number of frames since the previous index record.
+# The file always ends with an index record when the recorder has been closed, the
+# chain of index records then gives the position of the frames without reading them.
+
+CAPTURE_MAGIC = "OVSCAP"
+'''
+    Magic string of the capture files
+'''
+
+CAPTURE_VERSION = 1
+'''
+    Version of the capture file format
+'''
+
+CAPTURE_TX = 1
+'''
+    Record type of the frames sent by the simulator
+'''
+
+CAPTURE_RX = 2
+'''
+    Record type of the frames received by the simulator
+'''
+
+CAPTURE_INDEX = 3
+'''
+    Record type of the index records
+'''
+
+CAPTURE_FILE_HEADER = struct.Struct("<6sBBd")
+'''
+    File header : magic, version, reserved, capture start (wall clock time)
+'''
+
+CAPTURE_RECORD_HEADER = struct.Struct("<BdI")
+'''
+    Record header : record type, timestamp, payload size
+'''
+
+CAPTURE_INDEX_PAYLOAD = struct.Struct("<QdQI")
+'''
+    Index record payload : previous index offset, first frame timestamp, first frame offset, frame count
+'''
+
+CAPTURE_INDEX_SIZE = CAPTURE_RECORD_HEADER.size + CAPTURE_INDEX_PAYLOAD.size
+'''
+    Size of an index record
+'''
+
+CAPTURE_INDEX_PERIOD = 1024
+'''
+    Default number of frames between two index records
+'''
+
+CAPTURE_INDEX_FILE_MAGIC = "OVSIDX"
+'''
+    Magic string of the index files built by SimuCaptureMap
+'''
+
+CAPTURE_INDEX_FILE_VERSION = 2
+'''
+    Version of the index file format
+'''
+
+CAPTURE_INDEX_FILE_HEADER = struct.Struct("<6sBBdQI")
+'''
+    Index file header : magic, version, reserved, capture start of the indexed capture file,
+    size of the indexed capture file, number of entries. The header is followed by the entry
+    timestamps and the entry offsets, both stored as doubles
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuCaptureRecorder(object):
+    '''
+        Records the frames exchanged with an Open Vario simulated instance into an
+        append-only capture file. The record methods can be called from any thread
+    '''
+
+    def __init__(self, index_period=CAPTURE_INDEX_PERIOD):
+        '''
+            Constructor
+
+            @param index_period: Number of frames between two index records
+            @type index_period: int
+        '''
+
+        self.__index_period = index_period
+        '''
+            Number of frames between two index records
+        '''
+        self.__file = None
+        '''
+            Capture file
+        '''
+        self.__start = 0
+        '''
+            Monotonic time of the capture start
+        '''
+        self.__offset = 0
+        '''
+            Offset of the next record in the file
+        '''
+        self.__frames = 0
+        '''
+            Number of recorded frames
+        '''
+        self.__last_index = 0
+        '''
+            Offset of the last index record, 0 if none
+        '''
+        self.__block_frames = 0
+        '''
+            Number of frames since the last index record
+        '''
+        self.__block_timestamp = 0.
+        '''
+            Timestamp of the first frame since the last index record
+        '''
+        self.__block_offset = 0
+        '''
+            Offset of the first frame since the last index record
+        '''
+        self.__lock = Lock()
+        '''
+            Mutex to serialize the writes in the capture file
+        '''
+
+        return
+
+    def open(self, path):
+        '''
+            Create the capture file and start the capture
+
+            @param path: Path of the capture file, overwritten if it already exists
+            @type path: string
+
+            @return: True if the capture file has been created, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        self.__lock.acquire()
+        if self.__file == None:
+            try:
+                self.__file = open(path, "wb")
+                self.__file.write(CAPTURE_FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, 0, time.time()))
+                self.__start = monotonic()
+                self.__offset = CAPTURE_FILE_HEADER.size
+                self.__frames = 0
+                self.__last_index = 0
+                self.__block_frames = 0
+                ret = True
+            except IOError:
+                self.__file = None
+        self.__lock.release()
+
+        return ret
+
+    def close(self):
+        '''
+            Write the final index record and close the capture file
+
+            @return: True if the capture file has been closed, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        self.__lock.acquire()
+        if not (self.__file == None):
+            try:
+                self.__write_index(monotonic() - self.__start)
+                self.__file.close()
+                ret = True
+            except IOError:
+                pass
+            self.__file = None
+        self.__lock.release()
+
+        return ret
+
+    def is_opened(self):
+        '''
+            Indicate if a capture is in progress
+
+            @return: True if the capture file is opened, False otherwise
+            @rtype: bool
+        '''
+
+        return not (self.__file == None)
+
+    def get_frame_count(self):
+        '''
+            Get the number of recorded frames
+
+            @return: Number of recorded frames
+            @rtype: int
+        '''
+
+        return self.__frames
+
+    def record_tx(self, data):
+        '''
+            Record a frame sent by the simulator
+
+            @param data: Serialized SimuRequest
+            @type data: string
+        '''
+
+        self.__record(CAPTURE_TX, data)
+        return
+
+    def record_rx(self, data):
+        '''
+            Record a frame received by the simulator
+
+            @param data: Received datagram with its frame tag, only read during the call
+            @type data: string or memoryview
+        '''
+
+        self.__record(CAPTURE_RX, data)
+        return
+
+    def __record(self, record_type, data):
+        '''
+            Append a frame record to the capture file
+
+            @param record_type: Record type (CAPTURE_TX or CAPTURE_RX)
+            @type record_type: int
+            @param data: Frame
+            @type data: string or memoryview
+        '''
+
+        self.__lock.acquire()
+        if not (self.__file == None):
+            timestamp = monotonic() - self.__start
+            try:
+                if self.__block_frames == 0:
+                    self.__block_timestamp = timestamp
+                    self.__block_offset = self.__offset
+                self.__file.write(CAPTURE_RECORD_HEADER.pack(record_type, timestamp, len(data)))
+                self.__file.write(data)
+                self.__offset += CAPTURE_RECORD_HEADER.size + len(data)
+                self.__frames += 1
+                self.__block_frames += 1
+                if self.__block_frames >= self.__index_period:
+                    self.__write_index(timestamp)
+            except IOError:
+                # Stop the capture on write error, the frames written so far remain readable
+                self.__file.close()
+                self.__file = None
+        self.__lock.release()
+
+        return
+
+    def __write_index(self, timestamp):
+        '''
+            Append an index record covering the frames since the last index record
+
+            @param timestamp: Timestamp of the index record
+            @type timestamp: float
+        '''
+
+        if self.__block_frames == 0:
+            self.__block_timestamp = timestamp
+            self.__block_offset = self.__offset
+        self.__file.write(CAPTURE_RECORD_HEADER.pack(CAPTURE_INDEX, timestamp, CAPTURE_INDEX_PAYLOAD.size))
+        self.__file.write(CAPTURE_INDEX_PAYLOAD.pack(self.__last_index, self.__block_timestamp,
+                                                     self.__block_offset, self.__block_frames))
+        self.__last_index = self.__offset
+        self.__offset += CAPTURE_INDEX_SIZE
+        self.__block_frames = 0
+
+        return
+
+
+class SimuCaptureReader(object):
+    '''
+        Sequential reader of a capture file
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__file = None
+        '''
+            Capture file
+        '''
+        self.__start_time = 0.
+        '''
+            Wall clock time of the capture start
+        '''
+
+        return
+
+    def open(self, path):
+        '''
+            Open a capture file
+
+            @param path: Path of the capture file
+            @type path: string
+
+            @return: True if the file is a valid capture file, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        if self.__file == None:
+            try:
+                self.__file = open(path, "rb")
+                header = self.__file.read(CAPTURE_FILE_HEADER.size)
+                if len(header) == CAPTURE_FILE_HEADER.size:
+                    magic, version, _, self.__start_time = CAPTURE_FILE_HEADER.unpack(header)
+                    ret = (magic == CAPTURE_MAGIC) and (version == CAPTURE_VERSION)
+            except IOError:
+                pass
+            if (not ret) and (not (self.__file == None)):
+                self.__file.close()
+                self.__file = None
+
+        return ret
+
+    def close(self):
+        '''
+            Close the capture file
+        '''
+
+        if not (self.__file == None):
+            self.__file.close()
+            self.__file = None
+
+        return
+
+    def get_start_time(self):
+        '''
+            Get the wall clock time of the capture start
+
+            @return: Capture start (seconds since epoch)
+            @rtype: float
+        '''
+
+        return self.__start_time
+
+    def frames(self, record_type=None):
+        '''
+            Iterate over the recorded frames from the start of the file, a truncated
+            last record is ignored
+
+            @param record_type: Type of the frames to read (CAPTURE_TX or CAPTURE_RX), None for all the frames
+            @type record_type: int
+
+            @return: Iterator over the frames
+            @rtype: iterator over (int, float, string) : record type, timestamp, frame
+        '''
+
+        if not (self.__file == None):
+            capture_file = self.__file
+            capture_file.seek(CAPTURE_FILE_HEADER.size)
+            header_size = CAPTURE_RECORD_HEADER.size
+            while True:
+                header = capture_file.read(header_size)
+                if len(header) < header_size:
+                    break
+                frame_type, timestamp, size = CAPTURE_RECORD_HEADER.unpack(header)
+                if (frame_type == CAPTURE_INDEX) or ((not (record_type == None)) and (not (frame_type == record_type))):
+                    capture_file.seek(size, 1)
+                else:
+                    data = capture_file.read(size)
+                    if len(data) < size:
+                        break
+                    yield (frame_type, timestamp, data)
+
+        return
+
+
+class SimuCaptureReplayer(object):
+    '''
+        Sends again the frames sent by the simulator during a capture
+    '''
+
+    def __init__(self, target_ip, target_port, host_port):
+        '''
+            Constructor
+
+            @param target_ip: IP address of the Open Vario simulated instance
+            @type target_ip: string
+            @param target_port: Port of the Open Vario simulated instance
+            @type target_port: int
+            @param host_port: Port of the simulator
+            @type host_port: int
+        '''
+
+        self.__target_ip = target_ip
+        '''
+            IP address of the Open Vario simulated instance
+        '''
+        self.__target_port = target_port
+        '''
+            Port of the Open Vario simulated instance
+        '''
+        self.__host_port = host_port
+        '''
+            Port of the simulator
+        '''
+        self.__sent = 0
+        '''
+            Number of frames sent during the last replay
+        '''
+        self.__received = 0
+        '''
+            Number of frames received during the last replay
+        '''
+
+        return
+
+    def get_sent_count(self):
+        '''
+            Get the number of frames sent during the last replay
+
+            @return: Number of sent frames
+            @rtype: int
+        '''
+
+        return self.__sent
+
+    def get_received_count(self):
+        '''
+            Get the number of frames received during the last replay
+
+            @return: Number of received frames
+            @rtype: int
+        '''
+
+        return self.__received
+
+    def replay(self, path, speed=1.0, recorder=None, linger=0.5):
+        '''
+            Replay the frames sent by the simulator in a capture file
+
+            @param path: Path of the capture file
+            @type path: string
+            @param speed: Replay speed factor relative to the capture timing, None to send as fast as possible
+            @type speed: float
+            @param recorder: Recorder of the frames exchanged during the replay, None to only count them
+            @type recorder: SimuCaptureRecorder
+            @param linger: Time to wait for the responses to the last frames (seconds)
+            @type linger: float
+
+            @return: True if the capture has been replayed, False otherwise
+            @rtype: bool
+        '''
+
+        self.__sent = 0
+        self.__received = 0
+
+        reader = SimuCaptureReader()
+        udp_socket = UdpSocket()
+        ret = reader.open(path)
+        if ret:
+            ret = udp_socket.open() and udp_socket.bind("", self.__host_port)
+        if ret:
+            udp_socket.set_timeout(0)
+            rx_buffer = bytearray(65535)
+            rx_view = memoryview(rx_buffer)
+            fd = udp_socket.fileno()
+
+            start = monotonic()
+            first_timestamp = None
+            for _, timestamp, data in reader.frames(CAPTURE_TX):
+
+                # Wait for the frame sending time while receiving the responses
+                if first_timestamp == None:
+                    first_timestamp = timestamp
+                if speed:
+                    deadline = start + (timestamp - first_timestamp) / speed
+                    remaining = deadline - monotonic()
+                    while remaining > 0:
+                        select.select([fd], [], [], remaining)
+                        self.__receive(udp_socket, rx_buffer, rx_view, recorder)
+                        remaining = deadline - monotonic()
+
+                # Send frame
+                if udp_socket.send_to(self.__target_ip, self.__target_port, data):
+                    self.__sent += 1
+                    if not (recorder == None):
+                        recorder.record_tx(data)
+                self.__receive(udp_socket, rx_buffer, rx_view, recorder)
+
+            # Receive the last responses
+            deadline = monotonic() + linger
+            remaining = linger
+            while remaining > 0:
+                select.select([fd], [], [], remaining)
+                self.__receive(udp_socket, rx_buffer, rx_view, recorder)
+                remaining = deadline - monotonic()
+
+        udp_socket.close()
+        reader.close()
+
+        return ret
+
+    def __receive(self, udp_socket, rx_buffer, rx_view, recorder):
+        '''
+            Receive the available frames without blocking
+
+            @param udp_socket: Socket of the replay
+            @type udp_socket: UdpSocket
+            @param rx_buffer: Receive buffer
+            @type rx_buffer: bytearray
+            @param rx_view: View on the receive buffer
+            @type rx_view: memoryview
+            @param recorder: Recorder of the received frames, may be None
+            @type recorder: SimuCaptureRecorder
+        '''
+
+        ret = udp_socket.recv_from_into(rx_buffer)
+        while not (ret == None):
+            self.__received += 1
+            if not (recorder == None):
+                recorder.record_rx(rx_view[:ret[0]])
+            ret = udp_socket.recv_from_into(rx_buffer)
+
+        return
+
+
+class SimuCaptureMap(object):
+    '''
+        Memory-mapped capture file giving a fast access to the frames of a time range.
+        The frames are located through a sparse timestamp to offset index which is
+        persisted next to the capture file, and are only decoded when iterated
+    '''
+
+    def __init__(self, index_period=CAPTURE_INDEX_PERIOD):
+        '''
+            Constructor
+
+            @param index_period: Number of frames between two index entries when the index is
+                                 built by reading the whole capture file
+            @type index_period: int
+        '''
+
+        self.__index_period = index_period
+        '''
+            Number of frames between two index entries when the index is built by reading the whole file
+        '''
+        self.__file = None
+        '''
+            Capture file
+        '''
+        self.__map = None
+        '''
+            Memory map of the capture file
+        '''
+        self.__size = 0
+        '''
+            Size of the capture file
+        '''
+        self.__start_time = 0.
+        '''
+            Wall clock time of the capture start
+        '''
+        self.__timestamps = array("d")
+        '''
+            Timestamps of the indexed frames, sorted
+        '''
+        self.__offsets = array("d")
+        '''
+            Offsets of the indexed frames
+        '''
+
+        return
+
+    def open(self, path, index_path=None):
+        '''
+            Map a capture file and load its index, the index is built and saved
+            if it does not exist or does not match the capture file
+
+            @param path: Path of the capture file
+            @type path: string
+            @param index_path: Path of the index file, None to use the capture file path followed by ".idx"
+            @type index_path: string
+
+            @return: True if the file is a valid capture file, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        if self.__file == None:
+            try:
+                self.__file = open(path, "rb")
+                self.__size = os.fstat(self.__file.fileno()).st_size
+                if self.__size >= CAPTURE_FILE_HEADER.size:
+                    self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+                    magic, version, _, self.__start_time = CAPTURE_FILE_HEADER.unpack_from(self.__map, 0)
+                    ret = (magic == CAPTURE_MAGIC) and (version == CAPTURE_VERSION)
+            except (IOError, OSError, mmap.error):
+                pass
+            if ret:
+                if index_path == None:
+                    index_path = path + ".idx"
+                if not self.__load_index(index_path):
+                    self.__build_index()
+                    self.__save_index(index_path)
+            else:
+                self.close()
+
+        return ret
+
+    def close(self):
+        '''
+            Unmap and close the capture file
+        '''
+
+        if not (self.__map == None):
+            self.__map.close()
+            self.__map = None
+        if not (self.__file == None):
+            self.__file.close()
+            self.__file = None
+        self.__timestamps = array("d")
+        self.__offsets = array("d")
+
+        return
+
+    def get_start_time(self):
+        '''
+            Get the wall clock time of the capture start
+
+            @return: Capture start (seconds since epoch)
+            @rtype: float
+        '''
+
+        return self.__start_time
+
+    def get_index_size(self):
+        '''
+            Get the number of entries of the index
+
+            @return: Number of index entries
+            @rtype: int
+        '''
+
+        return len(self.__offsets)
+
+    def frames(self, start=None, end=None, record_type=None):
+        '''
+            Iterate over the frames recorded in a time range without decoding them
+
+            @param start: Start of the range (seconds since the capture start, included), None for the first frame
+            @type start: float
+            @param end: End of the range (seconds since the capture start, included), None for the last frame
+            @type end: float
+            @param record_type: Type of the frames to read (CAPTURE_TX or CAPTURE_RX), None for all the frames
+            @type record_type: int
+
+            @return: Iterator over the frames
+            @rtype: iterator over (int, float, string) : record type, timestamp, frame
+        '''
+
+        capture_map = self.__map
+        if not (capture_map == None):
+
+            # Start from the last indexed frame preceding the range
+            offset = CAPTURE_FILE_HEADER.size
+            if not (start == None):
+                entry = bisect_right(self.__timestamps, start) - 1
+                if entry >= 0:
+                    offset = int(self.__offsets[entry])
+
+            header_size = CAPTURE_RECORD_HEADER.size
+            size = self.__size
+            while offset + header_size <= size:
+                frame_type, timestamp, frame_size = CAPTURE_RECORD_HEADER.unpack_from(capture_map, offset)
+                offset += header_size
+                if offset + frame_size > size:
+                    break
+                if frame_type == CAPTURE_INDEX:
+                    pass
+                elif (not (end == None)) and (timestamp > end):
+                    break
+                elif ((start == None) or (timestamp >= start)) and ((record_type == None) or (frame_type == record_type)):
+                    yield (frame_type, timestamp, capture_map[offset:offset + frame_size])
+                offset += frame_size
+
+        return
+
+    def messages(self, start=None, end=None, record_type=None):
+        '''
+            Iterate over the decoded frames recorded in a time range
+
+            @param start: Start of the range (seconds since the capture start, included), None for the first frame
+            @type start: float
+            @param end: End of the range (seconds since the capture start, included), None for the last frame
+            @type end: float
+            @param record_type: Type of the frames to read (CAPTURE_TX or CAPTURE_RX), None for all the frames
+            @type record_type: int
+
+            @return: Iterator over the decoded frames, the frames which cannot be decoded are skipped
+            @rtype: iterator over (int, float, SimuRequest or SimuResponse or SimuNotification) :
+                    record type, timestamp, message
+        '''
+
+        for frame_type, timestamp, data in self.frames(start, end, record_type):
+
+            # Received frames start with their frame tag
+            try:
+                if frame_type == CAPTURE_TX:
+                    message = SimuRequest()
+                    message.ParseFromString(data)
+                else:
+                    if data[0] == "R":
+                        message = SimuResponse()
+                    elif data[0] == "N":
+                        message = SimuNotification()
+                    else:
+                        message = None
+                    if not (message == None):
+                        message.ParseFromString(data[1:])
+            except:
+                message = None
+
+            if not (message == None):
+                yield (frame_type, timestamp, message)
+
+        return
+
+    def __build_index(self):
+        '''
+            Build the index from the index records of the capture file, or by reading
+            all the frame headers when the capture has not been properly closed
+        '''
+
+        timestamps = array("d")
+        offsets = array("d")
+        capture_map = self.__map
+
+        # Follow the chain of index records from the end of the file
+        offset = self.__size - CAPTURE_INDEX_SIZE
+        valid = offset >= CAPTURE_FILE_HEADER.size
+        while valid:
+            record_type, _, payload_size = CAPTURE_RECORD_HEADER.unpack_from(capture_map, offset)
+            valid = (record_type == CAPTURE_INDEX) and (payload_size == CAPTURE_INDEX_PAYLOAD.size)
+            if valid:
+                previous, timestamp, first_offset, count = CAPTURE_INDEX_PAYLOAD.unpack_from(capture_map, offset + CAPTURE_RECORD_HEADER.size)
+                if count > 0:
+                    timestamps.append(timestamp)
+                    offsets.append(first_offset)
+                if previous == 0:
+                    break
+                valid = (previous < offset) and (previous >= CAPTURE_FILE_HEADER.size)
+                offset = previous
+        if valid:
+            timestamps.reverse()
+            offsets.reverse()
+
+        else:
+
+            # Read the frame headers
+            timestamps = array("d")
+            offsets = array("d")
+            header_size = CAPTURE_RECORD_HEADER.size
+            size = self.__size
+            count = 0
+            offset = CAPTURE_FILE_HEADER.size
+            while offset + header_size <= size:
+                record_type, timestamp, payload_size = CAPTURE_RECORD_HEADER.unpack_from(capture_map, offset)
+                if not (record_type == CAPTURE_INDEX):
+                    if (count % self.__index_period) == 0:
+                        timestamps.append(timestamp)
+                        offsets.append(offset)
+                    count += 1
+                offset += header_size + payload_size
+
+        self.__timestamps = timestamps
+        self.__offsets = offsets
+
+        return
+
+    def __load_index(self, index_path):
+        '''
+            Load the index from an index file
+
+            @param index_path: Path of the index file
+            @type index_path: string
+
+            @return: True if the index has been loaded, False if the index file does not exist
+                     or does not match the capture file
+            @rtype: bool
+        '''
+
+        ret = False
+        try:
+            index_file = open(index_path, "rb")
+            try:
+                header = index_file.read(CAPTURE_INDEX_FILE_HEADER.size)
+                if len(header) == CAPTURE_INDEX_FILE_HEADER.size:
+                    magic, version, _, start_time, size, count = CAPTURE_INDEX_FILE_HEADER.unpack(header)
+
+                    # A capture rewritten with the same size is told apart by its start time
+                    if ((magic == CAPTURE_INDEX_FILE_MAGIC) and (version == CAPTURE_INDEX_FILE_VERSION) and
+                        (start_time == self.__start_time) and (size == self.__size)):
+                        timestamps = array("d")
+                        offsets = array("d")
+                        timestamps.fromfile(index_file, count)
+                        offsets.fromfile(index_file, count)
+                        if sys.byteorder == "big":
+                            timestamps.byteswap()
+                            offsets.byteswap()
+                        self.__timestamps = timestamps
+                        self.__offsets = offsets
+                        ret = True
+            finally:
+                index_file.close()
+        except (IOError, EOFError):
+            pass
+
+        return ret
+
+    def __save_index(self, index_path):
+        '''
+            Save the index into an index file
+
+            @param index_path: Path of the index file
+            @type index_path: string
+
+            @return: True if the index has been saved, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        timestamps = self.__timestamps
+        offsets = self.__offsets
+        if sys.byteorder == "big":
+            timestamps = array("d", timestamps)
+            offsets = array("d", offsets)
+            timestamps.byteswap()
+            offsets.byteswap()
+        try:
+            index_file = open(index_path, "wb")
+            try:
+                index_file.write(CAPTURE_INDEX_FILE_HEADER.pack(CAPTURE_INDEX_FILE_MAGIC, CAPTURE_INDEX_FILE_VERSION, 0,
+                                                                self.__start_time, self.__size, len(offsets)))
+                timestamps.tofile(index_file)
+                offsets.tofile(index_file)
+                ret = True
+            finally:
+                index_file.close()
+        except IOError:
+            pass
+
+        return ret
@@ -0,0 +1,654 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import struct
+from threading import Lock
+from com.simu_encoder import VALUE_TYPE_FLOAT
+
+
+####################################################
+#### Data types
+
+FLOAT = struct.Struct("<f")
+'''
+    Single precision floating point value, to compare float values as stored by the instance
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuConfigValue(object):
+    '''
+        Configuration value of the Open Vario simulated instance, as described by a ConfigValueReadResponse
+    '''
+
+    __slots__ = ("group_id", "value_id", "group_name", "name", "type_name", "size",
+                 "value_type", "value", "min_value", "max_value", "reset_only")
+
+    def __init__(self, group_id, value_id, group_name, name, type_name, size, value_type,
+                 value, min_value=None, max_value=None, reset_only=False):
+        '''
+            Constructor
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param group_name: Value group name
+            @type group_name: string
+            @param name: Value name
+            @type name: string
+            @param type_name: Value type name given by the instance
+            @type type_name: string
+            @param size: Value size in bytes
+            @type size: int
+            @param value_type: Value type
+            @type value_type: SimuSensorValueType
+            @param value: Current value
+            @type value: int or float or bool or string
+            @param min_value: Minimum value, None if the value has no bounds
+            @type min_value: int or float or bool or string
+            @param max_value: Maximum value, None if the value has no bounds
+            @type max_value: int or float or bool or string
+            @param reset_only: Indicates if the value is taken into account at reset only
+            @type reset_only: bool
+        '''
+
+        self.group_id = group_id
+        self.value_id = value_id
+        self.group_name = group_name
+        self.name = name
+        self.type_name = type_name
+        self.size = size
+        self.value_type = value_type
+        self.value = value
+        self.min_value = min_value
+        self.max_value = max_value
+        self.reset_only = reset_only
+
+        return
+
+    def get_key(self):
+        '''
+            Get the key of the value in the configuration
+
+            @return: Group ID and value ID
+            @rtype: (int, int)
+        '''
+
+        return (self.group_id, self.value_id)
+
+    def has_min_max(self):
+        '''
+            Indicate if the value has min and max values
+
+            @return: True if the value has min and max values, False otherwise
+            @rtype: bool
+        '''
+
+        return not (self.min_value == None)
+
+    def is_equal(self, value):
+        '''
+            Indicate if a value is the current value, single precision values being compared
+            after rounding so that a value read back from the instance is equal to the written one
+
+            @param value: Value to compare
+            @type value: int or float or bool or string
+
+            @return: True if the value is the current value, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        try:
+            if self.value_type.value == VALUE_TYPE_FLOAT:
+                ret = (FLOAT.pack(float(value)) == FLOAT.pack(float(self.value)))
+            else:
+                ret = (value == self.value)
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+        return ret
+
+    def copy(self):
+        '''
+            Copy the value
+
+            @return: Copy of the value
+            @rtype: SimuConfigValue
+        '''
+
+        return SimuConfigValue(self.group_id, self.value_id, self.group_name, self.name, self.type_name, self.size,
+                               self.value_type, self.value, self.min_value, self.max_value, self.reset_only)
+
+    def __repr__(self):
+        '''
+            Printable representation of the value
+        '''
+
+        return ("SimuConfigValue(" + str(self.group_id) + ", " + str(self.value_id) + ", " + repr(self.group_name) + ", " +
+                repr(self.name) + ", " + str(self.value_type) + ", value=" + repr(self.value) + ")")
+
+
+class SimuConfigCache(object):
+    '''
+        Local copy of the configuration values read from or written to the Open Vario simulated
+        instance during a connection session
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__values = {}
+        '''
+            Configuration values : { (group ID, value ID) : SimuConfigValue }
+        '''
+        self.__lock = Lock()
+        '''
+            Mutex to protect the values from concurrent accesses
+        '''
+
+        return
+
+    def update(self, value):
+        '''
+            Store a configuration value read from the instance
+
+            @param value: Configuration value
+            @type value: SimuConfigValue
+        '''
+
+        self.__lock.acquire()
+        self.__values[value.get_key()] = value
+        self.__lock.release()
+
+        return
+
+    def set_value(self, group_id, value_id, value):
+        '''
+            Update the current value of a configuration value written to the instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param value: Written value
+            @type value: int or float or bool or string
+        '''
+
+        self.__lock.acquire()
+        config_value = self.__values.get((group_id, value_id))
+        if not (config_value == None):
+
+            # Values given to the user are not modified afterwards
+            config_value = config_value.copy()
+            config_value.value = value
+            self.__values[(group_id, value_id)] = config_value
+        self.__lock.release()
+
+        return
+
+    def get(self, group_id, value_id):
+        '''
+            Get a configuration value
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+
+            @return: Configuration value, None if the value is not known
+            @rtype: SimuConfigValue
+        '''
+
+        self.__lock.acquire()
+        ret = self.__values.get((group_id, value_id))
+        self.__lock.release()
+
+        return ret
+
+    def find(self, group_name, name):
+        '''
+            Get a configuration value from its group name and its name
+
+            @param group_name: Value group name
+            @type group_name: string
+            @param name: Value name
+            @type name: string
+
+            @return: Configuration value, None if the value is not known
+            @rtype: SimuConfigValue
+        '''
+
+        ret = None
+        self.__lock.acquire()
+        for value in self.__values.itervalues():
+            if (value.group_name == group_name) and (value.name == name):
+                ret = value
+                break
+        self.__lock.release()
+
+        return ret
+
+    def get_values(self):
+        '''
+            Get the known configuration values
+
+            @return: Configuration values sorted by group ID and value ID
+            @rtype: [ SimuConfigValue ]
+        '''
+
+        self.__lock.acquire()
+        ret = [ self.__values[key] for key in sorted(self.__values) ]
+        self.__lock.release()
+
+        return ret
+
+    def get_count(self):
+        '''
+            Get the number of known configuration values
+
+            @return: Number of configuration values
+            @rtype: int
+        '''
+
+        return len(self.__values)
+
+    def diff(self, values):
+        '''
+            Compute the writes needed to apply configuration values
+
+            @param values: Configuration values to apply
+            @type values: [ (int, int, int or float or bool or string) ]
+
+            @return: Values which are unknown or differ from the known values :
+                     [ (group ID, value ID, value, SimuSensorValueType or None if the value is unknown) ]
+            @rtype: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        ret = []
+        self.__lock.acquire()
+        for group_id, value_id, value in values:
+            config_value = self.__values.get((group_id, value_id))
+            if config_value == None:
+                ret.append( (group_id, value_id, value, None) )
+            elif not config_value.is_equal(value):
+                ret.append( (group_id, value_id, value, config_value.value_type) )
+        self.__lock.release()
+
+        return ret
+
+    def get_writes(self, values):
+        '''
+            Compute the writes needed to apply configuration values, typically the values of a
+            snapshot of another instance. A value is matched by its group ID and value ID when the
+            names match, otherwise by its group name and name
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+
+            @return: Values which differ from the known values : [ (group ID, value ID, value, SimuSensorValueType) ],
+                     None if a value is not known or has a different value type
+            @rtype: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        ret = []
+        self.__lock.acquire()
+        by_name = None
+        for value in values:
+            config_value = self.__values.get(value.get_key())
+            if ((not (config_value == None)) and
+                ((not (config_value.group_name == value.group_name)) or (not (config_value.name == value.name)))):
+                config_value = None
+            if config_value == None:
+                if by_name == None:
+                    by_name = dict( ((config_value.group_name, config_value.name), config_value) for config_value in self.__values.itervalues() )
+                config_value = by_name.get((value.group_name, value.name))
+            if (config_value == None) or (not (config_value.value_type == value.value_type)):
+                ret = None
+                break
+            if not config_value.is_equal(value.value):
+                ret.append( (config_value.group_id, config_value.value_id, value.value, config_value.value_type) )
+        self.__lock.release()
+
+        return ret
+
+    def clear(self):
+        '''
+            Remove all the known configuration values
+        '''
+
+        self.__lock.acquire()
+        self.__values = {}
+        self.__lock.release()
+
+        return
+
+
+class SimuConfigDump(object):
+    '''
+        Read of all the configuration values of the Open Vario simulated instance with pipelined
+        requests. The instance does not give the number of groups and values, so the values of a
+        group are read in sequence until a read fails, and the groups are read in sequence until
+        the read of the first value of a group fails. Reads are sent ahead within the depth, the extra
+        reads beyond the end of a group are ignored. The reads which have not received a response
+        are sent again
+    '''
+
+    def __init__(self, read_config, depth, callback, retries=3):
+        '''
+            Constructor
+
+            @param read_config: Function sending a configuration read request
+            @type read_config: function(int, int, function(SimuConfigValue or bool)) -> bool
+            @param depth: Maximum number of reads awaiting a response
+            @type depth: int
+            @param callback: Called at the end of the dump with the configuration values sorted by group ID
+                             and value ID, None if a read has not received a response after all its retries
+                             or could not be sent
+            @type callback: function([ SimuConfigValue ])
+            @param retries: Number of times a read which has not received a response is sent again
+            @type retries: int
+        '''
+
+        self.__read_config = read_config
+        '''
+            Function sending a configuration read request
+        '''
+        self.__depth = max(1, depth)
+        '''
+            Maximum number of reads awaiting a response
+        '''
+        self.__callback = callback
+        '''
+            Called at the end of the dump
+        '''
+        self.__retries = retries
+        '''
+            Number of times a read which has not received a response is sent again
+        '''
+        self.__lost = []
+        '''
+            Reads to send again : [ (group ID, value ID) ]
+        '''
+        self.__attempts = {}
+        '''
+            Number of times a read has not received a response : { (group ID, value ID) : int }
+        '''
+        self.__values = []
+        '''
+            Read configuration values
+        '''
+        self.__group_id = 0
+        '''
+            Group currently read
+        '''
+        self.__value_id = 0
+        '''
+            Next value to read in the current group
+        '''
+        self.__in_flight = 0
+        '''
+            Number of reads awaiting a response
+        '''
+        self.__end = False
+        '''
+            Indicates if all the groups have been read
+        '''
+        self.__failed = False
+        '''
+            Indicates if a response has not been received or a read could not be sent
+        '''
+        self.__done = False
+        '''
+            Indicates if the end of the dump has been notified
+        '''
+
+        return
+
+    def start(self):
+        '''
+            Start the dump
+
+            @return: True if the first reads have been sent, False otherwise
+            @rtype: bool
+        '''
+
+        self.__fill()
+        ret = (self.__in_flight > 0)
+        if not ret:
+            self.__done = True
+
+        return ret
+
+    def get_retry_count(self):
+        '''
+            Get the number of reads which have been sent again
+
+            @return: Number of reads sent again
+            @rtype: int
+        '''
+
+        return sum(self.__attempts.itervalues())
+
+    def __fill(self):
+        '''
+            Send reads until the maximum number of reads awaiting a response is reached
+        '''
+
+        while ((not self.__end) or self.__lost) and (not self.__failed) and (self.__in_flight < self.__depth):
+            retry = bool(self.__lost)
+            if retry:
+                group_id, value_id = self.__lost[0]
+            else:
+                group_id = self.__group_id
+                value_id = self.__value_id
+            callback = lambda result, group_id=group_id, value_id=value_id: self.__on_read(group_id, value_id, result)
+            if self.__read_config(group_id, value_id, callback):
+                self.__in_flight += 1
+                if retry:
+                    del self.__lost[0]
+                else:
+                    self.__value_id += 1
+            else:
+
+                # Window full because of other requests, retried on the next response
+                if self.__in_flight == 0:
+                    self.__failed = True
+                break
+
+        return
+
+    def __on_read(self, group_id, value_id, result):
+        '''
+            Called when a read response has been received
+
+            @param group_id: Group ID of the read value
+            @type group_id: int
+            @param value_id: Value ID of the read value
+            @type value_id: int
+            @param result: Read value, False if the value does not exist, None if no response received
+            @type result: SimuConfigValue or bool
+        '''
+
+        self.__in_flight -= 1
+        if result == None:
+
+            # The read is sent again
+            key = (group_id, value_id)
+            attempts = self.__attempts.get(key, 0) + 1
+            self.__attempts[key] = attempts
+            if attempts > self.__retries:
+                self.__failed = True
+            else:
+                self.__lost.append(key)
+
+        elif result is False:
+
+            # Responses are received in sending order so that the first failure
+            # of the current group is its end, the next failures are ignored
+            if group_id == self.__group_id:
+                if value_id == 0:
+                    self.__end = True
+                else:
+                    self.__group_id += 1
+                    self.__value_id = 0
+
+        else:
+            self.__values.append(result)
+
+        self.__fill()
+        if (self.__in_flight == 0) and (not self.__done):
+            self.__done = True
+            if self.__failed:
+                self.__callback(None)
+            else:
+                self.__callback(sorted(self.__values, key=lambda value: value.get_key()))
+
+        return
+
+
+class SimuConfigWriter(object):
+    '''
+        Write of several configuration values of the Open Vario simulated instance with pipelined requests
+    '''
+
+    def __init__(self, write_config, depth, values, callback):
+        '''
+            Constructor
+
+            @param write_config: Function sending a configuration write request
+            @type write_config: function(int, int, value, SimuSensorValueType, function(bool)) -> bool
+            @param depth: Maximum number of writes awaiting a response
+            @type depth: int
+            @param values: Values to write : [ (group ID, value ID, value, SimuSensorValueType) ]
+            @type values: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+            @param callback: Called at the end of the writes with True if all the values have been
+                             written, False if a write has failed or could not be sent, None if a
+                             response has not been received
+            @type callback: function(bool)
+        '''
+
+        self.__write_config = write_config
+        '''
+            Function sending a configuration write request
+        '''
+        self.__depth = max(1, depth)
+        '''
+            Maximum number of writes awaiting a response
+        '''
+        self.__values = values
+        '''
+            Values to write
+        '''
+        self.__callback = callback
+        '''
+            Called at the end of the writes
+        '''
+        self.__index = 0
+        '''
+            Index of the next value to write
+        '''
+        self.__in_flight = 0
+        '''
+            Number of writes awaiting a response
+        '''
+        self.__result = True
+        '''
+            Result of the writes
+        '''
+        self.__done = False
+        '''
+            Indicates if the end of the writes has been notified
+        '''
+
+        return
+
+    def start(self):
+        '''
+            Start the writes, the callback is called immediately if there is nothing to write
+
+            @return: True if the first writes have been sent or if there is nothing to write, False otherwise
+            @rtype: bool
+        '''
+
+        if len(self.__values) == 0:
+            self.__done = True
+            self.__callback(True)
+            ret = True
+        else:
+            self.__fill()
+            ret = (self.__in_flight > 0)
+            if not ret:
+                self.__done = True
+
+        return ret
+
+    def __fill(self):
+        '''
+            Send writes until the maximum number of writes awaiting a response is reached
+        '''
+
+        while (self.__result == True) and (self.__index < len(self.__values)) and (self.__in_flight < self.__depth):
+            group_id, value_id, value, value_type = self.__values[self.__index]
+            if self.__write_config(group_id, value_id, value, value_type, self.__on_write):
+                self.__in_flight += 1
+                self.__index += 1
+            else:
+
+                # Window full because of other requests, retried on the next response.
+                # Nothing left to wait for means the value cannot be encoded
+                if self.__in_flight == 0:
+                    self.__result = False
+                break
+
+        return
+
+    def __on_write(self, success):
+        '''
+            Called when a write response has been received
+
+            @param success: Indicates if the value has been written, None if no response received
+            @type success: bool
+        '''
+
+        self.__in_flight -= 1
+        if success == None:
+            self.__result = None
+        elif (not success) and (self.__result == True):
+            self.__result = False
+
+        self.__fill()
+        if (self.__in_flight == 0) and (not self.__done):
+            self.__done = True
+            self.__callback(self.__result)
+
+        return
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import json
+from com.simu_protocol import SimuSensorValueType
+from com.simu_config import SimuConfigValue
+
+
+####################################################
+#### Data types
+
+CONFIG_SNAPSHOT_FORMAT = "open-vario-config"
+'''
+    Format name of the snapshot files
+'''
+
+CONFIG_SNAPSHOT_VERSION = 1
+'''
+    Version of the snapshot file format
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuConfigSnapshot(object):
+    '''
+        Configuration values of an Open Vario simulated instance saved as a JSON file,
+        to be restored on the same instance or applied to other ones
+    '''
+
+    def __init__(self, values=None):
+        '''
+            Constructor
+
+            @param values: Configuration values, typically the result of a configuration dump
+            @type values: [ SimuConfigValue ]
+        '''
+
+        self.__values = []
+        '''
+            Configuration values
+        '''
+        if not (values == None):
+            self.__values = list(values)
+
+        return
+
+    def get_values(self):
+        '''
+            Get the configuration values of the snapshot
+
+            @return: Configuration values
+            @rtype: [ SimuConfigValue ]
+        '''
+
+        return self.__values
+
+    def save(self, path):
+        '''
+            Save the snapshot to a file
+
+            @param path: Path of the file
+            @type path: string
+
+            @return: True if the snapshot has been saved, False otherwise
+            @rtype: bool
+        '''
+
+        snapshot = { "format" : CONFIG_SNAPSHOT_FORMAT,
+                     "version" : CONFIG_SNAPSHOT_VERSION,
+                     "values" : [ self.__to_dict(value) for value in self.__values ] }
+        try:
+            with open(path, "wb") as snapshot_file:
+                json.dump(snapshot, snapshot_file, indent=4, sort_keys=True)
+            ret = True
+        except (IOError, OSError, TypeError, ValueError):
+            ret = False
+
+        return ret
+
+    def load(self, path):
+        '''
+            Load the snapshot from a file
+
+            @param path: Path of the file
+            @type path: string
+
+            @return: True if the snapshot has been loaded, False if the file cannot be read or is not valid
+            @rtype: bool
+        '''
+
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            if ((snapshot.get("format") == CONFIG_SNAPSHOT_FORMAT) and
+                (snapshot.get("version") == CONFIG_SNAPSHOT_VERSION)):
+                self.__values = [ self.__from_dict(value) for value in snapshot["values"] ]
+                ret = True
+            else:
+                ret = False
+        except (IOError, OSError, ValueError, KeyError, TypeError, AttributeError):
+            ret = False
+
+        return ret
+
+    def __to_dict(self, value):
+        '''
+            Convert a configuration value to its representation in the snapshot file
+
+            @param value: Configuration value
+            @type value: SimuConfigValue
+
+            @return: Representation of the value
+            @rtype: {string:value}
+        '''
+
+        ret = { "group_id" : value.group_id,
+                "value_id" : value.value_id,
+                "group" : value.group_name,
+                "name" : value.name,
+                "type" : value.value_type.name,
+                "value" : value.value }
+        if value.reset_only:
+            ret["reset_only"] = True
+
+        return ret
+
+    def __from_dict(self, value):
+        '''
+            Convert the representation of a configuration value in the snapshot file
+
+            @param value: Representation of the value
+            @type value: {string:value}
+
+            @return: Configuration value
+            @rtype: SimuConfigValue
+        '''
+
+        # Only the identification and the current value are saved, the description
+        # of the value is given by the instance when the snapshot is restored
+        value_type = SimuSensorValueType[value["type"]]
+        return SimuConfigValue(int(value["group_id"]), int(value["value_id"]), value["group"], value["name"],
+                               None, None, value_type, value["value"], reset_only=value.get("reset_only", False))
@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import struct
+from numbers import Integral, Real
+
+
+####################################################
+#### Data types
+
+# Tags of the protobuf fields (field number << 3 | wire type) :
+#  - SimuRequest : update_sensor = 4 and update_sensors = 8, length delimited
+#  - UpdateSensorsRequest : sensors = 1, length delimited
+#  - UpdateSensorRequest : id = 1 varint, uint_value = 2 varint, int_value = 3 zigzag varint,
+#    float_value = 4 fixed32, double_value = 5 fixed64, string_value = 6 length delimited,
+#    bool_value = 7 varint
+
+SIMU_REQUEST_UPDATE_SENSOR_TAG = chr(0x22)
+SIMU_REQUEST_UPDATE_SENSORS_TAG = chr(0x42)
+UPDATE_SENSORS_SENSOR_TAG = chr(0x0A)
+UPDATE_SENSOR_ID_TAG = chr(0x08)
+
+VALUE_TYPE_UINT = 1
+VALUE_TYPE_INT = 2
+VALUE_TYPE_FLOAT = 3
+VALUE_TYPE_DOUBLE = 4
+VALUE_TYPE_STRING = 5
+VALUE_TYPE_BOOL = 6
+'''
+    Values of the SimuSensorValueType enumeration, which are those of the SensorValueType
+    enumeration of the ListSensorsResponse message
+'''
+
+VARINTS = [ chr(value) for value in range(0x80) ]
+'''
+    Encoding of the single byte varints
+'''
+
+FLOAT = struct.Struct("<f")
+'''
+    Encoding of a fixed32 float
+'''
+
+DOUBLE = struct.Struct("<d")
+'''
+    Encoding of a fixed64 double
+'''
+
+FLOAT_MAX = 3.4028234663852886e+38
+'''
+    Greatest finite single precision floating point value
+'''
+
+
+####################################################
+#### Functions
+
+
+def encode_varint(value):
+    '''
+        Encode an unsigned value as a protobuf varint
+
+        @param value: Value to encode, between 0 and 2^64 - 1
+        @type value: int
+
+        @return: Encoded value
+        @rtype: string
+    '''
+
+    if value < 0x80:
+        ret = VARINTS[value]
+    elif value < 0x4000:
+        ret = chr((value & 0x7F) | 0x80) + VARINTS[value >> 7]
+    else:
+        ret = ""
+        while value >= 0x80:
+            ret += chr((value & 0x7F) | 0x80)
+            value >>= 7
+        ret += VARINTS[value]
+
+    return ret
+
+
+def encode_uint(value):
+    '''
+        Encode an uint32 value
+
+        @param value: Value, converted to int
+        @type value: int
+
+        @return: Encoded value, None if the value is not a number or is out of the uint32 range
+        @rtype: string
+    '''
+
+    ret = None
+    try:
+        value = int(value)
+        if (value >= 0) and (value <= 0xFFFFFFFF):
+            ret = encode_varint(value)
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return ret
+
+
+def encode_sint(value):
+    '''
+        Encode a sint32 value using the zigzag encoding
+
+        @param value: Value, converted to int
+        @type value: int
+
+        @return: Encoded value, None if the value is not a number or is out of the int32 range
+        @rtype: string
+    '''
+
+    ret = None
+    try:
+        value = int(value)
+        if (value >= 0) and (value <= 0x7FFFFFFF):
+            ret = encode_varint(value << 1)
+        elif (value < 0) and (value >= -0x80000000):
+            ret = encode_varint(((-value) << 1) - 1)
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return ret
+
+
+def encode_float(value):
+    '''
+        Encode a single precision floating point value
+
+        @param value: Value, converted to float
+        @type value: float
+
+        @return: Encoded value, None if the value is not a number
+        @rtype: string
+    '''
+
+    ret = None
+    try:
+        value = float(value)
+        try:
+            ret = FLOAT.pack(value)
+        except OverflowError:
+
+            # Out of the single precision range, rounded to infinity as the protobuf runtime does
+            ret = FLOAT.pack(value * float("inf"))
+    except (TypeError, ValueError):
+        pass
+
+    return ret
+
+
+def encode_double(value):
+    '''
+        Encode a double precision floating point value
+
+        @param value: Value, converted to float
+        @type value: float
+
+        @return: Encoded value, None if the value is not a number
+        @rtype: string
+    '''
+
+    ret = None
+    try:
+        ret = DOUBLE.pack(float(value))
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return ret
+
+
+def encode_string(value):
+    '''
+        Encode a string value with its length
+
+        @param value: Value, unicode strings are UTF-8 encoded, other values are converted to str
+        @type value: string
+
+        @return: Encoded value, None if the value is not valid UTF-8
+        @rtype: string
+    '''
+
+    ret = None
+    try:
+        if isinstance(value, unicode):
+            value = value.encode("utf-8")
+        else:
+            value = str(value)
+            value.decode("utf-8")
+        ret = encode_varint(len(value)) + value
+    except UnicodeError:
+        pass
+
+    return ret
+
+
+def encode_bool(value):
+    '''
+        Encode a boolean value
+
+        @param value: Value, converted to bool
+        @type value: bool
+
+        @return: Encoded value
+        @rtype: string
+    '''
+
+    if value:
+        ret = "\x01"
+    else:
+        ret = "\x00"
+
+    return ret
+
+
+def check_integer(value):
+    '''
+        Check that a value is an integer, booleans excluded
+
+        @param value: Value to check
+        @type value: object
+
+        @return: True if the value is an integer, False otherwise
+        @rtype: bool
+    '''
+
+    return ((type(value) in (int, long)) or
+            ((not isinstance(value, bool)) and isinstance(value, Integral)))
+
+
+def check_float(value):
+    '''
+        Check that a value is a number within the single precision range, infinities and NaN included
+
+        @param value: Value to check
+        @type value: object
+
+        @return: True if the value can be encoded without overflow, False otherwise
+        @rtype: bool
+    '''
+
+    ret = False
+    if check_double(value):
+        value = float(value)
+        ret = (abs(value) <= FLOAT_MAX) or (value in (float("inf"), float("-inf"))) or (value != value)
+
+    return ret
+
+
+def check_double(value):
+    '''
+        Check that a value is a number, booleans excluded
+
+        @param value: Value to check
+        @type value: object
+
+        @return: True if the value is a number, False otherwise
+        @rtype: bool
+    '''
+
+    return ((type(value) in (float, int, long)) or
+            ((not isinstance(value, bool)) and isinstance(value, Real)))
+
+
+def check_string(value):
+    '''
+        Check that a value is a string
+
+        @param value: Value to check
+        @type value: object
+
+        @return: True if the value is a string, False otherwise
+        @rtype: bool
+    '''
+
+    return isinstance(value, basestring)
+
+
+def check_bool(value):
+    '''
+        Check that a value is a boolean, 0 and 1 included
+
+        @param value: Value to check
+        @type value: object
+
+        @return: True if the value is a boolean, False otherwise
+        @rtype: bool
+    '''
+
+    return (value is True) or (value is False) or (check_integer(value) and (value in (0, 1)))
+
+
+VALUE_ENCODERS = { VALUE_TYPE_UINT : (chr(0x10), encode_uint, check_integer),
+                   VALUE_TYPE_INT : (chr(0x18), encode_sint, check_integer),
+                   VALUE_TYPE_FLOAT : (chr(0x25), encode_float, check_float),
+                   VALUE_TYPE_DOUBLE : (chr(0x29), encode_double, check_double),
+                   VALUE_TYPE_STRING : (chr(0x32), encode_string, check_string),
+                   VALUE_TYPE_BOOL : (chr(0x38), encode_bool, check_bool) }
+'''
+    Tag of the value field, value encoder and value type check by value of the SimuSensorValueType enumeration
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuSensorEncoder(object):
+    '''
+        Encoder of the fields of an UpdateSensorRequest for a given sensor, the id and
+        value tag being encoded once
+    '''
+
+    __slots__ = ("value_type", "prefix", "encode_value", "check_value")
+
+    def __init__(self, value_type, prefix, encode_value, check_value):
+        '''
+            Constructor
+
+            @param value_type: Value type of the sensor
+            @type value_type: SimuSensorValueType
+            @param prefix: Encoded id field followed by the tag of the value field
+            @type prefix: string
+            @param encode_value: Value encoder
+            @type encode_value: function(value) -> string
+            @param check_value: Value type check
+            @type check_value: function(value) -> bool
+        '''
+
+        self.value_type = value_type
+        self.prefix = prefix
+        self.encode_value = encode_value
+        self.check_value = check_value
+
+        return
+
+    def encode(self, value):
+        '''
+            Encode the fields of an UpdateSensorRequest
+
+            @param value: Value of the sensor
+            @type value: int or float or bool or string
+
+            @return: Encoded fields, None if the value cannot be encoded
+            @rtype: string
+        '''
+
+        ret = None
+        encoded_value = self.encode_value(value)
+        if not (encoded_value == None):
+            ret = self.prefix + encoded_value
+
+        return ret
+
+    def encode_checked(self, value):
+        '''
+            Encode the fields of an UpdateSensorRequest after checking that the Python type
+            of the value matches the value type of the sensor, so that no implicit conversion
+            (string to number, float truncation) takes place
+
+            @param value: Value of the sensor
+            @type value: int or float or bool or string
+
+            @return: Encoded fields, None if the value has not the expected type or is out of range
+            @rtype: string
+        '''
+
+        ret = None
+        if self.check_value(value):
+            encoded_value = self.encode_value(value)
+            if not (encoded_value == None):
+                ret = self.prefix + encoded_value
+
+        return ret
+
+
+class SimuUpdateSensorEncoder(object):
+    '''
+        Encoder of the sensor update requests writing the protobuf wire format directly,
+        without building SimuRequest objects. The output is byte for byte identical to the
+        serialization of the equivalent SimuRequest
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__sensor_encoders = {}
+        '''
+            Encoders of the updated sensors : { id : SimuSensorEncoder }
+        '''
+
+        return
+
+    def get_sensor_encoder(self, id, value_type):
+        '''
+            Get the encoder of the fields of an UpdateSensorRequest for a sensor
+
+            @param id: Id of the sensor
+            @type id: int
+            @param value_type: Value type of the sensor
+            @type value_type: SimuSensorValueType
+
+            @return: Encoder, None if the id is out of range or the value type is not supported
+            @rtype: SimuSensorEncoder
+        '''
+
+        encoder = self.__sensor_encoders.get(id)
+        if (encoder == None) or (not (encoder.value_type is value_type)):
+            encoder = None
+            value_encoder = VALUE_ENCODERS.get(getattr(value_type, "value", None))
+            if (not (value_encoder == None)) and (id >= 0) and (id <= 0xFFFFFFFF):
+
+                # A zero id is the proto3 default value, which is not serialized
+                if id == 0:
+                    prefix = value_encoder[0]
+                else:
+                    prefix = UPDATE_SENSOR_ID_TAG + encode_varint(id) + value_encoder[0]
+                encoder = SimuSensorEncoder(value_type, prefix, value_encoder[1], value_encoder[2])
+                self.__sensor_encoders[id] = encoder
+
+        return encoder
+
+    def encode_update_sensor(self, id, value, value_type):
+        '''
+            Encode a SimuRequest holding an UpdateSensorRequest
+
+            @param id: Id of the sensor
+            @type id: int
+            @param value: Value of the sensor
+            @type value: int or float or bool or string
+            @param value_type: Value type of the sensor
+            @type value_type: SimuSensorValueType
+
+            @return: Encoded request, None if the value type is not supported or the value is out of range
+            @rtype: string
+        '''
+
+        ret = None
+        encoder = self.__sensor_encoders.get(id)
+        if (encoder == None) or (not (encoder.value_type is value_type)):
+            encoder = self.get_sensor_encoder(id, value_type)
+        if not (encoder == None):
+            inner = encoder.encode(value)
+            if not (inner == None):
+                ret = self.encode_update_sensor_fields(inner)
+
+        return ret
+
+    def encode_update_sensor_fields(self, inner):
+        '''
+            Encode a SimuRequest holding an UpdateSensorRequest from its encoded fields
+
+            @param inner: Fields of the UpdateSensorRequest encoded by a SimuSensorEncoder
+            @type inner: string
+
+            @return: Encoded request
+            @rtype: string
+        '''
+
+        size = len(inner)
+        if size < 0x80:
+            ret = SIMU_REQUEST_UPDATE_SENSOR_TAG + VARINTS[size] + inner
+        else:
+            ret = SIMU_REQUEST_UPDATE_SENSOR_TAG + encode_varint(size) + inner
+
+        return ret
+
+    def encode_update_sensors(self, sensors):
+        '''
+            Encode a SimuRequest holding an UpdateSensorsRequest
+
+            @param sensors: Sensors to update
+            @type sensors: [ (int, int or float or bool or string, SimuSensorValueType) ]
+
+            @return: Encoded request, None if a value type is not supported or a value is out of range
+            @rtype: string
+        '''
+
+        ret = None
+        inners = []
+        for id, value, value_type in sensors:
+            encoder = self.__sensor_encoders.get(id)
+            if (encoder == None) or (not (encoder.value_type is value_type)):
+                encoder = self.get_sensor_encoder(id, value_type)
+            inner = None
+            if not (encoder == None):
+                inner = encoder.encode(value)
+            if inner == None:
+                inners = None
+                break
+            inners.append(inner)
+        if not (inners == None):
+            ret = self.encode_update_sensors_fields(inners)
+
+        return ret
+
+    def encode_update_sensors_fields(self, inners):
+        '''
+            Encode a SimuRequest holding an UpdateSensorsRequest from the encoded fields of its sensors
+
+            @param inners: Fields of each UpdateSensorRequest encoded by a SimuSensorEncoder
+            @type inners: [ string ]
+
+            @return: Encoded request
+            @rtype: string
+        '''
+
+        inner = "".join([ UPDATE_SENSORS_SENSOR_TAG + encode_varint(len(sensor)) + sensor for sensor in inners ])
+        return SIMU_REQUEST_UPDATE_SENSORS_TAG + encode_varint(len(inner)) + inner
@@ -0,0 +1,728 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import heapq
+import random
+import select
+from threading import Thread
+from udp_socket import UdpSocket
+from api.requests_pb2 import SimuRequest
+from api.responses_pb2 import SimuResponse
+from api.notifications_pb2 import SimuNotification
+from com.simu_protocol import SimuProtocol, SimuSensorType, SimuSensorValueType
+from com.simu_time import monotonic
+
+
+####################################################
+#### Data types
+
+SIMU_FAKE_VALUE_FIELDS = { SimuSensorValueType.UINT : "uint_value",
+                           SimuSensorValueType.INT : "int_value",
+                           SimuSensorValueType.FLOAT : "float_value",
+                           SimuSensorValueType.DOUBLE : "double_value",
+                           SimuSensorValueType.STRING : "string_value",
+                           SimuSensorValueType.BOOL : "bool_value" }
+'''
+    Name of the value fields in the request and response messages by value type
+'''
+
+SIMU_FAKE_VALUE_TYPES = { SimuSensorValueType.UINT : ("uint32_t", 4),
+                          SimuSensorValueType.INT : ("int32_t", 4),
+                          SimuSensorValueType.FLOAT : ("float", 4),
+                          SimuSensorValueType.DOUBLE : ("double", 8),
+                          SimuSensorValueType.STRING : ("string", None),
+                          SimuSensorValueType.BOOL : ("bool", 1) }
+'''
+    Name and size of the configuration value types by value type, the size of a string is its length
+'''
+
+SIMU_FAKE_SENSORS = [ (1, "altimeter", SimuSensorType.ALTITUDE, SimuSensorValueType.INT),
+                      (2, "temperature", SimuSensorType.TEMPERATURE, SimuSensorValueType.INT),
+                      (3, "pressure", SimuSensorType.PRESSURE, SimuSensorValueType.UINT),
+                      (4, "gnss", SimuSensorType.GNSS, SimuSensorValueType.STRING) ]
+'''
+    Default sensors of the fake instance : [ (id, name, SimuSensorType, SimuSensorValueType) ]
+'''
+
+SIMU_FAKE_CONFIG = [ ("Altimeter", [ ("Altitude 1", SimuSensorValueType.INT, 0, -1000, 10000, False),
+                                     ("Altitude 2", SimuSensorValueType.INT, 0, -1000, 10000, False),
+                                     ("Unit", SimuSensorValueType.STRING, "m", None, None, False) ]),
+                     ("Vario", [ ("Integration time", SimuSensorValueType.UINT, 5, 1, 30, False),
+                                 ("Sink alarm", SimuSensorValueType.FLOAT, -3.5, -10., 0., False),
+                                 ("Sound", SimuSensorValueType.BOOL, True, None, None, False) ]),
+                     ("System", [ ("Name", SimuSensorValueType.STRING, "Open Vario", None, None, True),
+                                  ("Sea level pressure", SimuSensorValueType.DOUBLE, 101325., 90000., 110000., False) ]) ]
+'''
+    Default configuration of the fake instance :
+    [ (group name, [ (value name, SimuSensorValueType, value, min value or None, max value or None, reset only) ]) ]
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuFakeInstance(object):
+    '''
+        Emulated Open Vario simulated instance speaking the simulator protocol, used as a
+        local target for tests and benchmarks. Latency, loss and reordering can be injected
+        on the datagrams it sends
+    '''
+
+    MAX_HOLD_DELAY = 0.05
+    '''
+        Maximum time a reordered datagram is held waiting for the following one (seconds)
+    '''
+
+    def __init__(self, port=45678, sensors=None, config=None, notification_period=0.1,
+                 latency=0., jitter=0., loss=0., reordering=0., seed=None):
+        '''
+            Constructor
+
+            @param port: Port of the instance
+            @type port: int
+            @param sensors: Sensors of the instance, None for the default sensors
+            @type sensors: [ (int, string, SimuSensorType, SimuSensorValueType) ]
+            @param config: Configuration of the instance, None for the default configuration
+            @type config: [ (string, [ (string, SimuSensorValueType, value, value, value, bool) ]) ]
+            @param notification_period: Period of the notifications (seconds), 0 to disable the notifications
+            @type notification_period: float
+            @param latency: Delay applied to the sent datagrams (seconds)
+            @type latency: float
+            @param jitter: Maximum random delay added to the latency (seconds)
+            @type jitter: float
+            @param loss: Probability for a sent datagram to be dropped
+            @type loss: float
+            @param reordering: Probability for a sent datagram to be delayed after the following one
+            @type reordering: float
+            @param seed: Seed of the impairment random generator, None for a random seed
+            @type seed: int
+        '''
+
+        if sensors == None:
+            sensors = SIMU_FAKE_SENSORS
+        if config == None:
+            config = SIMU_FAKE_CONFIG
+
+        self.__port = port
+        '''
+            Port of the instance
+        '''
+        self.__sensors = list(sensors)
+        '''
+            Sensors of the instance
+        '''
+        self.__sensor_values = {}
+        '''
+            Current sensor values : { id : (SimuSensorValueType, value) }
+        '''
+        for id, _, _, value_type in self.__sensors:
+            self.__sensor_values[id] = (value_type, None)
+        self.__config = [ (group_name, [ list(value) for value in values ]) for group_name, values in config ]
+        '''
+            Configuration of the instance, the values are modified by the write requests
+        '''
+        self.__notification_period = notification_period
+        '''
+            Period of the notifications (seconds)
+        '''
+        self.__latency = latency
+        '''
+            Delay applied to the sent datagrams (seconds)
+        '''
+        self.__jitter = jitter
+        '''
+            Maximum random delay added to the latency (seconds)
+        '''
+        self.__loss = loss
+        '''
+            Probability for a sent datagram to be dropped
+        '''
+        self.__reordering = reordering
+        '''
+            Probability for a sent datagram to be delayed after the following one
+        '''
+        self.__random = random.Random(seed)
+        '''
+            Random generator of the impairments
+        '''
+        self.__socket = UdpSocket()
+        '''
+            UDP socket of the instance
+        '''
+        self.__peer = None
+        '''
+            Address of the connected simulator, None if not connected
+        '''
+        self.__notification_endpoint = None
+        '''
+            Address to send the notifications to
+        '''
+        self.__tx_queue = []
+        '''
+            Datagrams waiting for their sending time : heap of (time, sequence, data, address)
+        '''
+        self.__tx_sequence = 0
+        '''
+            Sequence number of the last queued datagram, keeps the sending order of datagrams queued at the same time
+        '''
+        self.__held = None
+        '''
+            Datagram held to be sent after the following one : (data, address, monotonic release time)
+        '''
+        self.__next_notification = 0
+        '''
+            Monotonic time of the next notifications
+        '''
+        self.__notified_values = {}
+        '''
+            Last notified values for the min/max computation : { notification type : (value, min, max) }
+        '''
+        self.__last_altitude = None
+        '''
+            Last notified altitude and its monotonic time for the vario computation
+        '''
+        self.__running = False
+        '''
+            Indicates if the instance is running
+        '''
+        self.__thread = None
+        '''
+            Thread running the instance
+        '''
+        self.requests = 0
+        '''
+            Number of received requests
+        '''
+        self.responses = 0
+        '''
+            Number of sent responses
+        '''
+        self.notifications = 0
+        '''
+            Number of sent notifications
+        '''
+        self.dropped = 0
+        '''
+            Number of datagrams dropped by the loss injection
+        '''
+
+        return
+
+    def open(self):
+        '''
+            Open the socket of the instance
+
+            @return: True if the socket is opened and bound, False otherwise
+            @rtype: bool
+        '''
+
+        ret = self.__socket.open()
+        if ret:
+            ret = self.__socket.bind("", self.__port)
+            if ret:
+                self.__socket.set_timeout(0)
+            else:
+                self.__socket.close()
+
+        return ret
+
+    def close(self):
+        '''
+            Close the socket of the instance
+        '''
+
+        self.__socket.close()
+        self.__peer = None
+        self.__tx_queue = []
+        self.__held = None
+
+        return
+
+    def start(self):
+        '''
+            Open the socket and run the instance in a dedicated thread
+
+            @return: True if the instance is running, False otherwise
+            @rtype: bool
+        '''
+
+        ret = self.open()
+        if ret:
+            self.__running = True
+            self.__thread = Thread(target=self.__run_thread)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+        return ret
+
+    def stop(self):
+        '''
+            Stop the instance and wait for its thread to end
+        '''
+
+        self.__running = False
+        if not (self.__thread == None):
+            self.__thread.join()
+            self.__thread = None
+        self.close()
+
+        return
+
+    def run(self, duration=None):
+        '''
+            Run the instance in the calling thread until it is stopped
+
+            @param duration: Maximum running time (seconds), None to run until stop is called
+            @type duration: float
+        '''
+
+        self.__running = True
+        deadline = None
+        if not (duration == None):
+            deadline = monotonic() + duration
+        while self.__running and ((deadline == None) or (monotonic() < deadline)):
+            self.run_once(0.1)
+
+        return
+
+    def is_connected(self):
+        '''
+            Indicate if a simulator is connected
+
+            @return: True if a simulator is connected, False otherwise
+            @rtype: bool
+        '''
+
+        return not (self.__peer == None)
+
+    def get_sensor_value(self, id):
+        '''
+            Get the last value written to a sensor
+
+            @param id: Id of the sensor
+            @type id: int
+
+            @return: Value of the sensor, None if the sensor does not exist or has never been written
+            @rtype: int or float or bool or string
+        '''
+
+        return self.__sensor_values.get(id, (None, None))[1]
+
+    def get_config(self):
+        '''
+            Get the current configuration of the instance
+
+            @return: Configuration of the instance
+            @rtype: [ (string, [ [string, SimuSensorValueType, value, value, value, bool] ]) ]
+        '''
+
+        return self.__config
+
+    def run_once(self, timeout):
+        '''
+            Wait for a request or a sending time and process them
+
+            @param timeout: Maximum time to wait (seconds)
+            @type timeout: float
+        '''
+
+        # Wait until the next datagram or notification sending time
+        now = monotonic()
+        if self.__tx_queue:
+            timeout = min(timeout, self.__tx_queue[0][0] - now)
+        if self.__notifications_enabled():
+            timeout = min(timeout, self.__next_notification - now)
+        if not (self.__held == None):
+            timeout = min(timeout, self.__held[2] - now)
+        fd = self.__socket.fileno()
+        if not (fd == None):
+            select.select([fd], [], [], max(0, timeout))
+
+            # Handle received requests
+            ret = self.__socket.recv_from()
+            while not (ret == None):
+                self.__handle_request(ret[0], ret[1])
+                ret = self.__socket.recv_from()
+
+            # Periodic notifications
+            now = monotonic()
+            if self.__notifications_enabled() and (now >= self.__next_notification):
+                self.__notify(now)
+                self.__next_notification += self.__notification_period
+                if self.__next_notification < now:
+                    self.__next_notification = now + self.__notification_period
+
+            # Release the reordered datagram if no other datagram has been queued meanwhile
+            if (not (self.__held == None)) and (now >= self.__held[2]):
+                held = self.__held
+                self.__held = None
+                self.__push([ held[:2] ])
+
+            # Send the datagrams which have reached their sending time
+            self.__flush(now)
+
+        return
+
+    def __run_thread(self):
+        '''
+            Thread running the instance
+        '''
+
+        while self.__running:
+            self.run_once(0.1)
+
+        return
+
+    def __notifications_enabled(self):
+        '''
+            Indicate if notifications have to be sent
+
+            @return: True if notifications have to be sent, False otherwise
+            @rtype: bool
+        '''
+
+        return (not (self.__peer == None)) and (self.__notification_period > 0)
+
+    def __handle_request(self, data, address):
+        '''
+            Decode and handle a received request
+
+            @param data: Received datagram
+            @type data: string
+            @param address: Address of the sender
+            @type address: (string, int)
+        '''
+
+        req = SimuRequest()
+        try:
+            req.ParseFromString(data)
+            kind = req.WhichOneof("Requests")
+        except:
+            kind = None
+        if not (kind == None):
+            self.requests += 1
+
+        rsp = SimuResponse()
+        if kind == "connect":
+            self.__peer = address
+            self.__notification_endpoint = address
+            endpoint = req.connect.notification_endpoint
+            if endpoint.port != 0:
+                self.__notification_endpoint = (endpoint.ip_address or address[0], endpoint.port)
+            self.__next_notification = monotonic() + self.__notification_period
+            self.__notified_values = {}
+            self.__last_altitude = None
+            rsp.connect.accept = True
+
+        elif (kind == None) or (not (address == self.__peer)):
+
+            # Requests are only handled for the connected simulator
+            rsp = None
+
+        elif kind == "disconnect":
+            self.__peer = None
+            rsp.disconnect.SetInParent()
+
+        elif kind == "list_sensors":
+            for id, name, sensor_type, value_type in self.__sensors:
+                sensor = rsp.list_sensors.sensors.add()
+                sensor.id = id
+                sensor.name = name
+                sensor.type = sensor_type.value
+                sensor.value_type = value_type.value
+
+        elif kind == "update_sensor":
+            rsp.update_sensor.success = self.__update_sensor(req.update_sensor)
+
+        elif kind == "update_sensors":
+            success = True
+            for update_sensor in req.update_sensors.sensors:
+                success = self.__update_sensor(update_sensor) and success
+            rsp.update_sensors.success = success
+
+        elif kind == "ping":
+            rsp.ping.number = req.ping.number
+
+        elif kind == "config_read":
+            self.__read_config(req.config_read, rsp.config_read)
+
+        elif kind == "config_write":
+            rsp.config_write.success = self.__write_config(req.config_write)
+
+        else:
+            rsp = None
+
+        if not (rsp == None):
+            self.responses += 1
+            self.__queue(SimuProtocol.RESPONSE_FRAME + rsp.SerializeToString(), address)
+
+        return
+
+    def __update_sensor(self, update_sensor):
+        '''
+            Update a sensor value
+
+            @param update_sensor: Update request
+            @type update_sensor: UpdateSensorRequest
+
+            @return: True if the sensor exists and the value has the sensor's value type, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        sensor = self.__sensor_values.get(update_sensor.id)
+        if not (sensor == None):
+            field = update_sensor.WhichOneof("Values")
+            ret = (field == SIMU_FAKE_VALUE_FIELDS.get(sensor[0]))
+            if ret:
+                self.__sensor_values[update_sensor.id] = (sensor[0], getattr(update_sensor, field))
+
+        return ret
+
+    def __get_config_value(self, group_id, value_id):
+        '''
+            Get a configuration value
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+
+            @return: Group name and configuration value, None if the value does not exist
+            @rtype: (string, [string, SimuSensorValueType, value, value, value, bool])
+        '''
+
+        ret = None
+        if group_id < len(self.__config):
+            group_name, values = self.__config[group_id]
+            if value_id < len(values):
+                ret = (group_name, values[value_id])
+
+        return ret
+
+    def __read_config(self, config_read, response):
+        '''
+            Read a configuration value
+
+            @param config_read: Read request
+            @type config_read: ConfigValueReadRequest
+            @param response: Response to fill
+            @type response: ConfigValueReadResponse
+        '''
+
+        config_value = self.__get_config_value(config_read.group_id, config_read.value_id)
+        if config_value == None:
+            response.success = False
+        else:
+            group_name, (name, value_type, value, min_value, max_value, reset_only) = config_value
+            field = SIMU_FAKE_VALUE_FIELDS[value_type]
+            response.success = True
+            response.value_group_name = group_name
+            response.value_name = name
+            type_name, size = SIMU_FAKE_VALUE_TYPES[value_type]
+            if value_type == SimuSensorValueType.STRING:
+                size = len(value)
+            response.value_type = type_name
+            response.value_size = size
+            response.is_reset_only = reset_only
+            setattr(response, field, value)
+            response.has_min_max = not (min_value == None)
+            if response.has_min_max:
+                setattr(response, field.replace("_value", "_min_value"), min_value)
+                setattr(response, field.replace("_value", "_max_value"), max_value)
+
+        return
+
+    def __write_config(self, config_write):
+        '''
+            Write a configuration value
+
+            @param config_write: Write request
+            @type config_write: ConfigValueWriteRequest
+
+            @return: True if the value exists, has the right type and is within its bounds, False otherwise
+            @rtype: bool
+        '''
+
+        ret = False
+        config_value = self.__get_config_value(config_write.group_id, config_write.value_id)
+        if not (config_value == None):
+            config_value = config_value[1]
+            field = config_write.WhichOneof("Values")
+            if field == SIMU_FAKE_VALUE_FIELDS[config_value[1]]:
+                value = getattr(config_write, field)
+                ret = (config_value[3] == None) or (config_value[3] <= value <= config_value[4])
+                if ret:
+                    config_value[2] = value
+
+        return ret
+
+    def __notify(self, now):
+        '''
+            Send the notifications computed from the current sensor values
+
+            @param now: Current monotonic time
+            @type now: float
+        '''
+
+        notifications = []
+        pressure = None
+        altitude = None
+        for id, _, sensor_type, _ in self.__sensors:
+            value = self.__sensor_values[id][1]
+            if value == None:
+                continue
+            if sensor_type == SimuSensorType.PRESSURE:
+                pressure = int(value)
+            elif sensor_type == SimuSensorType.ALTITUDE:
+                altitude = int(value)
+            elif sensor_type == SimuSensorType.TEMPERATURE:
+                notif = SimuNotification()
+                notif.temperature.temperature, notif.temperature.min_temperature, notif.temperature.max_temperature = self.__min_max("temperature", int(value))
+                notifications.append(notif)
+
+        if not (pressure == None):
+            notif = SimuNotification()
+            notif.pressure.pressure, notif.pressure.min_pressure, notif.pressure.max_pressure = self.__min_max("pressure", pressure)
+            notifications.append(notif)
+
+            # Barometric altitude from the standard atmosphere when no altitude sensor is written
+            if altitude == None:
+                altitude = int(44330. * (1. - (pressure / 101325.) ** 0.1903))
+
+        if not (altitude == None):
+            notif = SimuNotification()
+            main_altitude, min_altitude, max_altitude = self.__min_max("altitude", altitude)
+            notif.altitude.main_altitude = main_altitude
+            notif.altitude.min_altitude = min_altitude
+            notif.altitude.max_altitude = max_altitude
+            notif.altitude.altitude_1 = main_altitude
+            notifications.append(notif)
+
+            # Vario from the altitude variation
+            if not (self.__last_altitude == None):
+                last_altitude, last_time = self.__last_altitude
+                if now > last_time:
+                    notif = SimuNotification()
+                    vario = int(round(10. * (altitude - last_altitude) / (now - last_time)))
+                    notif.vario.vario, notif.vario.min_vario, notif.vario.max_vario = self.__min_max("vario", vario)
+                    notifications.append(notif)
+            self.__last_altitude = (altitude, now)
+
+        for notif in notifications:
+            self.notifications += 1
+            self.__queue(SimuProtocol.NOTIFICATION_FRAME + notif.SerializeToString(), self.__notification_endpoint)
+
+        return
+
+    def __min_max(self, notif_type, value):
+        '''
+            Update the min and max values of a notification type
+
+            @param notif_type: Notification type
+            @type notif_type: string
+            @param value: New value
+            @type value: int
+
+            @return: Value, min value and max value
+            @rtype: (int, int, int)
+        '''
+
+        previous = self.__notified_values.get(notif_type)
+        if previous == None:
+            ret = (value, value, value)
+        else:
+            ret = (value, min(value, previous[1]), max(value, previous[2]))
+        self.__notified_values[notif_type] = ret
+
+        return ret
+
+    def __queue(self, data, address):
+        '''
+            Queue a datagram to send, applying the loss, latency and reordering impairments
+
+            @param data: Datagram to send
+            @type data: string
+            @param address: Destination address
+            @type address: (string, int)
+        '''
+
+        rnd = self.__random
+        if (self.__loss > 0) and (rnd.random() < self.__loss):
+            self.dropped += 1
+        else:
+
+            # A reordered datagram is held until the next one is queued, or released
+            # by the instance loop after the maximum hold delay
+            datagrams = [ (data, address) ]
+            if not (self.__held == None):
+                datagrams.append(self.__held[:2])
+                self.__held = None
+            elif (self.__reordering > 0) and (rnd.random() < self.__reordering):
+                self.__held = (data, address, monotonic() + self.MAX_HOLD_DELAY)
+                datagrams = []
+
+            self.__push(datagrams)
+
+        return
+
+    def __push(self, datagrams):
+        '''
+            Push datagrams to the sending queue, applying the latency
+
+            @param datagrams: Datagrams to send : [ (data, address) ]
+            @type datagrams: list
+        '''
+
+        rnd = self.__random
+        send_time = monotonic() + self.__latency
+        for datagram in datagrams:
+            delay = 0
+            if self.__jitter > 0:
+                delay = rnd.uniform(0, self.__jitter)
+            self.__tx_sequence += 1
+            heapq.heappush(self.__tx_queue, (send_time + delay, self.__tx_sequence, datagram[0], datagram[1]))
+
+        if (self.__latency <= 0) and (self.__jitter <= 0):
+            self.__flush(send_time)
+
+        return
+
+    def __flush(self, now):
+        '''
+            Send the queued datagrams which have reached their sending time
+
+            @param now: Current monotonic time
+            @type now: float
+        '''
+
+        tx_queue = self.__tx_queue
+        while tx_queue and (tx_queue[0][0] <= now):
+            _, _, data, address = heapq.heappop(tx_queue)
+            self.__socket.send_to(address[0], address[1], data)
+
+        return
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+from enum import Enum
+from com.simu_reactor import SimuReactor
+from com.simu_time import monotonic
+
+
+####################################################
+#### Data types
+
+class SimuFleetInstanceState(Enum):
+    '''
+        Simulated instance states
+    '''
+    DISCONNECTED = 0
+    CONNECTING = 1
+    LISTING_SENSORS = 2
+    RUNNING = 3
+
+
+####################################################
+#### Classes
+
+
+class SimuFleetScenario(object):
+    '''
+        Scenario driving the sensors of a simulated instance
+    '''
+
+    def start(self, sensors):
+        '''
+            Called when the instance is connected and its sensors list is known
+
+            @param sensors: List of sensors
+            @type sensors: [ SimuSensor ]
+        '''
+        return
+
+    def get_updates(self, now):
+        '''
+            Called on each fleet period to get the sensor values to send
+
+            @param now: Current monotonic time
+            @type now: float
+
+            @return: Sensors to update, None or an empty list if nothing has to be sent
+            @rtype: [ (int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+        return None
+
+    def on_notification(self, values):
+        '''
+            Called when values have been received from the instance
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+        return
+
+
+class SimuFleetInstance(object):
+    '''
+        Simulated instance of the fleet
+    '''
+
+    def __init__(self, protocol, scenario):
+        '''
+            Constructor
+
+            @param protocol: Protocol used to communicate with the instance
+            @type protocol: AsyncSimuProtocol
+            @param scenario: Scenario driving the instance
+            @type scenario: SimuFleetScenario
+        '''
+
+        self.protocol = protocol
+        '''
+            Protocol used to communicate with the instance
+        '''
+        self.scenario = scenario
+        '''
+            Scenario driving the instance
+        '''
+        self.state = SimuFleetInstanceState.DISCONNECTED
+        '''
+            Instance state
+        '''
+        self.sensors = None
+        '''
+            List of sensors of the instance
+        '''
+        self.connections = 0
+        '''
+            Number of successful connections
+        '''
+        self.updates_succeed = 0
+        '''
+            Number of acknowledged sensor updates
+        '''
+        self.updates_failed = 0
+        '''
+            Number of rejected sensor updates
+        '''
+        self.updates_lost = 0
+        '''
+            Number of sensor updates without response
+        '''
+        self.updates_dropped = 0
+        '''
+            Number of sensor updates not sent because the request window was full
+        '''
+
+        return
+
+
+class SimuFleet(object):
+    '''
+        Drives several Open Vario simulated instances from a single thread
+    '''
+
+    def __init__(self, period=0.25, window_size=16, request_timeout=1.5, host_port=None, batch=False):
+        '''
+            Constructor
+
+            @param period: Period of the sensor updates (seconds)
+            @type period: float
+            @param window_size: Maximum number of requests awaiting a response per instance
+            @type window_size: int
+            @param request_timeout: Maximum time to wait for a response (seconds)
+            @type request_timeout: float
+            @param host_port: Port of a socket shared by all the instances, None to use a dedicated
+                              socket per instance
+            @type host_port: int
+            @param batch: Indicates if the values of a period are sent in a single update_sensors request,
+                          which needs a firmware handling it, otherwise an update_sensor request is sent per value
+            @type batch: bool
+        '''
+
+        self.__period = period
+        '''
+            Period of the sensor updates (seconds)
+        '''
+        self.__window_size = window_size
+        '''
+            Maximum number of requests awaiting a response per instance
+        '''
+        self.__request_timeout = request_timeout
+        '''
+            Maximum time to wait for a response (seconds)
+        '''
+        self.__batch = batch
+        '''
+            Indicates if the values of a period are sent in a single update_sensors request
+        '''
+        self.__reactor = SimuReactor(host_port)
+        '''
+            Loop driving the protocol instances
+        '''
+        self.__instances = []
+        '''
+            Simulated instances
+        '''
+        self.__running = False
+        '''
+            Indicates if the fleet is running
+        '''
+
+        return
+
+    def add_instance(self, target_ip, target_port, host_port, scenario):
+        '''
+            Add a simulated instance to the fleet
+
+            @param target_ip: IP address of the Open Vario simulated instance
+            @type target_ip: string
+            @param target_port: Port of the Open Vario simulated instance
+            @type target_port: int
+            @param host_port: Port of the simulator for this instance, ignored when the instances share a socket
+            @type host_port: int
+            @param scenario: Scenario driving the instance
+            @type scenario: SimuFleetScenario
+
+            @return: Added instance, None if the instance address is already used
+            @rtype: SimuFleetInstance
+        '''
+
+        instance = None
+        protocol = self.__reactor.create_protocol(target_ip, target_port, host_port, self.__window_size, self.__request_timeout)
+        if not (protocol == None):
+            instance = SimuFleetInstance(protocol, scenario)
+            self.__instances.append(instance)
+
+        return instance
+
+    def add_instances(self, target_ip, first_target_port, first_host_port, count, scenario_factory):
+        '''
+            Add simulated instances listening on consecutive ports to the fleet
+
+            @param target_ip: IP address of the Open Vario simulated instances
+            @type target_ip: string
+            @param first_target_port: Port of the first Open Vario simulated instance
+            @type first_target_port: int
+            @param first_host_port: Port of the simulator for the first instance, ignored when the instances share a socket
+            @type first_host_port: int
+            @param count: Number of instances
+            @type count: int
+            @param scenario_factory: Creates the scenario of an instance from its index
+            @type scenario_factory: function(int) -> SimuFleetScenario
+        '''
+
+        for index in range(count):
+            self.add_instance(target_ip, first_target_port + index, first_host_port + index, scenario_factory(index))
+
+        return
+
+    def get_instances(self):
+        '''
+            Get the simulated instances
+
+            @return: Simulated instances
+            @rtype: [ SimuFleetInstance ]
+        '''
+
+        return self.__instances
+
+    def run(self, duration=None):
+        '''
+            Drive the simulated instances until the fleet is stopped
+
+            @param duration: Maximum running time (seconds), None to run until stop is called
+            @type duration: float
+
+            @return: True if the fleet has run, False if the shared socket could not be opened
+            @rtype: bool
+        '''
+
+        ret = self.__reactor.open()
+        if ret:
+
+            self.__running = True
+            start = monotonic()
+            next_period = start
+            while self.__running:
+
+                # Check running time
+                now = monotonic()
+                if (not (duration == None)) and (now - start >= duration):
+                    break
+
+                # Periodic processing
+                if now >= next_period:
+                    for instance in self.__instances:
+                        self.__on_period(instance, now)
+                    next_period += self.__period
+                    if next_period < now:
+                        next_period = now + self.__period
+
+                # Process received data and timeouts until the next period
+                self.__reactor.run_once(next_period - now)
+                for instance in self.__instances:
+                    for values in instance.protocol.notifications():
+                        instance.scenario.on_notification(values)
+
+            # Close connections
+            self.__reactor.close()
+            for instance in self.__instances:
+                instance.state = SimuFleetInstanceState.DISCONNECTED
+            self.__running = False
+
+        return ret
+
+    def stop(self):
+        '''
+            Stop the fleet
+        '''
+
+        self.__running = False
+        return
+
+    def __on_period(self, instance, now):
+        '''
+            Periodic processing of a simulated instance
+
+            @param instance: Simulated instance
+            @type instance: SimuFleetInstance
+            @param now: Current monotonic time
+            @type now: float
+        '''
+
+        if instance.state == SimuFleetInstanceState.DISCONNECTED:
+
+            # Start the connection process
+            instance.state = SimuFleetInstanceState.CONNECTING
+            future = instance.protocol.connect()
+            future.add_done_callback(lambda future: self.__on_connect(instance, future.result()))
+
+        elif instance.state == SimuFleetInstanceState.RUNNING:
+
+            if instance.protocol.is_connected():
+
+                # Send the sensor values of the scenario
+                updates = instance.scenario.get_updates(now)
+                if updates:
+                    if self.__batch:
+                        future = instance.protocol.update_sensors(updates)
+                    else:
+                        # The values are checked against the value types of the sensor list
+                        future = instance.protocol.update_sensor_values([ (id, value) for id, value, _ in updates ])
+                    if future == None:
+                        instance.updates_dropped += 1
+                    else:
+                        future.add_done_callback(lambda future: self.__on_update_sensors(instance, future.result()))
+
+            else:
+
+                # Connection lost
+                instance.state = SimuFleetInstanceState.DISCONNECTED
+
+        return
+
+    def __on_connect(self, instance, success):
+        '''
+            Called at the end of the connection process of a simulated instance
+
+            @param instance: Simulated instance
+            @type instance: SimuFleetInstance
+            @param success: Indicates if the connection process has succeed
+            @type success: bool
+        '''
+
+        future = None
+        if success:
+            instance.connections += 1
+            instance.state = SimuFleetInstanceState.LISTING_SENSORS
+            future = instance.protocol.get_sensors_list()
+        if future == None:
+            instance.protocol.close()
+            instance.state = SimuFleetInstanceState.DISCONNECTED
+        else:
+            future.add_done_callback(lambda future: self.__on_sensors_list(instance, future.result()))
+
+        return
+
+    def __on_sensors_list(self, instance, sensors):
+        '''
+            Called at the end of the sensors list exchange of a simulated instance
+
+            @param instance: Simulated instance
+            @type instance: SimuFleetInstance
+            @param sensors: List of sensors on success, None if no response received
+            @type sensors: [ SimuSensor ]
+        '''
+
+        if sensors == None:
+            instance.protocol.close()
+            instance.state = SimuFleetInstanceState.DISCONNECTED
+        else:
+            instance.sensors = sensors
+            instance.scenario.start(sensors)
+            instance.state = SimuFleetInstanceState.RUNNING
+
+        return
+
+    def __on_update_sensors(self, instance, success):
+        '''
+            Called at the end of the sensors update exchange of a simulated instance
+
+            @param instance: Simulated instance
+            @type instance: SimuFleetInstance
+            @param success: Indicates if all the sensor updates have succeed, None if no response received
+            @type success: bool
+        '''
+
+        if success == None:
+            instance.updates_lost += 1
+        elif success:
+            instance.updates_succeed += 1
+        else:
+            instance.updates_failed += 1
+
+        return
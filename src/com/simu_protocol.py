@@ -25,12 +25,18 @@ along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
 ####################################################
 #### Imports
 import sys
-from threading import Thread, RLock
+from threading import Thread, RLock, current_thread
+from collections import OrderedDict
 from enum import Enum
 from udp_socket import UdpSocket
 from api.requests_pb2 import SimuRequest
 from api.responses_pb2 import SimuResponse
 from api.notifications_pb2 import SimuNotification
+from com.simu_values import SIMU_VALUES_TYPES
+from com.simu_encoder import SimuUpdateSensorEncoder
+from com.simu_sensors import SimuSensor, SimuSensorRegistry
+from com.simu_config import SimuConfigValue, SimuConfigCache, SimuConfigDump, SimuConfigWriter
+from com.simu_time import monotonic
 
 
 ####################################################
@@ -66,11 +72,75 @@ class SimuSensorValueType(Enum):
     STRING = 5
     BOOL = 6
 
+CONFIG_VALUE_FIELDS = { SimuSensorValueType.UINT : ("uint_value", int),
+                        SimuSensorValueType.INT : ("int_value", int),
+                        SimuSensorValueType.FLOAT : ("float_value", float),
+                        SimuSensorValueType.DOUBLE : ("double_value", float),
+                        SimuSensorValueType.STRING : ("string_value", lambda value: value if isinstance(value, unicode) else str(value)),
+                        SimuSensorValueType.BOOL : ("bool_value", bool) }
+'''
+    Name of the value field of the configuration messages and conversion of the value by value type
+'''
+
+CONFIG_VALUE_TYPES = dict( (field, value_type) for value_type, (field, _) in CONFIG_VALUE_FIELDS.items() )
+'''
+    Value type by name of the value field of the configuration messages
+'''
+
 
 ####################################################
 #### Classes
 
 
+class SimuInFlightRequest(object):
+    '''
+        Request sent to the Open Vario simulated instance and waiting for its response
+    '''
+
+    def __init__(self, kind, sequence, deadline, handler, callback):
+        '''
+            Constructor
+
+            @param kind: Request kind, name of the awaited field in the SimuResponse message
+            @type kind: string
+            @param sequence: Sequence number of the request
+            @type sequence: int
+            @param deadline: Monotonic time after which the request is timed out
+            @type deadline: float
+            @param handler: Response handler
+            @type handler: function(SimuInFlightRequest, bool, message)
+            @param callback: Completion callback, None to notify the protocol listener
+            @type callback: function(result)
+        '''
+
+        self.kind = kind
+        '''
+            Request kind, name of the awaited field in the SimuResponse message
+        '''
+        self.sequence = sequence
+        '''
+            Sequence number of the request
+        '''
+        self.deadline = deadline
+        '''
+            Monotonic time after which the request is timed out
+        '''
+        self.handler = handler
+        '''
+            Response handler
+        '''
+        self.callback = callback
+        '''
+            Completion callback, None to notify the protocol listener
+        '''
+        self.expired = False
+        '''
+            Indicates if the deadline has been reached and the request only claims a late response
+        '''
+
+        return
+
+
 class SimuProtocol(object):
     '''
         Simulator protocol
@@ -86,7 +156,17 @@ class SimuProtocol(object):
         Notification frame
     '''
 
-    def __init__(self, target_ip, target_port, host_port):
+    RX_BUFFER_SIZE = 65535
+    '''
+        Size of the receive buffers, maximum size of a datagram
+    '''
+
+    KEEPALIVE_PERIOD = 1.5
+    '''
+        Time without any request after which a ping request is sent (seconds)
+    '''
+
+    def __init__(self, target_ip, target_port, host_port, window_size=16, request_timeout=1.5, rx_thread=True, udp_socket=None):
         '''
             Constructor
 
@@ -96,6 +176,18 @@ class SimuProtocol(object):
             @type target_port: int
             @param host_port: Port of the simulator
             @type host_port: int
+            @param window_size: Maximum number of requests awaiting a response
+            @type window_size: int
+            @param request_timeout: Maximum time to wait for a response (seconds)
+            @type request_timeout: float
+            @param rx_thread: Indicates if a receive thread must be started, otherwise the
+                              received data is processed by calling the process method
+            @type rx_thread: bool
+            @param udp_socket: Opened and bound socket shared with other protocol instances, None to use
+                               a dedicated socket bound to the host port. The datagrams received on a
+                               shared socket are given to the process_datagram method, no receive thread
+                               is started
+            @type udp_socket: UdpSocket
         '''
 
         self.__target_ip = target_ip
@@ -122,17 +214,77 @@ class SimuProtocol(object):
         '''
             Protocol listener
         '''
-        self.__awaited_response = None
+        self.__window_size = window_size
+        '''
+            Maximum number of requests awaiting a response
+        '''
+        self.__request_timeout = request_timeout
+        '''
+            Maximum time to wait for a response (seconds)
+        '''
+        self.__in_flight = {}
         '''
-            Current awaited response 
+            Requests awaiting a response : { kind : OrderedDict(sequence : SimuInFlightRequest) }
+        '''
+        self.__in_flight_count = 0
+        '''
+            Number of requests awaiting a response, ping requests excluded
+        '''
+        self.__sequence = 0
+        '''
+            Sequence number of the last sent request
         '''
         self.__ping_number = 0
         '''
             Current ping number
         '''
-        self.__timeout_counter = 0
+        self.__session = 0
+        '''
+            Connection session number, incremented on each connection
+        '''
+        self.__connect_deadline = 0
+        '''
+            Monotonic time after which the connection process is timed out
+        '''
+        self.__last_request_time = 0
+        '''
+            Monotonic time of the last sent request
+        '''
+        self.__rx_thread_enabled = rx_thread and (udp_socket == None)
+        '''
+            Indicates if a receive thread is started on connection
+        '''
+        self.__shared_socket = udp_socket
+        '''
+            Socket shared with other protocol instances, None if a dedicated socket is used
+        '''
+        self.__rx_buffer = None
+        '''
+            Receive buffer of the process method, allocated on first use
+        '''
+        self.__recorder = None
+        '''
+            Recorder of the exchanged frames
+        '''
+        self.__thread = None
+        '''
+            Receive thread of the current connection session
+        '''
+        self.__encoder = SimuUpdateSensorEncoder()
+        '''
+            Encoder of the sensor update requests
+        '''
+        self.__sensors = None
+        '''
+            Sensor registry of the current connection session, None until the sensor list is received
+        '''
+        self.__sensor_encoders = {}
         '''
-            Current timeout counter value
+            Encoders of the sensors of the current connection session by id or name : { int or string : SimuSensorEncoder }
+        '''
+        self.__config = SimuConfigCache()
+        '''
+            Configuration values read or written during the current connection session
         '''
         self.__lock = RLock()
         '''
@@ -140,6 +292,75 @@ class SimuProtocol(object):
         '''
 
         return
+
+    def get_window_size(self):
+        '''
+            Get the maximum number of requests awaiting a response
+
+            @return: Maximum number of requests awaiting a response
+            @rtype: int
+        '''
+
+        return self.__window_size
+
+    def set_window_size(self, window_size):
+        '''
+            Set the maximum number of requests awaiting a response
+
+            @param window_size: Maximum number of requests awaiting a response
+            @type window_size: int
+        '''
+
+        self.__window_size = window_size
+
+        return
+
+    def get_in_flight_count(self):
+        '''
+            Get the number of requests awaiting a response
+
+            @return: Number of requests awaiting a response
+            @rtype: int
+        '''
+
+        return self.__in_flight_count
+
+    def fileno(self):
+        '''
+            Get the file descriptor of the dedicated UDP socket, to wait for received data
+            when the protocol has no receive thread
+
+            @return: File descriptor of the UDP socket, None if the socket is not opened or is shared
+            @rtype: int
+        '''
+
+        ret = None
+        if self.__shared_socket == None:
+            ret = self.__socket.fileno()
+
+        return ret
+
+    def set_recorder(self, recorder):
+        '''
+            Set the recorder of the frames exchanged with the Open Vario simulated instance
+
+            @param recorder: Recorder of the exchanged frames, None to stop recording
+            @type recorder: SimuCaptureRecorder
+        '''
+
+        self.__recorder = recorder
+
+        return
+
+    def get_target_address(self):
+        '''
+            Get the address of the Open Vario simulated instance
+
+            @return: IP address and port of the Open Vario simulated instance
+            @rtype: (string, int)
+        '''
+
+        return (self.__target_ip, self.__target_port)
         
     def connect(self, listener):
         '''
@@ -159,23 +380,41 @@ class SimuProtocol(object):
             not (listener == None)):
 
             # Open and bind the UDP socket
-            ret = self.__socket.open()
-            if ret:
-                ret = self.__socket.bind("", self.__host_port)
+            if self.__shared_socket == None:
+                self.__socket = UdpSocket()
+                ret = self.__socket.open()
                 if ret:
+                    ret = self.__socket.bind("", self.__host_port)
+            else:
+                self.__socket = self.__shared_socket
+                ret = True
+            if ret:
 
-                    # Send the connect request
-                    req = SimuRequest()
-                    req.connect.SetInParent()
-                    ret = self.__socket.send_to(self.__target_ip, self.__target_port, req.SerializeToString())
-                    if ret:
+                # Send the connect request
+                req = SimuRequest()
+                req.connect.SetInParent()
+                ret = self.__send(req.SerializeToString())
+                if ret:
 
-                        # Start the receive thread
-                        self.__listener = listener
-                        self.__state = SimuProtocolState.CONNECTING
-                        self.__timeout_counter = 0
-                        self.__awaited_response = None
-                        Thread(target=self.__rx_thread).start()
+                    # Start the receive thread
+                    self.__listener = listener
+                    self.__state = SimuProtocolState.CONNECTING
+                    self.__session += 1
+                    self.__in_flight = {}
+                    self.__in_flight_count = 0
+                    self.__sensors = None
+                    self.__sensor_encoders = {}
+                    self.__config = SimuConfigCache()
+                    self.__connect_deadline = monotonic() + self.__request_timeout
+                    self.__last_request_time = monotonic()
+                    if self.__rx_thread_enabled:
+                        self.__thread = Thread(target=self.__rx_thread, args=(self.__socket, self.__session))
+                        self.__thread.start()
+                    elif self.__shared_socket == None:
+                        self.__socket.set_timeout(0)
+
+            if (not ret) and (self.__shared_socket == None):
+                self.__socket.close()
 
         else:
             ret = False
@@ -200,43 +439,179 @@ class SimuProtocol(object):
             # Send the disconnect request
             req = SimuRequest()
             req.disconnect.SetInParent()
-            ret = self.__socket.send_to(self.__target_ip, self.__target_port, req.SerializeToString())
+            ret = self.__send(req.SerializeToString())
             
             # Update state
-            ret = False
             self.__state = SimuProtocolState.DISCONNECTED
+            self.__sensors = None
+            self.__sensor_encoders = {}
 
             # Close socket
-            ret = self.__socket.close() and ret
+            if self.__shared_socket == None:
+                ret = self.__socket.close() and ret
+
+            # Abort the requests awaiting a response
+            self.__abort_in_flight()
 
         else:
             ret = False
 
+        thread = self.__thread
+        self.__thread = None
+
         self.__lock.release()
 
+        # Wait for the end of the receive thread, otherwise it could still be blocked on the
+        # closed socket descriptor and steal the datagrams of a socket reusing this descriptor
+        if (not (thread == None)) and (not (thread is current_thread())):
+            thread.join()
+
         return ret
 
-    def get_sensors_list(self):
+    def process(self):
         '''
-            Get the sensor list of the Open Vario simulated instance
+            Process the data received on the dedicated socket and the timeouts without blocking,
+            must be called periodically when the protocol has no receive thread
 
-            @return: True if the request has been sent, False otherwise
+            @return: Number of processed datagrams
+            @rtype: int
+        '''
+
+        self.__lock.acquire()
+
+        count = 0
+        if not (self.__state == SimuProtocolState.DISCONNECTED):
+
+            # Handle all the data received on the dedicated socket
+            if self.__shared_socket == None:
+                if self.__rx_buffer == None:
+                    self.__rx_buffer = bytearray(self.RX_BUFFER_SIZE)
+                rx_buffer = self.__rx_buffer
+                rx_view = memoryview(rx_buffer)
+                udp_socket = self.__socket
+                ret = udp_socket.recv_from_into(rx_buffer)
+                while not (ret == None):
+                    self.__handle_datagram(rx_view[:ret[0]])
+                    count += 1
+                    if self.__state == SimuProtocolState.DISCONNECTED:
+                        break
+                    ret = udp_socket.recv_from_into(rx_buffer)
+
+            # Check timeouts
+            self.__check_timeouts(monotonic())
+
+        self.__lock.release()
+
+        return count
+
+    def process_datagram(self, data):
+        '''
+            Process a datagram received from the Open Vario simulated instance on a shared socket
+
+            @param data: Received datagram, only valid during the call when it is a view on a receive buffer
+            @type data: string
+        '''
+
+        self.__lock.acquire()
+
+        if not (self.__state == SimuProtocolState.DISCONNECTED):
+            self.__handle_datagram(data)
+
+        self.__lock.release()
+
+        return
+
+    def get_next_timeout(self):
+        '''
+            Get the time until the next timeout to check, to bound the wait for received data
+            when the protocol has no receive thread
+
+            @return: Time until the next timeout to check (seconds), None if there is nothing to check
+            @rtype: float
+        '''
+
+        self.__lock.acquire()
+
+        deadline = None
+        if self.__state == SimuProtocolState.CONNECTING:
+            deadline = self.__connect_deadline
+        elif self.__state == SimuProtocolState.CONNECTED:
+
+            # The keep-alive ping is only sent when no request awaits a response
+            if (self.__in_flight_count == 0) and (not self.__in_flight.get("ping")):
+                deadline = self.__last_request_time + self.KEEPALIVE_PERIOD
+            for requests in self.__in_flight.values():
+                if requests:
+                    request_deadline = requests[next(iter(requests))].deadline
+                    if (deadline == None) or (request_deadline < deadline):
+                        deadline = request_deadline
+
+        self.__lock.release()
+
+        if not (deadline == None):
+            deadline = max(0, deadline - monotonic())
+
+        return deadline
+
+    def get_sensors(self):
+        '''
+            Get the sensor registry of the current connection session
+
+            @return: Sensor registry, None if the sensor list has not been received since the connection
+            @rtype: SimuSensorRegistry
+        '''
+
+        return self.__sensors
+
+    def invalidate_sensors(self):
+        '''
+            Drop the sensor registry of the current connection session so that the next
+            call to get_sensors_list requests the sensor list again
+        '''
+
+        self.__lock.acquire()
+        self.__sensors = None
+        self.__sensor_encoders = {}
+        self.__lock.release()
+
+        return
+
+    def get_sensors_list(self, callback=None, refresh=False):
+        '''
+            Get the sensor list of the Open Vario simulated instance. The sensor list is
+            requested once per connection session, the next calls are completed immediately
+            with the list of the sensor registry
+
+            @param callback: Called with the sensor list when the response is received,
+                             the listener's on_sensors_list is called if None
+            @type callback: function([ SimuSensor ])
+            @param refresh: Indicates if the sensor list must be requested even if it is already known
+            @type refresh: bool
+
+            @return: True if the request has been sent or the sensor list is already known, False otherwise
             @rtype: bool
         '''
 
         self.__lock.acquire()
 
         # Check current state
-        if ((self.__state == SimuProtocolState.CONNECTED) and
-            ((self.__awaited_response == None) or (self.__awaited_response == self.__handle_ping)) ):
+        if ((not refresh) and (not (self.__sensors == None)) and
+            (self.__state == SimuProtocolState.CONNECTED)):
+
+            # Sensor list of the current session already known
+            sensors = self.__sensors.get_sensors()
+            if callback == None:
+                self.__listener.on_sensors_list(sensors)
+            else:
+                callback(sensors)
+            ret = True
+
+        elif self.__can_send():
 
             # Send the request
             req = SimuRequest()
             req.list_sensors.SetInParent()
-            ret = self.__socket.send_to(self.__target_ip, self.__target_port, req.SerializeToString())
-            if ret:
-                self.__timeout_counter = 0
-                self.__awaited_response = self.__handle_list_sensors
+            ret = self.__send_request("list_sensors", req.SerializeToString(), self.__handle_list_sensors, callback)
 
         else:
             ret = False
@@ -245,7 +620,7 @@ class SimuProtocol(object):
 
         return ret
 
-    def update_sensor(self, id, value, value_type):
+    def update_sensor(self, id, value, value_type, callback=None):
         '''
             Update a sensor value of the Open Vario simulated instance
 
@@ -255,6 +630,9 @@ class SimuProtocol(object):
             @type value: int or float or bool or string
             @param value_type: Value type of the sensor
             @type value_type: SimuSensorValueType
+            @param callback: Called with the update status when the response is received,
+                             the listener's on_update_sensor is called if None
+            @type callback: function(bool)
 
             @return: True if the request has been sent, False otherwise
             @rtype: bool
@@ -263,34 +641,15 @@ class SimuProtocol(object):
         self.__lock.acquire()
 
         # Check current state
-        if ((self.__state == SimuProtocolState.CONNECTED) and
-            ((self.__awaited_response == None) or (self.__awaited_response == self.__handle_ping)) ):
+        if self.__can_send():
 
             # Prepare the request
-            ret = True
-            req = SimuRequest()
-            req.update_sensor.id = id
-            if value_type == SimuSensorValueType.UINT:
-                req.update_sensor.uint_value = int(value)
-            elif value_type == SimuSensorValueType.INT:
-                req.update_sensor.int_value = int(value)
-            elif value_type == SimuSensorValueType.FLOAT:
-                req.update_sensor.float_value = float(value)
-            elif value_type == SimuSensorValueType.DOUBLE:
-                req.update_sensor.double_value = float(value)
-            elif value_type == SimuSensorValueType.STRING:
-                req.update_sensor.string_value = str(value)
-            elif value_type == SimuSensorValueType.BOOL:
-                req.update_sensor.bool_value = bool(value)
-            else:
-                ret = False
+            data = self.__encoder.encode_update_sensor(id, value, value_type)
+            ret = not (data == None)
             if ret:
 
                 # Send the request
-                ret = self.__socket.send_to(self.__target_ip, self.__target_port, req.SerializeToString())
-                if ret:
-                    self.__timeout_counter = 0
-                    self.__awaited_response = self.__handle_update_sensor
+                ret = self.__send_request("update_sensor", data, self.__handle_update_sensor, callback)
 
         else:
             ret = False
@@ -299,195 +658,765 @@ class SimuProtocol(object):
 
         return ret
 
-    def __rx_thread(self):
+    def update_sensors(self, sensors, callback=None):
         '''
-            Thread to receive data from the Open Vario simulated instance
+            Update several sensor values of the Open Vario simulated instance in a single request
+
+            @param sensors: Sensors to update
+            @type sensors: [ (int, int or float or bool or string, SimuSensorValueType) ]
+            @param callback: Called with the update status when the response is received,
+                             the listener's on_update_sensors is called if None
+            @type callback: function(bool)
+
+            @return: True if the request has been sent, False otherwise
+            @rtype: bool
         '''
 
-        # Thread loop
-        end = False
-        while not end:
+        self.__lock.acquire()
 
-            # Wait for data
-            ret = self.__socket.recv_from()
+        # Check current state
+        if self.__can_send():
 
-            self.__lock.acquire()
+            # Prepare the request
+            data = self.__encoder.encode_update_sensors(sensors)
+            ret = not (data == None)
+            if ret:
 
-            if not (ret == None):
+                # Send the request
+                ret = self.__send_request("update_sensors", data, self.__handle_update_sensors, callback)
 
-                # Extract data
-                data = ret[0]
-                
-                # Try decoding data
-                try:
-                    if data[0] == self.RESPONSE_FRAME:
-                        frame = SimuResponse()
-                    elif data[0] == self.NOTIFICATION_FRAME:
-                        frame = SimuNotification()
-                    else:
-                        pass
+        else:
+            ret = False
 
-                    frame.ParseFromString(data[1:])
-                except:
-                    frame = None
+        self.__lock.release()
 
-                # Dispatch data
-                if not (frame == None):
-                    
-                    if isinstance(frame, SimuResponse):
+        return ret
 
-                        # Connection response
-                        if self.__state == SimuProtocolState.CONNECTING:
-                            if frame.HasField("connect"):
-                                
-                                if frame.connect.accept:
+    def update_sensor_value(self, sensor, value, callback=None):
+        '''
+            Update a sensor value of the Open Vario simulated instance, the value type being
+            the one of the sensor list. The value is checked before sending the request
 
-                                    # Connection success
-                                    self.__state = SimuProtocolState.CONNECTED
+            @param sensor: Id or name of the sensor
+            @type sensor: int or string
+            @param value: Value of the sensor, its type must match the value type of the sensor
+            @type value: int or float or bool or string
+            @param callback: Called with the update status when the response is received,
+                             the listener's on_update_sensor is called if None
+            @type callback: function(bool)
 
-                                else:
+            @return: True if the request has been sent, False if the sensor is unknown, if the value
+                     has not the expected type or is out of range, or if the request could not be sent
+            @rtype: bool
+        '''
 
-                                    # Connection failed
-                                    self.close()
-                                    end = True
+        self.__lock.acquire()
 
-                                # Notify user 
-                                self.__listener.on_connect(frame.connect.accept)
-                        else:
-                            
-                            # Handle response
-                            if frame.HasField("disconnect"):
+        # Check current state
+        if self.__can_send():
 
-                                # Close connection
-                                self.close()
+            # Prepare the request
+            ret = False
+            encoder = self.__get_sensor_encoder(sensor)
+            if not (encoder == None):
+                inner = encoder.encode_checked(value)
+                if not (inner == None):
 
-                                # Notify user
-                                self.__listener.on_close()
-                                end = True
+                    # Send the request
+                    data = self.__encoder.encode_update_sensor_fields(inner)
+                    ret = self.__send_request("update_sensor", data, self.__handle_update_sensor, callback)
 
-                            elif frame.HasField("list_sensors"):
-                                if self.__awaited_response == self.__handle_list_sensors:
-                                    self.__awaited_response = None
-                                    self.__handle_list_sensors(False, frame.list_sensors)
+        else:
+            ret = False
 
-                            elif frame.HasField("update_sensor"):
-                                if self.__awaited_response == self.__handle_update_sensor:
-                                    self.__awaited_response = None
-                                    self.__handle_update_sensor(False, frame.update_sensor)
+        self.__lock.release()
 
-                            elif frame.HasField("ping"):
-                                if self.__awaited_response == self.__handle_ping:
-                                    self.__handle_ping(False, frame.ping)
+        return ret
 
-                            else:
-                                # Ignore frame
-                                pass
+    def update_sensor_values(self, values, callback=None, batch=False):
+        '''
+            Update several sensor values of the Open Vario simulated instance, with a request per value
+            unless the batch is requested, the value types being the ones of the sensor list. The values
+            are checked before sending the requests
+
+            @param values: Sensors to update
+            @type values: [ (int or string, int or float or bool or string) ]
+            @param callback: Called with the update status when the response is received,
+                             the listener's on_update_sensors is called if None
+            @type callback: function(bool)
+            @param batch: Indicates if the values are sent in a single update_sensors request, which needs a
+                          firmware handling it, otherwise an update_sensor request is sent per value and the
+                          window must have room for all of them
+            @type batch: bool
+
+            @return: True if the request has been sent, False if a sensor is unknown, if a value
+                     has not the expected type or is out of range, or if the request could not be sent
+            @rtype: bool
+        '''
 
-                    else:
+        self.__lock.acquire()
 
-                        # Notification
+        # Check current state
+        if self.__can_send():
 
-                        notif_type = ""
-                        notif_values = {}
-                        if frame.HasField("pressure"):
-                            notif_type = "pressure"
-                            notif_values["pressure"] = frame.pressure.pressure
-                            notif_values["min_pressure"] = frame.pressure.min_pressure
-                            notif_values["max_pressure"] = frame.pressure.max_pressure
-                        
-                        elif frame.HasField("temperature"):
-                            notif_type = "temperature"
-                            notif_values["temperature"] = frame.temperature.temperature
-                            notif_values["min_temperature"] = frame.temperature.min_temperature
-                            notif_values["max_temperature"] = frame.temperature.max_temperature
-
-                        elif frame.HasField("altitude"):
-                            notif_type = "altitude"
-                            notif_values["altitude"] = frame.altitude.main_altitude
-                            notif_values["min_altitude"] = frame.altitude.min_altitude
-                            notif_values["max_altitude"] = frame.altitude.max_altitude
-                            notif_values["altitude_1"] = frame.altitude.altitude_1
-                            notif_values["altitude_2"] = frame.altitude.altitude_2
-                            notif_values["altitude_3"] = frame.altitude.altitude_3
-                            notif_values["altitude_4"] = frame.altitude.altitude_4
-
-                        elif frame.HasField("vario"):
-                            notif_type = "vario"
-                            notif_values["vario"] = frame.vario.vario
-                            notif_values["min_vario"] = frame.vario.min_vario
-                            notif_values["max_vario"] = frame.vario.max_vario
-
-                        elif frame.HasField("navigation"):
-                            notif_type = "navigation"
-                            notif_values["speed"] = frame.navigation.speed
-                            notif_values["min_speed"] = frame.navigation.min_speed
-                            notif_values["max_speed"] = frame.navigation.max_speed
-                            notif_values["latitude"] = frame.navigation.latitude
-                            notif_values["longitude"] = frame.navigation.longitude
-                            notif_values["track_angle"] = frame.navigation.track_angle
+            # Prepare the request
+            inners = []
+            for sensor, value in values:
+                encoder = self.__get_sensor_encoder(sensor)
+                if encoder == None:
+                    inners = None
+                    break
+                inner = encoder.encode_checked(value)
+                if inner == None:
+                    inners = None
+                    break
+                inners.append(inner)
+            ret = not (inners == None)
+            if ret and batch:
 
-                        # Notify user
-                        if not (notif_type == ""):
-                            self.__listener.on_value(notif_type, notif_values)
+                # Send the request
+                data = self.__encoder.encode_update_sensors_fields(inners)
+                ret = self.__send_request("update_sensors", data, self.__handle_update_sensors, callback)
 
-            else:
+            elif ret:
 
-                # Timeout or error
-                self.__timeout_counter += 1
+                # Send a request per value if the window has room for all of them
+                ret = ((self.__window_size - self.__in_flight_count) >= len(inners))
+                if ret:
+                    ret = self.__send_update_sensor_group(inners, callback)
 
-                # Check connection status
-                if self.__state == SimuProtocolState.CONNECTING:
-                    
-                    # Check timeout
-                    if self.__timeout_counter > 2:
+        else:
+            ret = False
 
-                        # Connexion failed, close connection
-                        self.close()
+        self.__lock.release()
 
-                        # Notify user
-                        self.__listener.on_connect(False)
-                        end = True
+        return ret
 
-                else:
+    def get_config(self):
+        '''
+            Get the configuration values read or written during the current connection session
 
-                    # Check timeout
-                    if self.__timeout_counter > 2:
+            @return: Configuration cache
+            @rtype: SimuConfigCache
+        '''
 
-                        # Reset counter
-                        self.__timeout_counter = 0
+        return self.__config
 
-                        # Check if a response is awaited
-                        if self.__awaited_response == None:
+    def read_config(self, group_id, value_id, callback=None):
+        '''
+            Read a configuration value of the Open Vario simulated instance. The read is timed out
+            after twice the request timeout, its late response being still awaited after the first one
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param callback: Called with the configuration value when the response is received,
+                             the listener's on_config_read is called if None
+            @type callback: function(SimuConfigValue or bool)
+
+            @return: True if the request has been sent, False otherwise. The read responses do not
+                     identify the read value, so a read is not sent while another one awaits its response
+            @rtype: bool
+        '''
 
-                            # Send a ping request
-                            req = SimuRequest()
-                            self.__ping_number += 1
-                            req.ping.number = self.__ping_number
-                            self.__socket.send_to(self.__target_ip, self.__target_port, req.SerializeToString())
-                            self.__awaited_response = self.__handle_ping
+        return self.__read_config(group_id, value_id, callback, True)
 
-                            print "Ping!"
+    def __read_config(self, group_id, value_id, callback, cache):
+        '''
+            Read a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param callback: Called with the configuration value when the response is received,
+                             the listener's on_config_read is called if None
+            @type callback: function(SimuConfigValue or bool)
+            @param cache: Indicates if the read value is stored in the configuration cache
+            @type cache: bool
 
-                        else:
+            @return: True if the request has been sent, False otherwise
+            @rtype: bool
+        '''
 
-                            # Notify timeout
-                            self.__awaited_response(True, None)
-                            end = (self.__awaited_response == self.__handle_ping)
-                            self.__awaited_response = None
-                        
+        self.__lock.acquire()
 
-            self.__lock.release()
+        # Check current state
+        if self.__can_send() and (not self.__in_flight.get("config_read")):
 
-        return
+            # Send the request
+            req = SimuRequest()
+            req.config_read.group_id = group_id
+            req.config_read.value_id = value_id
+            handler = lambda request, timeout, response: self.__handle_config_read(request, timeout, response, group_id, value_id, cache)
+            ret = self.__send_request("config_read", req.SerializeToString(), handler, callback)
 
-    def __handle_list_sensors(self, timeout, list_sensors_response):
-        '''
-            Handle the list sensor response
+        else:
+            ret = False
 
-            @param timeout: Indicates if a timeout occured
-            @type timeout: bool
-            @param list_sensors_response: List sensor response
-            @type list_sensors_response: ListSensorsResponse
+        self.__lock.release()
+
+        return ret
+
+    def write_config(self, group_id, value_id, value, value_type, callback=None):
+        '''
+            Write a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param value: Configuration value
+            @type value: int or float or bool or string
+            @param value_type: Value type of the configuration value
+            @type value_type: SimuSensorValueType
+            @param callback: Called with the write status when the response is received,
+                             the listener's on_config_write is called if None
+            @type callback: function(bool)
+
+            @return: True if the request has been sent, False if the value type is not supported,
+                     if the value is out of range or if the request could not be sent
+            @rtype: bool
+        '''
+
+        self.__lock.acquire()
+
+        # Check current state
+        if self.__can_send():
+
+            # Prepare the request
+            ret = False
+            req = SimuRequest()
+            req.config_write.group_id = group_id
+            req.config_write.value_id = value_id
+            field = CONFIG_VALUE_FIELDS.get(value_type)
+            if not (field == None):
+                try:
+                    setattr(req.config_write, field[0], field[1](value))
+                    value = getattr(req.config_write, field[0])
+                    ret = True
+                except (TypeError, ValueError):
+                    pass
+            if ret:
+
+                # Send the request
+                handler = lambda request, timeout, response: self.__handle_config_write(request, timeout, response, group_id, value_id, value)
+                ret = self.__send_request("config_write", req.SerializeToString(), handler, callback)
+
+        else:
+            ret = False
+
+        self.__lock.release()
+
+        return ret
+
+    def dump_config(self, callback=None):
+        '''
+            Read all the configuration values of the Open Vario simulated instance, one read
+            at a time since the read responses do not identify the read value. The lost reads
+            are retried and the configuration cache is only updated when the dump succeeds
+
+            @param callback: Called with the configuration values at the end of the dump,
+                             None if the dump has failed, the listener's on_config_dump is called if None
+            @type callback: function([ SimuConfigValue ])
+
+            @return: True if the dump has started, False otherwise
+            @rtype: bool
+        '''
+
+        self.__lock.acquire()
+
+        if callback == None:
+            callback = lambda values: self.__listener.on_config_dump(values)
+        read_config = lambda group_id, value_id, read_callback: self.__read_config(group_id, value_id, read_callback, False)
+        dump = SimuConfigDump(read_config, 1, lambda values: self.__on_config_dump(values, callback))
+        ret = dump.start()
+
+        self.__lock.release()
+
+        return ret
+
+    def restore_config(self, values, callback=None):
+        '''
+            Apply configuration values, typically the values of a snapshot, to the Open Vario
+            simulated instance. All the configuration values are read to write only the values
+            which differ, the writes being pipelined within the request window. Nothing is written
+            if a read has been sent again, the values of the dump being then matched by name
+            with values which may have been read under other IDs
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+            @param callback: Called at the end of the restore with the written values ([] if the
+                             configuration was already up to date), False if a value is not known
+                             by the instance or a write has failed, None if a response has not been received
+                             or a read has been sent again, the listener's on_config_restore is called if None
+            @type callback: function([ (int, int, int or float or bool or string, SimuSensorValueType) ])
+
+            @return: True if the restore has started, False otherwise
+            @rtype: bool
+        '''
+
+        self.__lock.acquire()
+
+        if callback == None:
+            callback = lambda result: self.__listener.on_config_restore(result)
+        read_config = lambda group_id, value_id, read_callback: self.__read_config(group_id, value_id, read_callback, False)
+        restore = lambda live_values: self.__restore_config(values, live_values, dump.get_retry_count(), callback)
+        dump = SimuConfigDump(read_config, 1, lambda live_values: self.__on_config_dump(live_values, restore))
+        ret = dump.start()
+
+        self.__lock.release()
+
+        return ret
+
+    def __on_config_dump(self, values, callback):
+        '''
+            Store the values of a successful dump in the configuration cache
+
+            @param values: Configuration values, None if the dump has failed
+            @type values: [ SimuConfigValue ]
+            @param callback: Called with the configuration values
+            @type callback: function([ SimuConfigValue ])
+        '''
+
+        if not (values == None):
+            for value in values:
+                self.__config.update(value)
+        callback(values)
+
+        return
+
+    def __restore_config(self, values, live_values, retry_count, callback):
+        '''
+            Write the configuration values which differ from the values of the instance
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+            @param live_values: Configuration values of the instance, None if the dump has failed
+            @type live_values: [ SimuConfigValue ]
+            @param retry_count: Number of reads of the dump which have been sent again
+            @type retry_count: int
+            @param callback: Called at the end of the restore
+            @type callback: function([ (int, int, int or float or bool or string, SimuSensorValueType) ])
+        '''
+
+        if (live_values == None) or (retry_count > 0):
+            callback(None)
+        else:
+            writes = self.__config.get_writes(values)
+            if writes == None:
+                callback(False)
+            else:
+                writer = SimuConfigWriter(self.write_config, self.__window_size, writes,
+                                          lambda result: callback(writes if result else result))
+                if not writer.start():
+                    callback(False)
+
+        return
+
+    def __send_update_sensor_group(self, inners, callback):
+        '''
+            Send an update_sensor request per sensor value, the status of the group being notified
+            once all the responses are received
+
+            @param inners: Encoded UpdateSensorRequest messages
+            @type inners: [ string ]
+            @param callback: Called with the update status of the group : None if a response has not been
+                             received, False if an update failed, the listener's on_update_sensors is called if None
+            @type callback: function(bool)
+
+            @return: True if all the requests have been sent, False otherwise
+            @rtype: bool
+        '''
+
+        # The responses are handled with the lock held, so none is received before all the
+        # requests are sent. If a request cannot be sent, the responses of the group are ignored
+        group = { "awaited" : len(inners), "status" : True, "sent" : False }
+
+        def on_update_sensor(success):
+            group["awaited"] -= 1
+            if success == None:
+                group["status"] = None
+            elif (not success) and (group["status"] == True):
+                group["status"] = False
+            if group["sent"] and (group["awaited"] == 0):
+                if callback == None:
+                    self.__listener.on_update_sensors(group["status"])
+                else:
+                    callback(group["status"])
+
+        ret = True
+        for inner in inners:
+            data = self.__encoder.encode_update_sensor_fields(inner)
+            ret = self.__send_request("update_sensor", data, self.__handle_update_sensor, on_update_sensor)
+            if not ret:
+                break
+        group["sent"] = ret
+
+        return ret
+
+    def __get_sensor_encoder(self, sensor):
+        '''
+            Get the encoder of a sensor of the current connection session, built once per sensor
+
+            @param sensor: Id or name of the sensor
+            @type sensor: int or string
+
+            @return: Encoder of the sensor, None if the sensor is unknown or its value type is not supported
+            @rtype: SimuSensorEncoder
+        '''
+
+        encoder = self.__sensor_encoders.get(sensor)
+        if (encoder == None) and (not (self.__sensors == None)):
+            descriptor = None
+            if isinstance(sensor, basestring):
+                descriptor = self.__sensors.get_by_name(sensor)
+            elif isinstance(sensor, (int, long)):
+                descriptor = self.__sensors.get_by_id(sensor)
+            if not (descriptor == None):
+                encoder = self.__encoder.get_sensor_encoder(descriptor.id, descriptor.value_type)
+                if not (encoder == None):
+                    self.__sensor_encoders[sensor] = encoder
+
+        return encoder
+
+    def __can_send(self):
+        '''
+            Indicate if a new request can be sent
+
+            @return: True if the protocol is connected and the request window is not full, False otherwise
+            @rtype: bool
+        '''
+
+        return ((self.__state == SimuProtocolState.CONNECTED) and
+                (self.__in_flight_count < self.__window_size))
+
+    def __send_request(self, kind, data, handler, callback, ping_number=None):
+        '''
+            Send a request and register it in the table of requests awaiting a response
+
+            @param kind: Request kind, name of the awaited field in the SimuResponse message
+            @type kind: string
+            @param data: Serialized SimuRequest
+            @type data: string
+            @param handler: Response handler
+            @type handler: function(SimuInFlightRequest, bool, message)
+            @param callback: Completion callback, None to notify the protocol listener
+            @type callback: function(result)
+            @param ping_number: Ping number of a ping request
+            @type ping_number: int
+
+            @return: True if the request has been sent, False otherwise
+            @rtype: bool
+        '''
+
+        ret = self.__send(data)
+        if ret:
+
+            # Sequence number, ping requests are identified by their ping number
+            if kind == "ping":
+                sequence = ping_number
+            else:
+                self.__sequence += 1
+                sequence = self.__sequence
+                self.__in_flight_count += 1
+
+            # Register request
+            now = monotonic()
+            requests = self.__in_flight.get(kind)
+            if requests == None:
+                requests = OrderedDict()
+                self.__in_flight[kind] = requests
+            requests[sequence] = SimuInFlightRequest(kind, sequence, now + self.__request_timeout, handler, callback)
+            self.__last_request_time = now
+
+        return ret
+
+    def __send(self, data):
+        '''
+            Send a serialized request to the Open Vario simulated instance
+
+            @param data: Serialized SimuRequest
+            @type data: string
+
+            @return: True if the request has been sent, False otherwise
+            @rtype: bool
+        '''
+
+        ret = self.__socket.send_to(self.__target_ip, self.__target_port, data)
+        if ret and (not (self.__recorder == None)):
+            self.__recorder.record_tx(data)
+
+        return ret
+
+    def __pop_in_flight(self, kind, sequence):
+        '''
+            Remove a request from the table of requests awaiting a response
+
+            @param kind: Request kind
+            @type kind: string
+            @param sequence: Sequence number of the request, None for the oldest request of this kind
+            @type sequence: int
+
+            @return: Removed request, None if no matching request is awaiting a response
+            @rtype: SimuInFlightRequest
+        '''
+
+        request = None
+        requests = self.__in_flight.get(kind)
+        if requests:
+            if sequence == None:
+                sequence = next(iter(requests))
+            request = requests.pop(sequence, None)
+            if (not (request == None)) and (not (kind == "ping")):
+                self.__in_flight_count -= 1
+
+        return request
+
+    def __check_deadlines(self, now):
+        '''
+            Time out the requests which have reached their deadline
+
+            @param now: Current monotonic time
+            @type now: float
+        '''
+
+        # Requests of a given kind are ordered by deadline, only the oldest ones need to be checked
+        for kind in list(self.__in_flight.keys()):
+            requests = self.__in_flight.get(kind)
+            while requests:
+                request = requests[next(iter(requests))]
+                if request.deadline > now:
+                    break
+
+                # The config read responses do not identify the read value : a timed out read keeps
+                # claiming its late response during another request timeout, so that this response
+                # is not matched with the next read. Only one config read awaits a response at a time
+                if (kind == "config_read") and (not request.expired):
+                    request.expired = True
+                    request.deadline = now + self.__request_timeout
+                    break
+
+                self.__pop_in_flight(kind, request.sequence)
+                request.handler(request, True, None)
+
+                # The handler may have closed the connection and reset the table
+                requests = self.__in_flight.get(kind)
+
+        return
+
+    def __abort_in_flight(self):
+        '''
+            Notify a timeout for all the requests awaiting a response
+        '''
+
+        in_flight = self.__in_flight
+        self.__in_flight = {}
+        self.__in_flight_count = 0
+        for kind in in_flight:
+            if not (kind == "ping"):
+                for request in in_flight[kind].values():
+                    request.handler(request, True, None)
+
+        return
+
+    def __rx_thread(self, udp_socket, session):
+        '''
+            Thread to receive data from the Open Vario simulated instance
+
+            @param udp_socket: UDP socket of the connection session
+            @type udp_socket: UdpSocket
+            @param session: Connection session number
+            @type session: int
+        '''
+
+        # Receive buffer, the received datagrams are decoded directly from it
+        rx_buffer = bytearray(self.RX_BUFFER_SIZE)
+        rx_view = memoryview(rx_buffer)
+
+        # Thread loop
+        end = False
+        while not end:
+
+            # Wait for data
+            ret = udp_socket.recv_from_into(rx_buffer)
+
+            self.__lock.acquire()
+
+            # Check if the connection session is still alive
+            end = ((not (session == self.__session)) or
+                   (self.__state == SimuProtocolState.DISCONNECTED))
+            if not end:
+
+                # Handle data
+                if not (ret == None):
+                    self.__handle_datagram(rx_view[:ret[0]])
+
+                # Check timeouts
+                self.__check_timeouts(monotonic())
+
+                end = (self.__state == SimuProtocolState.DISCONNECTED)
+
+            self.__lock.release()
+
+        return
+
+    def __handle_datagram(self, data):
+        '''
+            Decode and dispatch a datagram received from the Open Vario simulated instance
+
+            @param data: Received datagram, the frame tag followed by the frame payload.
+                         The payload is decoded from a view on the datagram without copy
+            @type data: string
+        '''
+
+        # Record data
+        if not (self.__recorder == None):
+            self.__recorder.record_rx(data)
+
+        # Try decoding data
+        try:
+            if data[0] == self.RESPONSE_FRAME:
+                frame = SimuResponse()
+            elif data[0] == self.NOTIFICATION_FRAME:
+                frame = SimuNotification()
+            else:
+                pass
+
+            frame.ParseFromString(memoryview(data)[1:])
+        except:
+            frame = None
+
+        # Dispatch data
+        if not (frame == None):
+            
+            if isinstance(frame, SimuResponse):
+
+                # Connection response
+                if self.__state == SimuProtocolState.CONNECTING:
+                    if frame.HasField("connect"):
+                        
+                        if frame.connect.accept:
+
+                            # Connection success
+                            self.__state = SimuProtocolState.CONNECTED
+
+                        else:
+
+                            # Connection failed
+                            self.close()
+
+                        # Notify user 
+                        self.__listener.on_connect(frame.connect.accept)
+                else:
+                    
+                    # Handle response
+                    kind = frame.WhichOneof("Responses")
+                    if kind == "disconnect":
+
+                        # Close connection
+                        self.close()
+
+                        # Notify user
+                        self.__listener.on_close()
+
+                    elif not (kind == None):
+
+                        # Match the response with the request awaiting it, the ping response
+                        # carries its ping number, other responses are received in sending order
+                        if kind == "ping":
+                            request = self.__pop_in_flight(kind, frame.ping.number)
+                        else:
+                            request = self.__pop_in_flight(kind, None)
+                        if not (request == None):
+                            request.handler(request, False, getattr(frame, kind))
+
+                    else:
+                        # Ignore frame
+                        pass
+
+            else:
+
+                # Notification
+                notif_type = frame.WhichOneof("Notifications")
+                values_type = SIMU_VALUES_TYPES.get(notif_type)
+
+                # Notify user
+                if not (values_type == None):
+                    self.__listener.on_notification(values_type.from_message(getattr(frame, notif_type)))
+
+        return
+
+    def __check_timeouts(self, now):
+        '''
+            Check the connection, request and keep-alive timeouts
+
+            @param now: Current monotonic time
+            @type now: float
+        '''
+
+        if self.__state == SimuProtocolState.CONNECTING:
+            
+            # Check timeout
+            if now > self.__connect_deadline:
+
+                # Connexion failed, close connection
+                self.close()
+
+                # Notify user
+                self.__listener.on_connect(False)
+
+        elif self.__state == SimuProtocolState.CONNECTED:
+
+            # Check the deadlines of the requests awaiting a response
+            self.__check_deadlines(now)
+
+            # Keep the connection alive when no request has been sent for a while
+            if ((self.__state == SimuProtocolState.CONNECTED) and
+                (self.__in_flight_count == 0) and
+                (not self.__in_flight.get("ping")) and
+                (now - self.__last_request_time > self.KEEPALIVE_PERIOD)):
+
+                # Send a ping request
+                req = SimuRequest()
+                self.__ping_number += 1
+                req.ping.number = self.__ping_number
+                self.__send_request("ping", req.SerializeToString(), self.__handle_ping, None, self.__ping_number)
+
+                print "Ping!"
+
+        return
+
+    def __notify(self, request, listener_method, result):
+        '''
+            Notify the result of a request to its completion callback or to the listener
+
+            @param request: Completed request
+            @type request: SimuInFlightRequest
+            @param listener_method: Listener method to call if the request has no completion callback
+            @type listener_method: function(result)
+            @param result: Result of the request
+            @type result: object
+        '''
+
+        if request.callback == None:
+            listener_method(result)
+        else:
+            request.callback(result)
+
+        return
+
+    def __handle_list_sensors(self, request, timeout, list_sensors_response):
+        '''
+            Handle the list sensor response
+
+            @param request: Completed request
+            @type request: SimuInFlightRequest
+            @param timeout: Indicates if a timeout occured
+            @type timeout: bool
+            @param list_sensors_response: List sensor response
+            @type list_sensors_response: ListSensorsResponse
         '''
 
         # Check timeout
@@ -498,17 +1427,24 @@ class SimuProtocol(object):
             # Extract sensor list
             sensors = []
             for sensor in list_sensors_response.sensors:
-                sensors.append( (sensor.id, sensor.name, SimuSensorType(sensor.type), SimuSensorValueType(sensor.value_type)) )
+                sensors.append(SimuSensor(sensor.id, sensor.name, SimuSensorType(sensor.type), SimuSensorValueType(sensor.value_type)))
+
+            # Cache the sensor list for the current session, requests of a previous
+            # session have been aborted when it has been closed
+            self.__sensors = SimuSensorRegistry(sensors, self.__session)
+            self.__sensor_encoders = {}
 
         # Notify user
-        self.__listener.on_sensors_list(sensors)
+        self.__notify(request, self.__listener.on_sensors_list, sensors)
 
         return
 
-    def __handle_update_sensor(self, timeout, update_sensor_response):
+    def __handle_update_sensor(self, request, timeout, update_sensor_response):
         '''
             Handle the update sensor response
 
+            @param request: Completed request
+            @type request: SimuInFlightRequest
             @param timeout: Indicates if a timeout occured
             @type timeout: bool
             @param update_sensor_response: Update sensor response
@@ -523,14 +1459,125 @@ class SimuProtocol(object):
             ret = update_sensor_response.success
 
         # Notify user
-        self.__listener.on_update_sensor(ret)
+        self.__notify(request, self.__listener.on_update_sensor, ret)
+
+        return
+
+    def __handle_update_sensors(self, request, timeout, update_sensors_response):
+        '''
+            Handle the update sensors response
+
+            @param request: Completed request
+            @type request: SimuInFlightRequest
+            @param timeout: Indicates if a timeout occured
+            @type timeout: bool
+            @param update_sensors_response: Update sensors response
+            @type update_sensors_response: UpdateSensorsResponse
+        '''
+
+        # Check timeout
+        if timeout:
+            ret = None
+
+        else:
+            ret = update_sensors_response.success
+
+        # Notify user
+        self.__notify(request, self.__listener.on_update_sensors, ret)
+
+        return
+
+    def __handle_config_read(self, request, timeout, config_read_response, group_id, value_id, cache):
+        '''
+            Handle the configuration value read response
+
+            @param request: Completed request
+            @type request: SimuInFlightRequest
+            @param timeout: Indicates if a timeout occured
+            @type timeout: bool
+            @param config_read_response: Configuration value read response
+            @type config_read_response: ConfigValueReadResponse
+            @param group_id: Group ID of the read value
+            @type group_id: int
+            @param value_id: Value ID of the read value
+            @type value_id: int
+            @param cache: Indicates if the read value is stored in the configuration cache
+            @type cache: bool
+        '''
+
+        # Check timeout
+        if timeout:
+            ret = None
+
+        elif not config_read_response.success:
+            ret = False
+
+        else:
+            # Extract configuration value
+            field = config_read_response.WhichOneof("Values")
+            value = None
+            if not (field == None):
+                value = getattr(config_read_response, field)
+            min_value = None
+            max_value = None
+            if config_read_response.has_min_max:
+                min_field = config_read_response.WhichOneof("MinValues")
+                if not (min_field == None):
+                    min_value = getattr(config_read_response, min_field)
+                max_field = config_read_response.WhichOneof("MaxValues")
+                if not (max_field == None):
+                    max_value = getattr(config_read_response, max_field)
+            ret = SimuConfigValue(group_id, value_id,
+                                  config_read_response.value_group_name, config_read_response.value_name,
+                                  config_read_response.value_type, config_read_response.value_size,
+                                  CONFIG_VALUE_TYPES.get(field, SimuSensorValueType.UNKNOWN), value,
+                                  min_value, max_value, config_read_response.is_reset_only)
+            if cache:
+                self.__config.update(ret)
+
+        # Notify user
+        self.__notify(request, self.__listener.on_config_read, ret)
+
+        return
+
+    def __handle_config_write(self, request, timeout, config_write_response, group_id, value_id, value):
+        '''
+            Handle the configuration value write response
+
+            @param request: Completed request
+            @type request: SimuInFlightRequest
+            @param timeout: Indicates if a timeout occured
+            @type timeout: bool
+            @param config_write_response: Configuration value write response
+            @type config_write_response: ConfigValueWriteResponse
+            @param group_id: Group ID of the written value
+            @type group_id: int
+            @param value_id: Value ID of the written value
+            @type value_id: int
+            @param value: Written value
+            @type value: int or float or bool or string
+        '''
+
+        # Check timeout
+        if timeout:
+            ret = None
+
+        else:
+            ret = config_write_response.success
+            if ret:
+                self.__config.set_value(group_id, value_id, value)
+
+        # Notify user
+        self.__notify(request, self.__listener.on_config_write, ret)
 
         return
 
-    def __handle_ping(self, timeout, ping_response):
+    def __handle_ping(self, request, timeout, ping_response):
         '''
             Handle the ping response
 
+            @param request: Completed request
+            @type request: SimuInFlightRequest
             @param timeout: Indicates if a timeout occured
             @type timeout: bool
             @param ping_response: Ping response
@@ -547,11 +1594,7 @@ class SimuProtocol(object):
             self.__listener.on_close()
 
         else:
-
-            # Check expected ping number
-            if (ping_response.number == self.__ping_number):
-                self.__awaited_response = None
-                print "Pong!"
+            print "Pong!"
 
         return
 
@@ -581,7 +1624,7 @@ class SimuProtocolListener(object):
             Called at the end of the sensors list exchange
 
             @param sensors: List of sensors on success, None if no response received
-            @type sensors: [ (int, string, SimuSensorType, SimuSensorValueType) ]
+            @type sensors: [ SimuSensor ]
         '''
         return
 
@@ -594,6 +1637,65 @@ class SimuProtocolListener(object):
         '''
         return
 
+    def on_update_sensors(self, success):
+        '''
+            Called at the end of the sensors update exchange
+
+            @param success: Indicates if all the sensor updates have succeed, None if no response received
+            @type success: bool
+        '''
+        return
+
+    def on_config_read(self, value):
+        '''
+            Called at the end of the configuration value read exchange
+
+            @param value: Configuration value on success, False if the value does not exist,
+                          None if no response received
+            @type value: SimuConfigValue or bool
+        '''
+        return
+
+    def on_config_write(self, success):
+        '''
+            Called at the end of the configuration value write exchange
+
+            @param success: Indicates if the configuration value has been written, None if no response received
+            @type success: bool
+        '''
+        return
+
+    def on_config_dump(self, values):
+        '''
+            Called at the end of the configuration dump
+
+            @param values: Configuration values on success, None if a response has not been received
+            @type values: [ SimuConfigValue ]
+        '''
+        return
+
+    def on_config_restore(self, writes):
+        '''
+            Called at the end of the configuration restore
+
+            @param writes: Written values on success ([] if the configuration was already up to date),
+                           False if a value is not known by the instance or a write has failed,
+                           None if a response has not been received
+            @type writes: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+        return
+
+    def on_notification(self, values):
+        '''
+            Called when values have been received, calls on_value with the values
+            as a dictionary unless overridden
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+        self.on_value(values.TYPE, values.to_dict())
+        return
+
     def on_value(self, notif_type, notif_values):
         '''
             Called when a value has been received
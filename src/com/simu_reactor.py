@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import select
+import socket
+import time
+from udp_socket import UdpSocket
+from com.simu_protocol import SimuProtocol
+from com.simu_async_protocol import AsyncSimuProtocol
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuReactor(object):
+    '''
+        Single thread loop driving several asynchronous protocol instances. The instances
+        either share a single socket, the received datagrams being dispatched by peer address,
+        or use their own dedicated socket
+    '''
+
+    def __init__(self, host_port=None, batch_size=64):
+        '''
+            Constructor
+
+            @param host_port: Port of the socket shared by all the protocol instances,
+                              None if each instance uses its own dedicated socket
+            @type host_port: int
+            @param batch_size: Maximum number of datagrams read from the shared socket on each wake up
+            @type batch_size: int
+        '''
+
+        self.__host_port = host_port
+        '''
+            Port of the socket shared by all the protocol instances
+        '''
+        self.__batch_size = batch_size
+        '''
+            Maximum number of datagrams read from the shared socket on each wake up
+        '''
+        self.__shared_socket = None
+        '''
+            Socket shared by all the protocol instances
+        '''
+        if not (host_port == None):
+            self.__shared_socket = UdpSocket()
+        self.__protocols = []
+        '''
+            Protocol instances
+        '''
+        self.__peers = {}
+        '''
+            Protocol instances using the shared socket : { (ip_address, port) : AsyncSimuProtocol }
+        '''
+        self.__unknown_datagrams = 0
+        '''
+            Number of datagrams received on the shared socket from an unknown peer
+        '''
+        self.__rx_buffer = None
+        '''
+            Receive buffer of the shared socket, allocated on first use
+        '''
+
+        return
+
+    def open(self):
+        '''
+            Open the shared socket if any and not already opened
+
+            @return: True if the reactor is ready, False otherwise
+            @rtype: bool
+        '''
+
+        ret = True
+        udp_socket = self.__shared_socket
+        if (not (udp_socket == None)) and (udp_socket.fileno() == None):
+            ret = udp_socket.open()
+            if ret:
+                ret = udp_socket.bind("", self.__host_port)
+                if ret:
+                    udp_socket.set_timeout(0)
+                else:
+                    udp_socket.close()
+
+        return ret
+
+    def close(self):
+        '''
+            Close the connections of all the protocol instances and the shared socket
+        '''
+
+        for protocol in self.__protocols:
+            protocol.close()
+        if not (self.__shared_socket == None):
+            self.__shared_socket.close()
+
+        return
+
+    def create_protocol(self, target_ip, target_port, host_port=None, window_size=16, request_timeout=1.5):
+        '''
+            Create a protocol instance driven by the reactor
+
+            @param target_ip: IP address of the Open Vario simulated instance
+            @type target_ip: string
+            @param target_port: Port of the Open Vario simulated instance
+            @type target_port: int
+            @param host_port: Port of the dedicated socket, ignored when the reactor uses a shared socket
+            @type host_port: int
+            @param window_size: Maximum number of requests awaiting a response
+            @type window_size: int
+            @param request_timeout: Maximum time to wait for a response (seconds)
+            @type request_timeout: float
+
+            @return: Protocol instance, None if the peer address is already used
+            @rtype: AsyncSimuProtocol
+        '''
+
+        protocol = None
+        if self.__shared_socket == None:
+            protocol = AsyncSimuProtocol(target_ip, target_port, host_port, window_size, request_timeout)
+        else:
+
+            # The datagrams are dispatched using the address they are received from
+            peer = (socket.gethostbyname(target_ip), target_port)
+            if not (peer in self.__peers):
+                protocol = AsyncSimuProtocol(target_ip, target_port, self.__host_port, window_size, request_timeout,
+                                             udp_socket=self.__shared_socket)
+                self.__peers[peer] = protocol
+
+        if not (protocol == None):
+            self.__protocols.append(protocol)
+
+        return protocol
+
+    def get_protocols(self):
+        '''
+            Get the protocol instances driven by the reactor
+
+            @return: Protocol instances
+            @rtype: [ AsyncSimuProtocol ]
+        '''
+
+        return self.__protocols
+
+    def get_unknown_datagrams(self):
+        '''
+            Get the number of datagrams received on the shared socket from an unknown peer
+
+            @return: Number of datagrams
+            @rtype: int
+        '''
+
+        return self.__unknown_datagrams
+
+    def run_once(self, timeout):
+        '''
+            Wait for received data or a protocol timeout and process them
+
+            @param timeout: Maximum time to wait (seconds)
+            @type timeout: float
+
+            @return: Number of processed datagrams
+            @rtype: int
+        '''
+
+        # List the sockets to wait for and the next protocol timeout
+        fds = {}
+        if not (self.__shared_socket == None):
+            fd = self.__shared_socket.fileno()
+            if not (fd == None):
+                fds[fd] = None
+        for protocol in self.__protocols:
+            fd = protocol.fileno()
+            if not (fd == None):
+                fds[fd] = protocol
+            next_timeout = protocol.get_next_timeout()
+            if not (next_timeout == None):
+                timeout = min(timeout, next_timeout)
+
+        # Wait for received data
+        timeout = max(0, timeout)
+        if fds:
+            readable = select.select(fds.keys(), [], [], timeout)[0]
+        else:
+            # select() does not accept empty lists on Windows
+            readable = []
+            if timeout > 0:
+                time.sleep(timeout)
+
+        # Process received data
+        count = 0
+        for fd in readable:
+            protocol = fds[fd]
+            if protocol == None:
+                count += self.__read_shared_socket()
+            else:
+                count += protocol.process()
+
+        # Process timeouts
+        for protocol in self.__protocols:
+            if protocol.get_next_timeout() == 0:
+                protocol.process()
+
+        return count
+
+    def __read_shared_socket(self):
+        '''
+            Read a batch of datagrams from the shared socket and dispatch them to the protocol instances
+
+            @return: Number of read datagrams
+            @rtype: int
+        '''
+
+        if self.__rx_buffer == None:
+            self.__rx_buffer = bytearray(SimuProtocol.RX_BUFFER_SIZE)
+        rx_buffer = self.__rx_buffer
+        rx_view = memoryview(rx_buffer)
+
+        count = 0
+        peers = self.__peers
+        udp_socket = self.__shared_socket
+        while count < self.__batch_size:
+            ret = udp_socket.recv_from_into(rx_buffer)
+            if ret == None:
+                break
+            count += 1
+
+            # The protocol decodes the datagram directly from the receive buffer
+            protocol = peers.get(ret[1])
+            if protocol == None:
+                self.__unknown_datagrams += 1
+            else:
+                protocol.process_datagram(rx_view[:ret[0]])
+
+        return count
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+from collections import namedtuple
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuSensor(namedtuple("SimuSensor", ("id", "name", "type", "value_type"))):
+    '''
+        Sensor of the Open Vario simulated instance, its fields can also be accessed
+        as the (id, name, SimuSensorType, SimuSensorValueType) tuple of the sensor list
+    '''
+
+    __slots__ = ()
+
+
+class SimuSensorRegistry(object):
+    '''
+        Sensor list of a connection session with an Open Vario simulated instance,
+        indexed by id, name and sensor type. The registry is not modified once built
+        so that it can be shared between threads
+    '''
+
+    def __init__(self, sensors, session):
+        '''
+            Constructor
+
+            @param sensors: Sensor list
+            @type sensors: [ SimuSensor ]
+            @param session: Connection session number the sensor list belongs to
+            @type session: int
+        '''
+
+        self.__sensors = tuple(sensors)
+        '''
+            Sensor list in the order of the ListSensorsResponse
+        '''
+        self.__session = session
+        '''
+            Connection session number the sensor list belongs to
+        '''
+        self.__by_id = {}
+        '''
+            Sensors by id : { int : SimuSensor }
+        '''
+        self.__by_name = {}
+        '''
+            Sensors by name : { string : SimuSensor }
+        '''
+        self.__by_type = {}
+        '''
+            Sensors by type in list order : { SimuSensorType : [ SimuSensor ] }
+        '''
+
+        # The first sensor wins when an id or a name is listed twice
+        for sensor in self.__sensors:
+            self.__by_id.setdefault(sensor.id, sensor)
+            self.__by_name.setdefault(sensor.name, sensor)
+            self.__by_type.setdefault(sensor.type, []).append(sensor)
+
+        return
+
+    def get_session(self):
+        '''
+            Get the connection session number the sensor list belongs to
+
+            @return: Connection session number
+            @rtype: int
+        '''
+
+        return self.__session
+
+    def get_sensors(self):
+        '''
+            Get the sensor list
+
+            @return: Sensor list in the order of the ListSensorsResponse
+            @rtype: [ SimuSensor ]
+        '''
+
+        return list(self.__sensors)
+
+    def get_count(self):
+        '''
+            Get the number of sensors
+
+            @return: Number of sensors
+            @rtype: int
+        '''
+
+        return len(self.__sensors)
+
+    def get_by_id(self, id):
+        '''
+            Get a sensor from its id
+
+            @param id: Id of the sensor
+            @type id: int
+
+            @return: Sensor, None if no sensor has this id
+            @rtype: SimuSensor
+        '''
+
+        return self.__by_id.get(id)
+
+    def get_by_name(self, name):
+        '''
+            Get a sensor from its name
+
+            @param name: Name of the sensor
+            @type name: string
+
+            @return: Sensor, None if no sensor has this name
+            @rtype: SimuSensor
+        '''
+
+        return self.__by_name.get(name)
+
+    def get_by_type(self, sensor_type):
+        '''
+            Get the sensors of a given type
+
+            @param sensor_type: Sensor type
+            @type sensor_type: SimuSensorType
+
+            @return: Sensors of this type in list order, empty if there is none
+            @rtype: [ SimuSensor ]
+        '''
+
+        return list(self.__by_type.get(sensor_type, ()))
+
+    def get_first(self, sensor_type):
+        '''
+            Get the first sensor of a given type
+
+            @param sensor_type: Sensor type
+            @type sensor_type: SimuSensorType
+
+            @return: First sensor of this type in list order, None if there is none
+            @rtype: SimuSensor
+        '''
+
+        ret = None
+        sensors = self.__by_type.get(sensor_type)
+        if sensors:
+            ret = sensors[0]
+
+        return ret
+
+    def resolve(self, key):
+        '''
+            Get a sensor from its id, its name or its type
+
+            @param key: Id or name of the sensor, or sensor type to get the first sensor of this type
+            @type key: int or string or SimuSensorType
+
+            @return: Sensor, None if no sensor matches
+            @rtype: SimuSensor
+        '''
+
+        if isinstance(key, basestring):
+            ret = self.__by_name.get(key)
+        elif isinstance(key, (int, long)):
+            ret = self.__by_id.get(key)
+        else:
+            ret = self.get_first(key)
+
+        return ret
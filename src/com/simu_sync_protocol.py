@@ -24,8 +24,9 @@ along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
 
 ####################################################
 #### Imports
-import time
+from threading import Event, Lock
 from com.simu_protocol import SimuProtocolListener 
+from com.simu_time import monotonic
 
 ####################################################
 #### Data types
@@ -41,12 +42,14 @@ class SimuSyncProtocol(SimuProtocolListener):
         Simulator synchronous protocol
     '''
 
-    def __init__(self, simu_protocol):
+    def __init__(self, simu_protocol, timeout=2.0):
         '''
             Constructor
 
             @param simu_protocol: Simulation protocol instance to use for communication
             @type simu_protocol: SimuProtocol
+            @param timeout: Maximum time to wait for a response in seconds
+            @type timeout: float
         '''
 
         self.__simu_protocol = simu_protocol
@@ -54,9 +57,24 @@ class SimuSyncProtocol(SimuProtocolListener):
             Simulation protocol instance to use for communication
         '''
 
-        self.__response_ready = False
+        self.__timeout = timeout
         '''
-            Indicates if a response if available
+            Maximum time to wait for a response in seconds
+        '''
+
+        self.__awaited_response = None
+        '''
+            Name of the awaited response, None if no response is awaited
+        '''
+
+        self.__response_event = Event()
+        '''
+            Signaled when the awaited response has been received
+        '''
+
+        self.__response_lock = Lock()
+        '''
+            Lock protecting the awaited response between the caller and the receive thread
         '''
 
         self.__response = None
@@ -98,11 +116,14 @@ class SimuSyncProtocol(SimuProtocolListener):
         '''
         
         self.__listener = listener
+        self.__prepare_wait("connect")
         ret = self.__simu_protocol.connect(self)
         if ret:
-            ret = self.__wait_response("connect")
+            ret = self.__wait_response()
             if ret:
                 ret = self.__response
+        else:
+            self.__cancel_wait()
 
         return ret
     
@@ -119,20 +140,46 @@ class SimuSyncProtocol(SimuProtocolListener):
         return ret
 
 
-    def get_sensors_list(self):
+    def get_sensors(self):
+        '''
+            Get the sensor registry of the current connection session
+
+            @return: Sensor registry, None if the sensor list has not been received since the connection
+            @rtype: SimuSensorRegistry
+        '''
+
+        return self.__simu_protocol.get_sensors()
+
+    def get_config(self):
         '''
-            Get the sensor list of the Open Vario simulated instance
+            Get the configuration values read or written during the current connection session
+
+            @return: Configuration cache
+            @rtype: SimuConfigCache
+        '''
+
+        return self.__simu_protocol.get_config()
+
+    def get_sensors_list(self, refresh=False):
+        '''
+            Get the sensor list of the Open Vario simulated instance, requested once per connection session
+
+            @param refresh: Indicates if the sensor list must be requested even if it is already known
+            @type refresh: bool
 
             @return: List of sensors on success, None if no response received
-            @rtype: [ (int, string, SimuSensorType, SimuSensorValueType) ]
+            @rtype: [ SimuSensor ]
         '''
 
         sensors = None
-        ret = self.__simu_protocol.get_sensors_list()
+        self.__prepare_wait("get_sensors_list")
+        ret = self.__simu_protocol.get_sensors_list(None, refresh)
         if ret:
-            ret = self.__wait_response("get_sensors_list")
+            ret = self.__wait_response()
             if ret:
                 sensors = self.__response
+        else:
+            self.__cancel_wait()
                 
         return sensors
 
@@ -152,14 +199,209 @@ class SimuSyncProtocol(SimuProtocolListener):
         '''
         
         update_succeed = None
+        self.__prepare_wait("update_sensor")
         ret = self.__simu_protocol.update_sensor(id, value, value_type)
         if ret:
-            ret = self.__wait_response("update_sensor")
+            ret = self.__wait_response()
             if ret:
                 update_succeed = self.__response
+        else:
+            self.__cancel_wait()
                 
         return update_succeed
 
+    def update_sensors(self, sensors):
+        '''
+            Update several sensor values of the Open Vario simulated instance in a single request
+
+            @param sensors: Sensors to update
+            @type sensors: [ (int, int or float or bool or string, SimuSensorValueType) ]
+
+            @return: True if all the sensor updates have succeed, None if no response received
+            @rtype: bool
+        '''
+
+        update_succeed = None
+        self.__prepare_wait("update_sensors")
+        ret = self.__simu_protocol.update_sensors(sensors)
+        if ret:
+            ret = self.__wait_response()
+            if ret:
+                update_succeed = self.__response
+        else:
+            self.__cancel_wait()
+
+        return update_succeed
+
+    def update_sensor_value(self, sensor, value):
+        '''
+            Update a sensor value of the Open Vario simulated instance, the value type being
+            the one of the sensor list. The value is checked before sending the request
+
+            @param sensor: Id or name of the sensor
+            @type sensor: int or string
+            @param value: Value of the sensor, its type must match the value type of the sensor
+            @type value: int or float or bool or string
+
+            @return: True if the sensor update has succeed, False if it has failed or if the value
+                     has been rejected before sending, None if no response received
+            @rtype: bool
+        '''
+
+        update_succeed = None
+        self.__prepare_wait("update_sensor")
+        ret = self.__simu_protocol.update_sensor_value(sensor, value)
+        if ret:
+            ret = self.__wait_response()
+            if ret:
+                update_succeed = self.__response
+        else:
+            self.__cancel_wait()
+            if self.__is_connected:
+                update_succeed = False
+
+        return update_succeed
+
+    def update_sensor_values(self, values, batch=False):
+        '''
+            Update several sensor values of the Open Vario simulated instance, with a request per value
+            unless the batch is requested, the value types being the ones of the sensor list. The values
+            are checked before sending the requests
+
+            @param values: Sensors to update
+            @type values: [ (int or string, int or float or bool or string) ]
+            @param batch: Indicates if the values are sent in a single update_sensors request, which needs a
+                          firmware handling it, otherwise an update_sensor request is sent per value
+            @type batch: bool
+
+            @return: True if all the sensor updates have succeed, False if an update has failed or if
+                     a value has been rejected before sending, None if no response received
+            @rtype: bool
+        '''
+
+        update_succeed = None
+        self.__prepare_wait("update_sensors")
+        ret = self.__simu_protocol.update_sensor_values(values, batch=batch)
+        if ret:
+            ret = self.__wait_response()
+            if ret:
+                update_succeed = self.__response
+        else:
+            self.__cancel_wait()
+            if self.__is_connected:
+                update_succeed = False
+
+        return update_succeed
+
+    def read_config(self, group_id, value_id):
+        '''
+            Read a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+
+            @return: Configuration value on success, False if the value does not exist,
+                     None if no response received
+            @rtype: SimuConfigValue or bool
+        '''
+
+        value = None
+        self.__prepare_wait("read_config")
+        ret = self.__simu_protocol.read_config(group_id, value_id)
+        if ret:
+            ret = self.__wait_response()
+            if ret:
+                value = self.__response
+        else:
+            self.__cancel_wait()
+
+        return value
+
+    def write_config(self, group_id, value_id, value, value_type):
+        '''
+            Write a configuration value of the Open Vario simulated instance
+
+            @param group_id: Group ID
+            @type group_id: int
+            @param value_id: Value ID
+            @type value_id: int
+            @param value: Configuration value
+            @type value: int or float or bool or string
+            @param value_type: Value type of the configuration value
+            @type value_type: SimuSensorValueType
+
+            @return: True if the configuration value has been written, False if the write has failed or
+                     if the value has been rejected before sending, None if no response received
+            @rtype: bool
+        '''
+
+        write_succeed = None
+        self.__prepare_wait("write_config")
+        ret = self.__simu_protocol.write_config(group_id, value_id, value, value_type)
+        if ret:
+            ret = self.__wait_response()
+            if ret:
+                write_succeed = self.__response
+        else:
+            self.__cancel_wait()
+            if self.__is_connected:
+                write_succeed = False
+
+        return write_succeed
+
+    def dump_config(self):
+        '''
+            Read all the configuration values of the Open Vario simulated instance
+
+            @return: Configuration values on success, None if a response has not been received
+            @rtype: [ SimuConfigValue ]
+        '''
+
+        values = None
+        self.__prepare_wait("dump_config")
+        ret = self.__simu_protocol.dump_config()
+        if ret:
+
+            # The dump is made of an unknown number of exchanges, it is ended by the
+            # protocol itself since each read is either answered or timed out
+            ret = self.__wait_response(float("inf"))
+            if ret:
+                values = self.__response
+        else:
+            self.__cancel_wait()
+
+        return values
+
+    def restore_config(self, values):
+        '''
+            Apply configuration values to the Open Vario simulated instance, only the values
+            which differ from the values of the instance are written
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+
+            @return: Written values on success ([] if the configuration was already up to date),
+                     False if a value is not known by the instance or a write has failed,
+                     None if a response has not been received or a read has been sent again
+            @rtype: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        writes = None
+        self.__prepare_wait("restore_config")
+        ret = self.__simu_protocol.restore_config(values)
+        if ret:
+
+            # Ended by the protocol itself as the dump
+            ret = self.__wait_response(float("inf"))
+            if ret:
+                writes = self.__response
+        else:
+            self.__cancel_wait()
+
+        return writes
+
 
     def on_connect(self, success):
         '''
@@ -169,10 +411,8 @@ class SimuSyncProtocol(SimuProtocolListener):
             @type success: bool
         '''
 
-        if self.__response == "connect":
-            self.__is_connected = success
-            self.__response = success
-            self.__response_ready = True
+        self.__is_connected = success
+        self.__signal_response("connect", success)
 
         return
 
@@ -181,6 +421,9 @@ class SimuSyncProtocol(SimuProtocolListener):
             Called when the connection has been closed
         '''
         self.__is_connected = False
+
+        # Wake up any caller still waiting for a response
+        self.__signal_response(self.__awaited_response, None)
         return
 
     def on_sensors_list(self, sensors):
@@ -188,12 +431,10 @@ class SimuSyncProtocol(SimuProtocolListener):
             Called at the end of the sensors list exchange
 
             @param sensors: List of sensors on success, None if no response received
-            @type sensors: [ (int, string, SimuSensorType, SimuSensorValueType) ]
+            @type sensors: [ SimuSensor ]
         '''
 
-        if self.__response == "get_sensors_list":
-            self.__response = sensors
-            self.__response_ready = True
+        self.__signal_response("get_sensors_list", sensors)
 
         return
 
@@ -205,9 +446,70 @@ class SimuSyncProtocol(SimuProtocolListener):
             @type success: bool
         '''
         
-        if self.__response == "update_sensor":
-            self.__response = success
-            self.__response_ready = True
+        self.__signal_response("update_sensor", success)
+
+        return
+
+    def on_update_sensors(self, success):
+        '''
+            Called at the end of the sensors update exchange
+
+            @param success: Indicates if all the sensor updates have succeed, None if no response received
+            @type success: bool
+        '''
+
+        self.__signal_response("update_sensors", success)
+
+        return
+
+    def on_config_read(self, value):
+        '''
+            Called at the end of the configuration value read exchange
+
+            @param value: Configuration value on success, False if the value does not exist,
+                          None if no response received
+            @type value: SimuConfigValue or bool
+        '''
+
+        self.__signal_response("read_config", value)
+
+        return
+
+    def on_config_write(self, success):
+        '''
+            Called at the end of the configuration value write exchange
+
+            @param success: Indicates if the configuration value has been written, None if no response received
+            @type success: bool
+        '''
+
+        self.__signal_response("write_config", success)
+
+        return
+
+    def on_config_dump(self, values):
+        '''
+            Called at the end of the configuration dump
+
+            @param values: Configuration values on success, None if a response has not been received
+            @type values: [ SimuConfigValue ]
+        '''
+
+        self.__signal_response("dump_config", values)
+
+        return
+
+    def on_config_restore(self, writes):
+        '''
+            Called at the end of the configuration restore
+
+            @param writes: Written values on success ([] if the configuration was already up to date),
+                           False if a value is not known by the instance or a write has failed,
+                           None if a response has not been received or a read has been sent again
+            @type writes: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        self.__signal_response("restore_config", writes)
 
         return
 
@@ -223,25 +525,88 @@ class SimuSyncProtocol(SimuProtocolListener):
         self.__listener.on_value(notif_type, notif_values)
         return
 
-    def __wait_response(self, response):
+    def on_notification(self, values):
         '''
-            Wait for a response from the simulator
+            Called when values have been received
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+        self.__listener.on_notification(values)
+        return
+
+    def __prepare_wait(self, response):
+        '''
+            Arm the wait for a response, must be called before the request is sent
+            so that a response received immediately is not missed
 
             @param response: Expected response
             @type response: string
+        '''
+
+        self.__response_lock.acquire()
+        self.__awaited_response = response
+        self.__response = None
+        self.__response_event.clear()
+        self.__response_lock.release()
+
+        return
+
+    def __cancel_wait(self):
+        '''
+            Cancel the wait for a response
+        '''
+
+        self.__response_lock.acquire()
+        self.__awaited_response = None
+        self.__response_lock.release()
+
+        return
+
+    def __signal_response(self, response, value):
+        '''
+            Complete the wait for a response if it is the awaited one
+
+            @param response: Received response
+            @type response: string
+            @param value: Value of the response
+            @type value: object
+        '''
+
+        self.__response_lock.acquire()
+        if (not (response == None)) and (self.__awaited_response == response):
+            self.__awaited_response = None
+            self.__response = value
+            self.__response_event.set()
+        self.__response_lock.release()
+
+        return
+
+    def __wait_response(self, timeout=None):
+        '''
+            Wait for the awaited response from the simulator
+
+            @param timeout: Maximum time to wait in seconds, None to use the response timeout
+            @type timeout: float
 
             @return: True if the response has been received, False otherwise
             @rtype: bool
         '''
         
-        timeout = 0
-        self.__response = response
-        self.__response_ready = False
-        while ((self.__response_ready == False) and (timeout != 1)):
-            timeout += 0.1
-            time.sleep(0.1)
+        if timeout == None:
+            timeout = self.__timeout
+        deadline = monotonic() + timeout
+        remaining = timeout
+        while (not self.__response_event.is_set()) and (remaining > 0):
+            self.__response_event.wait(remaining)
+            remaining = deadline - monotonic()
+
+        self.__response_lock.acquire()
+        ret = self.__response_event.is_set()
+        self.__awaited_response = None
+        self.__response_lock.release()
 
-        return self.__response_ready
+        return ret
 
 
 
@@ -250,6 +615,17 @@ class SimuSyncProtocolListener(object):
         Simulator synchronous protocol listener
     '''
 
+    def on_notification(self, values):
+        '''
+            Called when values have been received, calls on_value with the values
+            as a dictionary unless overridden
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+        self.on_value(values.TYPE, values.to_dict())
+        return
+
     def on_value(self, notif_type, notif_values):
         '''
             Called when a value has been received
@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+from array import array
+from bisect import bisect_left, bisect_right
+from threading import Lock
+from com.simu_values import SIMU_VALUES_TYPES
+from com.simu_time import monotonic
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuTelemetryTable(object):
+    '''
+        Received values of a single notification type stored as typed columns,
+        one column per value plus a column of receive timestamps. The number of rows
+        can be bounded for an endless ingestion
+    '''
+
+    def __init__(self, values_type, capacity=1024, max_count=None):
+        '''
+            Constructor
+
+            @param values_type: Type of the stored values
+            @type values_type: SimuValues class
+            @param capacity: Number of rows allocated up front, the columns grow by doubling
+            @type capacity: int
+            @param max_count: Maximum number of rows, the oldest half of the rows being dropped
+                              when it is reached, None for no limit
+            @type max_count: int
+        '''
+
+        self.__values_type = values_type
+        '''
+            Type of the stored values
+        '''
+        if not (max_count == None):
+            max_count = max(2, max_count)
+            capacity = min(capacity, max_count)
+        self.__max_count = max_count
+        '''
+            Maximum number of rows, None for no limit
+        '''
+        self.__count = 0
+        '''
+            Number of stored rows
+        '''
+        self.__timestamps = array("d", [0.]) * max(1, capacity)
+        '''
+            Receive timestamps (monotonic time)
+        '''
+        self.__columns = {}
+        '''
+            Value columns : { field : array }
+        '''
+        for field, typecode in zip(values_type.FIELDS, values_type.TYPECODES):
+            self.__columns[field] = array(typecode, [0]) * len(self.__timestamps)
+
+        return
+
+    def get_values_type(self):
+        '''
+            Get the type of the stored values
+
+            @return: Type of the stored values
+            @rtype: SimuValues class
+        '''
+
+        return self.__values_type
+
+    def get_count(self):
+        '''
+            Get the number of stored rows
+
+            @return: Number of rows
+            @rtype: int
+        '''
+
+        return self.__count
+
+    def append(self, timestamp, values):
+        '''
+            Append a row to the table
+
+            @param timestamp: Receive timestamp (monotonic time), must not be older than the last row
+            @type timestamp: float
+            @param values: Received values
+            @type values: SimuValues
+        '''
+
+        index = self.__count
+        if index == self.__max_count:
+            self.__drop()
+            index = self.__count
+        elif index == len(self.__timestamps):
+            self.__grow()
+
+        self.__timestamps[index] = timestamp
+        for field, column in self.__columns.iteritems():
+            column[index] = getattr(values, field)
+        self.__count = index + 1
+
+        return
+
+    def get_last(self):
+        '''
+            Get the last row of the table
+
+            @return: Receive timestamp and values of the last row, None if the table is empty
+            @rtype: (float, SimuValues)
+        '''
+
+        ret = None
+        index = self.__count - 1
+        if index >= 0:
+            values = self.__values_type(*[ self.__columns[field][index] for field in self.__values_type.FIELDS ])
+            ret = (self.__timestamps[index], values)
+
+        return ret
+
+    def get_range(self, field, start, end):
+        '''
+            Get the values of a field received in a time range
+
+            @param field: Name of the field
+            @type field: string
+            @param start: Start of the range (monotonic time, included)
+            @type start: float
+            @param end: End of the range (monotonic time, included)
+            @type end: float
+
+            @return: Receive timestamps and values in the range, None if the field does not exist
+            @rtype: (array, array)
+        '''
+
+        ret = None
+        column = self.__columns.get(field)
+        if not (column == None):
+            first, last = self.__find_range(start, end)
+            ret = (self.__timestamps[first:last], column[first:last])
+
+        return ret
+
+    def get_min_max(self, field, start, end):
+        '''
+            Get the minimum and maximum of a field received in a time range
+
+            @param field: Name of the field
+            @type field: string
+            @param start: Start of the range (monotonic time, included)
+            @type start: float
+            @param end: End of the range (monotonic time, included)
+            @type end: float
+
+            @return: Minimum and maximum values, None if the field does not exist
+                     or if no values have been received in the range
+            @rtype: (int or float, int or float)
+        '''
+
+        ret = None
+        column = self.__columns.get(field)
+        if not (column == None):
+            first, last = self.__find_range(start, end)
+            if last > first:
+                values = column[first:last]
+                ret = (min(values), max(values))
+
+        return ret
+
+    def copy(self):
+        '''
+            Copy the stored rows into a new table
+
+            @return: Copy of the table
+            @rtype: SimuTelemetryTable
+        '''
+
+        count = self.__count
+        table = SimuTelemetryTable(self.__values_type, 1, self.__max_count)
+        table.__timestamps = self.__timestamps[:count]
+        table.__columns = dict( (field, column[:count]) for field, column in self.__columns.iteritems() )
+        table.__count = count
+
+        return table
+
+    def __find_range(self, start, end):
+        '''
+            Find the rows received in a time range
+
+            @param start: Start of the range (monotonic time, included)
+            @type start: float
+            @param end: End of the range (monotonic time, included)
+            @type end: float
+
+            @return: Index of the first row and index following the last row
+            @rtype: (int, int)
+        '''
+
+        # Rows are appended in receive order so that the timestamps are sorted
+        first = bisect_left(self.__timestamps, start, 0, self.__count)
+        last = bisect_right(self.__timestamps, end, first, self.__count)
+        return (first, last)
+
+    def __grow(self):
+        '''
+            Double the capacity of the columns
+        '''
+
+        size = len(self.__timestamps)
+        if not (self.__max_count == None):
+            size = min(size, self.__max_count - size)
+        self.__timestamps.extend(array("d", [0.]) * size)
+        for column in self.__columns.itervalues():
+            column.extend(array(column.typecode, [0]) * size)
+
+        return
+
+    def __drop(self):
+        '''
+            Drop the oldest half of the rows, the kept rows are moved in place
+            so that the columns are not reallocated
+        '''
+
+        count = self.__count
+        kept = count // 2
+        first = count - kept
+        self.__timestamps[:kept] = self.__timestamps[first:count]
+        for column in self.__columns.itervalues():
+            column[:kept] = column[first:count]
+        self.__count = kept
+
+        return
+
+
+class SimuTelemetryStore(object):
+    '''
+        In-memory storage of the values notified by an Open Vario simulated instance.
+        Its on_notification method can be called from any thread, typically from the
+        on_notification method of the protocol listener
+    '''
+
+    def __init__(self, capacity=1024, max_count=None):
+        '''
+            Constructor
+
+            @param capacity: Number of rows allocated up front for each notification type
+            @type capacity: int
+            @param max_count: Maximum number of rows for each notification type, the oldest half
+                              of the rows being dropped when it is reached, None for no limit
+            @type max_count: int
+        '''
+
+        self.__capacity = capacity
+        '''
+            Number of rows allocated up front for each notification type
+        '''
+        self.__max_count = max_count
+        '''
+            Maximum number of rows for each notification type, None for no limit
+        '''
+        self.__tables = {}
+        '''
+            Tables by notification type : { string : SimuTelemetryTable }
+        '''
+        self.__lock = Lock()
+        '''
+            Mutex to protect the tables from concurrent accesses
+        '''
+
+        return
+
+    def on_notification(self, values, timestamp=None):
+        '''
+            Store received values
+
+            @param values: Received values
+            @type values: SimuValues
+            @param timestamp: Receive timestamp (monotonic time), None to use the current time
+            @type timestamp: float
+        '''
+
+        if timestamp == None:
+            timestamp = monotonic()
+
+        self.__lock.acquire()
+        table = self.__tables.get(values.TYPE)
+        if table == None:
+            table = SimuTelemetryTable(values.__class__, self.__capacity, self.__max_count)
+            self.__tables[values.TYPE] = table
+        table.append(timestamp, values)
+        self.__lock.release()
+
+        return
+
+    def get_count(self, notif_type):
+        '''
+            Get the number of stored values of a notification type
+
+            @param notif_type: Notification type (pressure, temperature, altitude, vario, navigation)
+            @type notif_type: string
+
+            @return: Number of stored values
+            @rtype: int
+        '''
+
+        ret = 0
+        self.__lock.acquire()
+        table = self.__tables.get(notif_type)
+        if not (table == None):
+            ret = table.get_count()
+        self.__lock.release()
+
+        return ret
+
+    def get_last(self, notif_type):
+        '''
+            Get the last values received for a notification type
+
+            @param notif_type: Notification type (pressure, temperature, altitude, vario, navigation)
+            @type notif_type: string
+
+            @return: Receive timestamp and values, None if no values have been received
+            @rtype: (float, SimuValues)
+        '''
+
+        ret = None
+        self.__lock.acquire()
+        table = self.__tables.get(notif_type)
+        if not (table == None):
+            ret = table.get_last()
+        self.__lock.release()
+
+        return ret
+
+    def get_range(self, notif_type, field, start, end):
+        '''
+            Get the values of a field received in a time range
+
+            @param notif_type: Notification type (pressure, temperature, altitude, vario, navigation)
+            @type notif_type: string
+            @param field: Name of the field (see SimuValues.FIELDS)
+            @type field: string
+            @param start: Start of the range (monotonic time, included)
+            @type start: float
+            @param end: End of the range (monotonic time, included)
+            @type end: float
+
+            @return: Receive timestamps and values in the range, None if the field is unknown
+            @rtype: (array, array)
+        '''
+
+        ret = None
+        self.__lock.acquire()
+        table = self.__tables.get(notif_type)
+        if not (table == None):
+            ret = table.get_range(field, start, end)
+        else:
+            typecode = self.__get_typecode(notif_type, field)
+            if not (typecode == None):
+                ret = (array("d"), array(typecode))
+        self.__lock.release()
+
+        return ret
+
+    def get_window(self, notif_type, field, duration, now=None):
+        '''
+            Get the values of a field received during the last seconds
+
+            @param notif_type: Notification type (pressure, temperature, altitude, vario, navigation)
+            @type notif_type: string
+            @param field: Name of the field (see SimuValues.FIELDS)
+            @type field: string
+            @param duration: Duration of the window (seconds)
+            @type duration: float
+            @param now: End of the window (monotonic time), None to use the current time
+            @type now: float
+
+            @return: Receive timestamps and values in the window, None if the field is unknown
+            @rtype: (array, array)
+        '''
+
+        if now == None:
+            now = monotonic()
+        return self.get_range(notif_type, field, now - duration, now)
+
+    def get_min_max(self, notif_type, field, duration, now=None):
+        '''
+            Get the minimum and maximum of a field received during the last seconds
+
+            @param notif_type: Notification type (pressure, temperature, altitude, vario, navigation)
+            @type notif_type: string
+            @param field: Name of the field (see SimuValues.FIELDS)
+            @type field: string
+            @param duration: Duration of the window (seconds)
+            @type duration: float
+            @param now: End of the window (monotonic time), None to use the current time
+            @type now: float
+
+            @return: Minimum and maximum values, None if the field is unknown or if no values
+                     have been received in the window
+            @rtype: (int or float, int or float)
+        '''
+
+        if now == None:
+            now = monotonic()
+
+        ret = None
+        self.__lock.acquire()
+        table = self.__tables.get(notif_type)
+        if not (table == None):
+            ret = table.get_min_max(field, now - duration, now)
+        self.__lock.release()
+
+        return ret
+
+    def snapshot(self):
+        '''
+            Copy the stored values, the copy is not modified by the values received afterwards
+            so that it can be queried while the ingestion goes on
+
+            @return: Copy of the store
+            @rtype: SimuTelemetryStore
+        '''
+
+        store = SimuTelemetryStore(self.__capacity, self.__max_count)
+        self.__lock.acquire()
+        for notif_type, table in self.__tables.iteritems():
+            store.__tables[notif_type] = table.copy()
+        self.__lock.release()
+
+        return store
+
+    def clear(self):
+        '''
+            Remove all the stored values
+        '''
+
+        self.__lock.acquire()
+        self.__tables = {}
+        self.__lock.release()
+
+        return
+
+    def __get_typecode(self, notif_type, field):
+        '''
+            Get the array type code of a field of a notification type
+
+            @param notif_type: Notification type
+            @type notif_type: string
+            @param field: Name of the field
+            @type field: string
+
+            @return: Type code, None if the field is unknown
+            @rtype: string
+        '''
+
+        ret = None
+        values_type = SIMU_VALUES_TYPES.get(notif_type)
+        if (not (values_type == None)) and (field in values_type.FIELDS):
+            ret = values_type.TYPECODES[values_type.FIELDS.index(field)]
+
+        return ret
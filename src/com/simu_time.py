@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import ctypes
+import ctypes.util
+import os
+import sys
+import time
+
+
+####################################################
+#### Data types
+
+CLOCK_MONOTONIC = 1
+'''
+    Identifier of the monotonic clock of clock_gettime on Linux
+'''
+
+CLOCK_PROCESS_CPUTIME_ID = 2
+'''
+    Identifier of the CPU time clock of the process of clock_gettime on Linux
+'''
+
+OS_TIMES_RESOLUTION = 1. / 64
+'''
+    Resolution of os.times, at worst the clock tick of Windows (seconds)
+'''
+
+
+class timespec(ctypes.Structure):
+    '''
+        Time structure of clock_gettime
+    '''
+
+    _fields_ = [ ("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long) ]
+
+
+####################################################
+#### Functions
+
+
+def _posix_clock(clock_id):
+    '''
+        Build a clock on clock_gettime
+
+        @param clock_id: Identifier of the clock
+        @type clock_id: int
+
+        @return: Clock and its resolution (seconds), None if clock_gettime is not available
+        @rtype: (function() -> float, float)
+    '''
+
+    ret = None
+    for name in ("rt", "c"):
+        path = ctypes.util.find_library(name)
+        if not (path == None):
+            try:
+                library = ctypes.CDLL(path, use_errno=True)
+                clock_gettime = library.clock_gettime
+                clock_getres = library.clock_getres
+            except (OSError, AttributeError):
+                continue
+            for function in (clock_gettime, clock_getres):
+                function.argtypes = [ ctypes.c_int, ctypes.POINTER(timespec) ]
+                function.restype = ctypes.c_int
+
+            # The time is read into a structure per call, the clock being read from several threads
+            def posix_clock():
+                value = timespec()
+                if not (clock_gettime(clock_id, ctypes.byref(value)) == 0):
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno))
+                return value.tv_sec + value.tv_nsec * 1e-9
+
+            resolution = timespec()
+            if not (clock_getres(clock_id, ctypes.byref(resolution)) == 0):
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno))
+            ret = (posix_clock, resolution.tv_sec + resolution.tv_nsec * 1e-9)
+            break
+
+    return ret
+
+
+def _darwin_monotonic():
+    '''
+        Build a monotonic clock on mach_absolute_time
+
+        @return: Monotonic clock
+        @rtype: function() -> float
+    '''
+
+    class mach_timebase_info_data(ctypes.Structure):
+        _fields_ = [ ("numer", ctypes.c_uint32), ("denom", ctypes.c_uint32) ]
+
+    libc = ctypes.CDLL("/usr/lib/libc.dylib")
+    mach_absolute_time = libc.mach_absolute_time
+    mach_absolute_time.restype = ctypes.c_uint64
+    timebase = mach_timebase_info_data()
+    libc.mach_timebase_info(ctypes.byref(timebase))
+    ratio = float(timebase.numer) / timebase.denom * 1e-9
+
+    return lambda: mach_absolute_time() * ratio
+
+
+def _windows_monotonic():
+    '''
+        Build a monotonic clock on QueryPerformanceCounter
+
+        @return: Monotonic clock
+        @rtype: function() -> float
+    '''
+
+    kernel32 = ctypes.windll.kernel32
+    frequency = ctypes.c_int64()
+    kernel32.QueryPerformanceFrequency(ctypes.byref(frequency))
+    period = 1. / frequency.value
+
+    def windows_monotonic():
+        counter = ctypes.c_int64()
+        kernel32.QueryPerformanceCounter(ctypes.byref(counter))
+        return counter.value * period
+
+    return windows_monotonic
+
+
+def _get_monotonic():
+    '''
+        Select the monotonic clock of the platform : time.monotonic on Python 3, the monotonic
+        package if installed, then the system monotonic clock through ctypes
+
+        @return: Monotonic clock and indicates if it is really monotonic, the wall clock
+                 being used when no monotonic clock is available
+        @rtype: (function() -> float, bool)
+    '''
+
+    ret = None
+    if hasattr(time, "monotonic"):
+        ret = time.monotonic
+    else:
+        try:
+            from monotonic import monotonic as package_monotonic
+            ret = package_monotonic
+        except (ImportError, RuntimeError):
+            try:
+                if sys.platform == "darwin":
+                    ret = _darwin_monotonic()
+                elif sys.platform.startswith("win"):
+                    ret = _windows_monotonic()
+                else:
+                    ret = _posix_clock(CLOCK_MONOTONIC)
+                    if not (ret == None):
+                        ret = ret[0]
+                if not (ret == None):
+                    ret()
+            except (OSError, AttributeError, ValueError):
+                ret = None
+
+    if ret == None:
+        ret = (time.time, False)
+    else:
+        ret = (ret, True)
+
+    return ret
+
+
+def _get_process_time():
+    '''
+        Select the CPU time clock of the process : time.process_time on Python 3,
+        clock_gettime(CLOCK_PROCESS_CPUTIME_ID) through ctypes, then os.times
+
+        @return: CPU time clock and its resolution (seconds)
+        @rtype: (function() -> float, float)
+    '''
+
+    ret = None
+    if hasattr(time, "process_time"):
+        ret = (time.process_time, time.get_clock_info("process_time").resolution)
+    elif not (sys.platform == "darwin" or sys.platform.startswith("win")):
+        try:
+            ret = _posix_clock(CLOCK_PROCESS_CPUTIME_ID)
+            if not (ret == None):
+                ret[0]()
+        except (OSError, AttributeError, ValueError):
+            ret = None
+
+    if ret == None:
+        ret = (lambda: sum(os.times()[:2]), OS_TIMES_RESOLUTION)
+
+    return ret
+
+
+monotonic, MONOTONIC_AVAILABLE = _get_monotonic()
+'''
+    Monotonic clock : monotonic() returns a time in seconds which only differences are meaningful,
+    MONOTONIC_AVAILABLE indicates if it is a real monotonic clock and not the wall clock
+'''
+
+process_time, PROCESS_TIME_RESOLUTION = _get_process_time()
+'''
+    CPU time clock of the process, all threads included : process_time() returns a time in seconds
+    which only differences are meaningful, PROCESS_TIME_RESOLUTION is its resolution in seconds
+'''
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuValues(object):
+    '''
+        Values notified by the Open Vario simulated instance
+    '''
+
+    __slots__ = ()
+
+    TYPE = ""
+    '''
+        Notification type
+    '''
+
+    FIELDS = ()
+    '''
+        Names of the values
+    '''
+
+    TYPECODES = ()
+    '''
+        array.array type codes able to store each value
+    '''
+
+    def to_dict(self):
+        '''
+            Convert the values to the dictionary form of SimuProtocolListener.on_value
+
+            @return: Values by name
+            @rtype: {string:value}
+        '''
+
+        return dict( (field, getattr(self, field)) for field in self.FIELDS )
+
+    def __repr__(self):
+        '''
+            Printable representation of the values
+        '''
+
+        return self.__class__.__name__ + "(" + ", ".join( field + "=" + repr(getattr(self, field)) for field in self.FIELDS ) + ")"
+
+
+class SimuPressureValues(SimuValues):
+    '''
+        Pressure values (0.01 mbar)
+    '''
+
+    __slots__ = ("pressure", "min_pressure", "max_pressure")
+
+    TYPE = "pressure"
+    FIELDS = __slots__
+    TYPECODES = ("I", "I", "I")
+
+    def __init__(self, pressure, min_pressure, max_pressure):
+        '''
+            Constructor
+
+            @param pressure: Current pressure (0.01 mbar)
+            @type pressure: int
+            @param min_pressure: Minimum pressure (0.01 mbar)
+            @type min_pressure: int
+            @param max_pressure: Maximum pressure (0.01 mbar)
+            @type max_pressure: int
+        '''
+
+        self.pressure = pressure
+        self.min_pressure = min_pressure
+        self.max_pressure = max_pressure
+
+        return
+
+    @classmethod
+    def from_message(cls, msg):
+        '''
+            Build the values from a notification message
+
+            @param msg: Notification message
+            @type msg: PressureNotification
+
+            @return: Values of the notification
+            @rtype: SimuPressureValues
+        '''
+
+        return cls(msg.pressure, msg.min_pressure, msg.max_pressure)
+
+
+class SimuTemperatureValues(SimuValues):
+    '''
+        Temperature values (0.1 °C)
+    '''
+
+    __slots__ = ("temperature", "min_temperature", "max_temperature")
+
+    TYPE = "temperature"
+    FIELDS = __slots__
+    TYPECODES = ("i", "i", "i")
+
+    def __init__(self, temperature, min_temperature, max_temperature):
+        '''
+            Constructor
+
+            @param temperature: Current temperature (0.1 °C)
+            @type temperature: int
+            @param min_temperature: Minimum temperature (0.1 °C)
+            @type min_temperature: int
+            @param max_temperature: Maximum temperature (0.1 °C)
+            @type max_temperature: int
+        '''
+
+        self.temperature = temperature
+        self.min_temperature = min_temperature
+        self.max_temperature = max_temperature
+
+        return
+
+    @classmethod
+    def from_message(cls, msg):
+        '''
+            Build the values from a notification message
+
+            @param msg: Notification message
+            @type msg: TemperatureNotification
+
+            @return: Values of the notification
+            @rtype: SimuTemperatureValues
+        '''
+
+        return cls(msg.temperature, msg.min_temperature, msg.max_temperature)
+
+
+class SimuAltitudeValues(SimuValues):
+    '''
+        Altitude values (1 m)
+    '''
+
+    __slots__ = ("altitude", "min_altitude", "max_altitude", "altitude_1", "altitude_2", "altitude_3", "altitude_4")
+
+    TYPE = "altitude"
+    FIELDS = __slots__
+    TYPECODES = ("i", "i", "i", "i", "i", "i", "i")
+
+    def __init__(self, altitude, min_altitude, max_altitude, altitude_1, altitude_2, altitude_3, altitude_4):
+        '''
+            Constructor
+
+            @param altitude: Main altitude (1 m)
+            @type altitude: int
+            @param min_altitude: Minimum altitude (1 m)
+            @type min_altitude: int
+            @param max_altitude: Maximum altitude (1 m)
+            @type max_altitude: int
+            @param altitude_1: Altitude 1 (1 m)
+            @type altitude_1: int
+            @param altitude_2: Altitude 2 (1 m)
+            @type altitude_2: int
+            @param altitude_3: Altitude 3 (1 m)
+            @type altitude_3: int
+            @param altitude_4: Altitude 4 (1 m)
+            @type altitude_4: int
+        '''
+
+        self.altitude = altitude
+        self.min_altitude = min_altitude
+        self.max_altitude = max_altitude
+        self.altitude_1 = altitude_1
+        self.altitude_2 = altitude_2
+        self.altitude_3 = altitude_3
+        self.altitude_4 = altitude_4
+
+        return
+
+    @classmethod
+    def from_message(cls, msg):
+        '''
+            Build the values from a notification message
+
+            @param msg: Notification message
+            @type msg: AltitudeNotification
+
+            @return: Values of the notification
+            @rtype: SimuAltitudeValues
+        '''
+
+        return cls(msg.main_altitude, msg.min_altitude, msg.max_altitude,
+                   msg.altitude_1, msg.altitude_2, msg.altitude_3, msg.altitude_4)
+
+
+class SimuVarioValues(SimuValues):
+    '''
+        Vario values (0.1 m/s)
+    '''
+
+    __slots__ = ("vario", "min_vario", "max_vario")
+
+    TYPE = "vario"
+    FIELDS = __slots__
+    TYPECODES = ("i", "i", "i")
+
+    def __init__(self, vario, min_vario, max_vario):
+        '''
+            Constructor
+
+            @param vario: Current vario (0.1 m/s)
+            @type vario: int
+            @param min_vario: Minimum vario (0.1 m/s)
+            @type min_vario: int
+            @param max_vario: Maximum vario (0.1 m/s)
+            @type max_vario: int
+        '''
+
+        self.vario = vario
+        self.min_vario = min_vario
+        self.max_vario = max_vario
+
+        return
+
+    @classmethod
+    def from_message(cls, msg):
+        '''
+            Build the values from a notification message
+
+            @param msg: Notification message
+            @type msg: VarioNotification
+
+            @return: Values of the notification
+            @rtype: SimuVarioValues
+        '''
+
+        return cls(msg.vario, msg.min_vario, msg.max_vario)
+
+
+class SimuNavigationValues(SimuValues):
+    '''
+        Navigation values (speeds in 0.1 m/s, position in °, track angle in 0.1 °)
+    '''
+
+    __slots__ = ("speed", "min_speed", "max_speed", "latitude", "longitude", "track_angle")
+
+    TYPE = "navigation"
+    FIELDS = __slots__
+    TYPECODES = ("i", "i", "i", "d", "d", "I")
+
+    def __init__(self, speed, min_speed, max_speed, latitude, longitude, track_angle):
+        '''
+            Constructor
+
+            @param speed: Current speed (0.1 m/s)
+            @type speed: int
+            @param min_speed: Minimum speed (0.1 m/s)
+            @type min_speed: int
+            @param max_speed: Maximum speed (0.1 m/s)
+            @type max_speed: int
+            @param latitude: Latitude (°)
+            @type latitude: float
+            @param longitude: Longitude (°)
+            @type longitude: float
+            @param track_angle: Track angle (0.1 °)
+            @type track_angle: int
+        '''
+
+        self.speed = speed
+        self.min_speed = min_speed
+        self.max_speed = max_speed
+        self.latitude = latitude
+        self.longitude = longitude
+        self.track_angle = track_angle
+
+        return
+
+    @classmethod
+    def from_message(cls, msg):
+        '''
+            Build the values from a notification message
+
+            @param msg: Notification message
+            @type msg: NavigationNotification
+
+            @return: Values of the notification
+            @rtype: SimuNavigationValues
+        '''
+
+        return cls(msg.speed, msg.min_speed, msg.max_speed,
+                   msg.latitude, msg.longitude, msg.track_angle)
+
+
+SIMU_VALUES_TYPES = dict( (values_type.TYPE, values_type) for values_type in
+                          (SimuPressureValues, SimuTemperatureValues, SimuAltitudeValues, SimuVarioValues, SimuNavigationValues) )
+'''
+    Values classes by notification type, the notification type being the name of the field
+    in the SimuNotification message
+'''
@@ -78,6 +78,20 @@ class UdpSocket(object):
 
         return self.__timeout
 
+    def fileno(self):
+        '''
+            Get the file descriptor of the socket
+
+            @return: file descriptor, None if the socket is not opened
+            @rtype: int
+        '''
+
+        ret = None
+        if( self.__socket != None ):
+            ret = self.__socket.fileno()
+
+        return ret
+
     def open(self):
         '''
             Open the socket
@@ -187,3 +201,25 @@ class UdpSocket(object):
                 ret = None
             
         return ret
+
+    def recv_from_into(self, buffer):
+        '''
+            Receive data from the socket into a preallocated buffer, without allocating a new string
+
+            @param buffer: Buffer to fill, must be large enough for the biggest datagram
+            @type buffer: bytearray or memoryview
+
+            @return None if no data is available, size of the received data and IP address otherwise
+            @rtype A tuple (size, (ip_address, port))
+        '''
+
+        ret = None
+        if( self.__socket != None ):
+
+            try:
+                size, addr = self.__socket.recvfrom_into(buffer)
+                ret = (size, addr)
+            except:
+                ret = None
+
+        return ret
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+from com.simu_reactor import SimuReactor
+from com.simu_config_snapshot import SimuConfigSnapshot
+from com.simu_time import monotonic
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class SimuConfigApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        host_port = args.host_port
+        if host_port == None:
+            host_port = args.target_port + args.count
+
+        snapshot = SimuConfigSnapshot()
+        if (args.command == "restore") and (not snapshot.load(args.file)):
+            print "Unable to load the snapshot file " + args.file
+            return
+
+        # Connect to all the instances
+        reactor = SimuReactor()
+        protocols = [ reactor.create_protocol(args.target_ip, args.target_port + index, host_port + index)
+                      for index in range(args.count) ]
+        futures = [ protocol.connect() for protocol in protocols ]
+        start = monotonic()
+        self.__wait(reactor, futures, args.timeout)
+
+        # Start the dumps or the restores of the connected instances
+        for index, protocol in enumerate(protocols):
+            future = futures[index]
+            if (not (future == None)) and future.result():
+                if args.command == "restore":
+                    futures[index] = protocol.restore_config(snapshot.get_values())
+                else:
+                    futures[index] = protocol.dump_config()
+                if futures[index] == None:
+                    print " - " + str(args.target_port + index) + " : could not start"
+            else:
+                print "Unable to connect to " + args.target_ip + ":" + str(args.target_port + index)
+                futures[index] = None
+        self.__wait(reactor, futures, args.timeout)
+        elapsed = monotonic() - start
+
+        # Results
+        for index, future in enumerate(futures):
+            if not (future == None):
+                result = future.result()
+                port = str(args.target_port + index)
+                if args.command == "restore":
+                    if result == None:
+                        print " - " + port + " : no response"
+                    elif result is False:
+                        print " - " + port + " : failed"
+                    else:
+                        print " - " + port + " : " + str(len(result)) + " value(s) written"
+                elif result == None:
+                    print " - " + port + " : no response"
+                elif args.command == "snapshot":
+                    if SimuConfigSnapshot(result).save(args.file):
+                        print " - " + port + " : " + str(len(result)) + " value(s) saved to " + args.file
+                    else:
+                        print "Unable to write the snapshot file " + args.file
+                else:
+                    print " - " + port + " :"
+                    for value in result:
+                        print ("    [" + str(value.group_id) + "." + str(value.value_id) + "] " +
+                               value.group_name + " / " + value.name + " = " + repr(value.value))
+        print " - " + str(round(elapsed, 3)) + " s"
+
+        reactor.close()
+
+        return
+
+    def __wait(self, reactor, futures, timeout):
+        '''
+            Drive the reactor until all the futures are done
+
+            @param reactor: Reactor driving the protocol instances
+            @type reactor: SimuReactor
+            @param futures: Futures to wait for, None for the requests which could not be sent
+            @type futures: [ SimuFuture ]
+            @param timeout: Maximum time to wait (seconds)
+            @type timeout: float
+        '''
+
+        deadline = monotonic() + timeout
+        while (monotonic() < deadline and
+               any( (not (future == None)) and (not future.done()) for future in futures )):
+            reactor.run_once(deadline - monotonic())
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Read, save and restore the configuration of Open Vario simulated instances")
+    parser.add_argument("command", choices=["dump", "snapshot", "restore"],
+                        help="dump : print the configuration, snapshot : save the configuration of the first instance to a file, " +
+                             "restore : apply the configuration of a file to the instances")
+    parser.add_argument("file", nargs="?", default=None, help="Snapshot file")
+    parser.add_argument("--target-ip", default="127.0.0.1", help="IP address of the Open Vario simulated instances")
+    parser.add_argument("--target-port", type=int, default=45678, help="Port of the first Open Vario simulated instance")
+    parser.add_argument("--host-port", type=int, default=None, help="Port of the simulator for the first instance, defaults to the port following the last instance")
+    parser.add_argument("--count", type=int, default=1, help="Number of simulated instances, listening on consecutive ports")
+    parser.add_argument("--timeout", type=float, default=30., help="Maximum duration of the command in seconds")
+
+    args = parser.parse_args()
+    if (not (args.command == "dump")) and (args.file == None):
+        parser.error("a snapshot file is required by the " + args.command + " command")
+    if args.command == "snapshot":
+        args.count = 1
+
+    SimuConfigApp().start(args)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+import time
+from com.simu_fake_instance import SimuFakeInstance
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class SimuFakeInstanceApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        instances = []
+        for index in range(args.count):
+            instance = SimuFakeInstance(args.port + index, notification_period=args.notification_period,
+                                        latency=args.latency, jitter=args.jitter, loss=args.loss,
+                                        reordering=args.reordering, seed=args.seed)
+            if instance.start():
+                instances.append(instance)
+            else:
+                print "Unable to open the port " + str(args.port + index)
+
+        print "Running " + str(len(instances)) + " fake instances..."
+        try:
+            if args.duration == None:
+                while True:
+                    time.sleep(1.)
+            else:
+                time.sleep(args.duration)
+        except KeyboardInterrupt:
+            pass
+
+        for instance in instances:
+            instance.stop()
+            print (" - " + str(instance.requests) + " requests | " +
+                   str(instance.responses) + " responses | " +
+                   str(instance.notifications) + " notifications | " +
+                   str(instance.dropped) + " dropped")
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Emulate Open Vario simulated instances")
+    parser.add_argument("--port", type=int, default=45678, help="Port of the first instance")
+    parser.add_argument("--count", type=int, default=1, help="Number of instances, listening on consecutive ports")
+    parser.add_argument("--notification-period", type=float, default=0.1, help="Period of the notifications in seconds, 0 to disable them")
+    parser.add_argument("--latency", type=float, default=0., help="Delay of the sent datagrams in seconds")
+    parser.add_argument("--jitter", type=float, default=0., help="Maximum random delay added to the latency in seconds")
+    parser.add_argument("--loss", type=float, default=0., help="Probability for a sent datagram to be dropped")
+    parser.add_argument("--reordering", type=float, default=0., help="Probability for a sent datagram to be sent after the following one")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the impairments random generator")
+    parser.add_argument("--duration", type=float, default=None, help="Running time in seconds")
+
+    SimuFakeInstanceApp().start(parser.parse_args())
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+from com.simu_protocol import SimuSensorValueType
+from com.simu_fleet import SimuFleet, SimuFleetScenario
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class TriangleWaveScenario(SimuFleetScenario):
+    '''
+        Baro and temperature triangle waves of the single instance simulator
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__temp_sensor_value = -200
+        self.__temp_sensor_step = 25
+
+        self.__baro_sensor_value = 100000
+        self.__baro_sensor_step = 50
+
+        return
+
+    def get_updates(self, now):
+        '''
+            Called on each fleet period to get the sensor values to send
+
+            @param now: Current monotonic time
+            @type now: float
+
+            @return: Sensors to update
+            @rtype: [ (int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        updates = [ (3, self.__baro_sensor_value, SimuSensorValueType.UINT),
+                    (2, self.__temp_sensor_value, SimuSensorValueType.INT) ]
+
+        self.__baro_sensor_value += self.__baro_sensor_step
+        if ((self.__baro_sensor_value <= 90000) or (self.__baro_sensor_value >= 102000)):
+            self.__baro_sensor_step = -1 * self.__baro_sensor_step
+
+        self.__temp_sensor_value += self.__temp_sensor_step
+        if ((self.__temp_sensor_value < -400) or (self.__temp_sensor_value >= 500)):
+            self.__temp_sensor_step = -1 * self.__temp_sensor_step
+
+        return updates
+
+
+class SimuFleetApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        host_port = args.host_port
+        if host_port == None:
+            host_port = args.target_port + args.count
+
+        if args.shared_socket:
+            fleet = SimuFleet(args.period, host_port=host_port, batch=args.batch)
+        else:
+            fleet = SimuFleet(args.period, batch=args.batch)
+        fleet.add_instances(args.target_ip, args.target_port, host_port, args.count,
+                            lambda index: TriangleWaveScenario())
+
+        print "Simulating " + str(args.count) + " instances..."
+        try:
+            if not fleet.run(args.duration):
+                print "Unable to open the simulator port " + str(host_port)
+        except KeyboardInterrupt:
+            pass
+
+        for instance in fleet.get_instances():
+            print (" - " + str(instance.connections) + " connection(s) | " +
+                   str(instance.updates_succeed) + " succeed | " +
+                   str(instance.updates_failed) + " failed | " +
+                   str(instance.updates_lost) + " lost | " +
+                   str(instance.updates_dropped) + " dropped")
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Drive several Open Vario simulated instances")
+    parser.add_argument("--target-ip", default="127.0.0.1", help="IP address of the Open Vario simulated instances")
+    parser.add_argument("--target-port", type=int, default=45678, help="Port of the first Open Vario simulated instance")
+    parser.add_argument("--host-port", type=int, default=None, help="Port of the simulator for the first instance, defaults to the port following the last instance")
+    parser.add_argument("--count", type=int, default=1, help="Number of simulated instances, listening on consecutive ports")
+    parser.add_argument("--shared-socket", action="store_true", help="Use a single simulator port for all the instances")
+    parser.add_argument("--period", type=float, default=0.25, help="Period of the sensor updates in seconds")
+    parser.add_argument("--duration", type=float, default=None, help="Running time in seconds")
+    parser.add_argument("--batch", action="store_true",
+                        help="Send the values of an update in a single update_sensors request, which needs a firmware handling it")
+
+    SimuFleetApp().start(parser.parse_args())
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+from com.simu_protocol import SimuProtocol, SimuSensorType
+from com.simu_sync_protocol import SimuSyncProtocol, SimuSyncProtocolListener
+from scenario.simu_clock import SimuRealTimeClock, SimuStepClock
+from scenario.simu_igc import SimuIgcTrace
+from scenario.simu_scenario import SimuScenario
+from scenario.simu_scheduler import SimuScheduler
+from com.simu_time import monotonic
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class SimuIgcApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        protocol = SimuProtocol(args.target_ip, args.target_port, args.host_port)
+        sync_protocol = SimuSyncProtocol(protocol)
+        if args.lockstep:
+            clock = SimuStepClock()
+        else:
+            clock = SimuRealTimeClock(args.speed)
+        scheduler = SimuScheduler(lambda values, callback: protocol.update_sensor_values(values, callback, args.batch),
+                                  clock=clock)
+
+        try:
+            for path in args.files:
+
+                # Connect or reconnect if the connection has been lost during the previous flight
+                if not sync_protocol.is_connected():
+                    if (not sync_protocol.connect(SimuSyncProtocolListener())) or (sync_protocol.get_sensors_list() == None):
+                        print "Unable to connect to " + args.target_ip + ":" + str(args.target_port)
+                        break
+
+                # The replay ends with the last fix, a scenario without duration would be endless
+                trace = SimuIgcTrace(path)
+                duration = None
+                if trace.open():
+                    duration = trace.get_duration()
+                if duration == None:
+                    print "Unable to read the flight of " + path
+                    trace.close()
+                    continue
+
+                # Pressure is mandatory, altitude and GNSS are sent when the instance has these sensors
+                scenario = SimuScenario(duration)
+                trace.add_tracks(scenario, { SimuSensorType.PRESSURE : args.rate })
+                trace.add_tracks(scenario, { SimuSensorType.ALTITUDE : args.rate, SimuSensorType.GNSS : args.gnss_rate },
+                                 optional=True)
+                if scenario.start(sync_protocol.get_sensors()):
+                    print "Replaying " + path + " (" + str(trace.get_start_date()) + ", " + str(scenario.get_duration()) + " s)..."
+                    start = monotonic()
+                    scheduler.run(scenario.updates(), sync_protocol.is_connected)
+                    stats = scheduler.get_stats().get_stats()
+                    print (" - " + str(round(monotonic() - start, 3)) + " s | " +
+                           str(stats["sent"]) + " sent | " +
+                           str(stats["succeed"]) + " succeed | " +
+                           str(stats["failed"]) + " failed | " +
+                           str(stats["lost"]) + " lost | " +
+                           str(stats["not_sent"]) + " not sent")
+                else:
+                    print "No pressure sensor"
+                trace.close()
+
+        except KeyboardInterrupt:
+            pass
+
+        sync_protocol.close()
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Replay the flights of IGC files to an Open Vario simulated instance")
+    parser.add_argument("files", nargs="+", help="IGC files to replay, one after the other")
+    parser.add_argument("--target-ip", default="127.0.0.1", help="IP address of the Open Vario simulated instance")
+    parser.add_argument("--target-port", type=int, default=45678, help="Port of the Open Vario simulated instance")
+    parser.add_argument("--host-port", type=int, default=45679, help="Port of the simulator")
+    parser.add_argument("--rate", type=float, default=50., help="Update rate of the pressure and altitude sensors in Hz")
+    parser.add_argument("--gnss-rate", type=float, default=5., help="Update rate of the GNSS sensor in Hz")
+    parser.add_argument("--speed", type=float, default=1., help="Speed of the replay relative to real time")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="Advance the replay as soon as the previous updates are acknowledged instead of following the real time")
+    parser.add_argument("--batch", action="store_true",
+                        help="Send the values of an update in a single update_sensors request, which needs a firmware handling it")
+
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("the speed must be positive")
+
+    SimuIgcApp().start(args)
@@ -24,9 +24,15 @@ along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
 
 ####################################################
 #### Imports
-import time
-from com.simu_protocol import SimuProtocol, SimuProtocolListener, SimuSensorValueType
+import argparse
+from com.simu_protocol import SimuProtocol, SimuProtocolListener, SimuSensorType
 from com.simu_sync_protocol import SimuSyncProtocol, SimuSyncProtocolListener 
+from com.simu_telemetry import SimuTelemetryStore
+from com.simu_values import SIMU_VALUES_TYPES
+from scenario.simu_clock import SimuRealTimeClock, SimuStepClock
+from scenario.simu_flight_model import SimuFlightModel
+from scenario.simu_scenario import SimuScenario
+from scenario.simu_scheduler import SimuScheduler
 
 ####################################################
 #### Data types
@@ -38,14 +44,37 @@ from com.simu_sync_protocol import SimuSyncProtocol, SimuSyncProtocolListener
 
 class SimuApp(SimuProtocolListener):
 
-    def start(self):
+    def start(self, args):
         '''
             Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
         '''
 
+        # Only the last notified values are kept, for the statistics
+        self.__telemetry = SimuTelemetryStore(max_count=4096)
         self.__protocol = SimuProtocol("127.0.0.1", 45678, 45679)
         self.__sync_protocol = SimuSyncProtocol(self.__protocol)
 
+        # Simulated flight : baro updated at 50Hz and temperature updated at 4Hz,
+        # altitude and GNSS updated when the instance has these sensors
+        scenario = SimuScenario()
+        flight = SimuFlightModel()
+        flight.add_tracks(scenario, { SimuSensorType.PRESSURE : 50., SimuSensorType.TEMPERATURE : 4. })
+        flight.add_tracks(scenario, { SimuSensorType.ALTITUDE : 10., SimuSensorType.GNSS : 5. }, optional=True)
+
+        # The updates are sent on their deadline without waiting for the responses,
+        # unless the clock is advanced in lock-step with the simulated instance
+        if args.lockstep:
+            clock = SimuStepClock()
+        else:
+            clock = SimuRealTimeClock(args.speed)
+        # The values of an update are sent in a single request if the firmware handles it
+        scheduler = SimuScheduler(lambda values, callback: self.__protocol.update_sensor_values(values, callback, args.batch),
+                                  clock=clock)
+        stats = scheduler.get_stats
+
         while not self.__sync_protocol.is_connected():
 
             print "Connect..."
@@ -62,40 +91,52 @@ class SimuApp(SimuProtocolListener):
                 for sensor in sensors:
                     print " - " + str(sensor[0]) + " | " + sensor[1] + " | " + str(sensor[2]) + " | " + str(sensor[3])
 
+                # Resolve the simulated sensors from their type
+                if not scenario.start(self.__sync_protocol.get_sensors()):
+                    print "No pressure or temperature sensor"
+                    self.__sync_protocol.close()
+                    break
+
                 print "Update sensors"
 
-                temp_sensor_value = -200
-                temp_sensor_step = 25
-
-                baro_sensor_value = 100000
-                baro_sensor_step = 50
-
-                while self.__sync_protocol.is_connected():
-                    time.sleep(0.25)
-                    
-                    ret = self.__sync_protocol.update_sensor(3, baro_sensor_value, SimuSensorValueType.UINT)
-                    if not (ret == None):
-                        if not ret:
-                            print "Update failed"
-                    else:
-                        print "No response"
-                        self.__sync_protocol.close()
-
-                    baro_sensor_value += baro_sensor_step
-                    if ((baro_sensor_value <= 90000) or (baro_sensor_value >= 102000)):
-                        baro_sensor_step = -1 * baro_sensor_step
-
-                    ret = self.__sync_protocol.update_sensor(2, temp_sensor_value, SimuSensorValueType.INT)
-                    if not (ret == None):
-                        if not ret:
-                            print "Update failed"
-                    else:
-                        print "No response"
-                        self.__sync_protocol.close()
-                        
-                    temp_sensor_value += temp_sensor_step
-                    if ((temp_sensor_value < -400) or (temp_sensor_value >= 500)):
-                        temp_sensor_step = -1 * temp_sensor_step
+                scheduler.run(scenario.updates(),
+                              lambda: self.__sync_protocol.is_connected() and (stats().get_count("lost") == 0))
+                if stats().get_count("lost") > 0:
+                    print "No response"
+                    self.__sync_protocol.close()
+                print "Update statistics : " + str(stats().get_stats())
+                self.__print_telemetry(60.)
+
+        return
+
+    def __print_telemetry(self, duration):
+        '''
+            Print the range of the main notified values during the last seconds
+
+            @param duration: Duration of the range (seconds)
+            @type duration: float
+        '''
+
+        print "Notified values during the last " + str(duration) + " s :"
+        for notif_type in sorted(SIMU_VALUES_TYPES):
+            field = SIMU_VALUES_TYPES[notif_type].FIELDS[0]
+            min_max = self.__telemetry.get_min_max(notif_type, field, duration)
+            if not (min_max == None):
+                print (" - " + notif_type + " | last = " + str(getattr(self.__telemetry.get_last(notif_type)[1], field)) +
+                       " | min = " + str(min_max[0]) + " | max = " + str(min_max[1]))
+
+        return
+
+    def on_notification(self, values):
+        '''
+            Called when values have been received
+
+            @param values: Received values
+            @type values: SimuValues
+        '''
+
+        self.__telemetry.on_notification(values)
+        SimuProtocolListener.on_notification(self, values)
 
         return
 
@@ -116,7 +157,18 @@ class SimuApp(SimuProtocolListener):
 
 if  __name__ == '__main__':
 
-    SimuApp().start()
+    parser = argparse.ArgumentParser(description="Feed simulated sensor values to an Open Vario simulated instance")
+    parser.add_argument("--speed", type=float, default=1., help="Speed of the simulation relative to real time")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="Advance the simulation as soon as the previous updates are acknowledged instead of following the real time")
+    parser.add_argument("--batch", action="store_true",
+                        help="Send the values of an update in a single update_sensors request, which needs a firmware handling it")
+
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("the speed must be positive")
+
+    SimuApp().start(args)
 
        
 
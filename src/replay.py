@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import argparse
+from com.simu_capture import SimuCaptureRecorder, SimuCaptureReplayer
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Software entry point
+
+
+class SimuReplayApp(object):
+
+    def start(self, args):
+        '''
+            Start the application
+
+            @param args: Command line arguments
+            @type args: argparse.Namespace
+        '''
+
+        recorder = None
+        if not (args.capture == None):
+            recorder = SimuCaptureRecorder()
+            if not recorder.open(args.capture):
+                print "Unable to create the capture file " + args.capture
+                return
+
+        speed = args.speed
+        if speed <= 0:
+            speed = None
+
+        print "Replaying " + args.file + "..."
+        replayer = SimuCaptureReplayer(args.target_ip, args.target_port, args.host_port)
+        try:
+            if not replayer.replay(args.file, speed, recorder):
+                print "Unable to replay " + args.file
+        except KeyboardInterrupt:
+            pass
+
+        if not (recorder == None):
+            recorder.close()
+
+        print " - " + str(replayer.get_sent_count()) + " sent | " + str(replayer.get_received_count()) + " received"
+
+        return
+
+
+if  __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Replay the requests of a capture file to an Open Vario simulated instance")
+    parser.add_argument("file", help="Capture file to replay")
+    parser.add_argument("--target-ip", default="127.0.0.1", help="IP address of the Open Vario simulated instance")
+    parser.add_argument("--target-port", type=int, default=45678, help="Port of the Open Vario simulated instance")
+    parser.add_argument("--host-port", type=int, default=45679, help="Port of the simulator")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor, 0 to replay as fast as possible")
+    parser.add_argument("--capture", default=None, help="Capture file of the frames exchanged during the replay")
+
+    SimuReplayApp().start(parser.parse_args())
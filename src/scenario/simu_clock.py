@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+from com.simu_time import monotonic
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuClock(object):
+    '''
+        Simulation clock giving the time of a scenario run. The clock only tells how long to
+        wait before a simulation time is reached, the wait itself is done by its user
+    '''
+
+    def start(self):
+        '''
+            Start the clock, the simulation time restarts from 0
+        '''
+        return
+
+    def get_time(self):
+        '''
+            Get the current simulation time
+
+            @return: Simulation time since the start (seconds)
+            @rtype: float
+        '''
+        return 0.
+
+    def get_delay(self, sim_time):
+        '''
+            Get the real time to wait before a simulation time is reached
+
+            @param sim_time: Simulation time since the start (seconds)
+            @type sim_time: float
+
+            @return: Real time to wait (seconds), 0 if the simulation time is reached
+            @rtype: float
+        '''
+        return 0.
+
+    def is_stepped(self):
+        '''
+            Indicate if the clock is advanced in lock-step with the simulated instance : the
+            responses of the requests sent for a simulation time must be received before
+            the clock is advanced to the next one
+
+            @return: True if the clock is advanced in lock-step, False otherwise
+            @rtype: bool
+        '''
+        return False
+
+
+class SimuRealTimeClock(SimuClock):
+    '''
+        Clock following the monotonic time, optionally accelerated
+    '''
+
+    def __init__(self, speed=1.):
+        '''
+            Constructor
+
+            @param speed: Ratio between the simulation time and the real time, 10 to run
+                          a scenario 10 times faster than real time
+            @type speed: float
+        '''
+
+        self.__speed = float(speed)
+        '''
+            Ratio between the simulation time and the real time
+        '''
+        self.__start = monotonic()
+        '''
+            Monotonic time at the start of the clock
+        '''
+
+        return
+
+    def get_speed(self):
+        '''
+            Get the ratio between the simulation time and the real time
+
+            @return: Ratio between the simulation time and the real time
+            @rtype: float
+        '''
+
+        return self.__speed
+
+    def start(self):
+        '''
+            Start the clock, the simulation time restarts from 0
+        '''
+
+        self.__start = monotonic()
+
+        return
+
+    def get_time(self):
+        '''
+            Get the current simulation time
+
+            @return: Simulation time since the start (seconds)
+            @rtype: float
+        '''
+
+        return (monotonic() - self.__start) * self.__speed
+
+    def get_delay(self, sim_time):
+        '''
+            Get the real time to wait before a simulation time is reached
+
+            @param sim_time: Simulation time since the start (seconds)
+            @type sim_time: float
+
+            @return: Real time to wait (seconds), 0 if the simulation time is reached
+            @rtype: float
+        '''
+
+        return max(0., self.__start + sim_time / self.__speed - monotonic())
+
+
+class SimuStepClock(SimuClock):
+    '''
+        Clock advanced in lock-step with the simulated instance : it jumps to the next
+        simulation time as soon as the responses of the previous step are received,
+        so a scenario runs as fast as the simulated instance handles it
+    '''
+
+    def __init__(self):
+        '''
+            Constructor
+        '''
+
+        self.__time = 0.
+        '''
+            Current simulation time (seconds)
+        '''
+
+        return
+
+    def start(self):
+        '''
+            Start the clock, the simulation time restarts from 0
+        '''
+
+        self.__time = 0.
+
+        return
+
+    def get_time(self):
+        '''
+            Get the current simulation time
+
+            @return: Simulation time since the start (seconds)
+            @rtype: float
+        '''
+
+        return self.__time
+
+    def get_delay(self, sim_time):
+        '''
+            Advance the clock to a simulation time
+
+            @param sim_time: Simulation time since the start (seconds)
+            @type sim_time: float
+
+            @return: Real time to wait (seconds), always 0
+            @rtype: float
+        '''
+
+        self.__time = max(self.__time, sim_time)
+
+        return 0.
+
+    def is_stepped(self):
+        '''
+            Indicate if the clock is advanced in lock-step with the simulated instance
+
+            @return: True
+            @rtype: bool
+        '''
+
+        return True
@@ -0,0 +1,611 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import math
+from datetime import datetime, timedelta
+import numpy as np
+from com.simu_protocol import SimuSensorType
+from scenario.simu_signals import SimuSignal
+
+
+####################################################
+#### Data types
+
+ATMOSPHERE_SEA_LEVEL_PRESSURE = 101325.
+'''
+    Pressure at sea level of the standard atmosphere (Pa)
+'''
+
+ATMOSPHERE_SEA_LEVEL_TEMPERATURE = 288.15
+'''
+    Temperature at sea level of the standard atmosphere (K)
+'''
+
+ATMOSPHERE_LAPSE_RATE = 0.0065
+'''
+    Temperature lapse rate of the troposphere (K/m)
+'''
+
+ATMOSPHERE_PRESSURE_EXPONENT = 5.25588
+'''
+    Exponent of the barometric formula : g.M / (R.L)
+'''
+
+GRAVITY = 9.80665
+'''
+    Standard gravity (m/s2)
+'''
+
+EARTH_RADIUS = 6371000.
+'''
+    Mean radius of the Earth (m)
+'''
+
+KNOTS_PER_MS = 3600. / 1852.
+'''
+    Conversion factor from m/s to knots
+'''
+
+FLIGHT_QUANTITIES = { SimuSensorType.PRESSURE : ("pressure", 1.),
+                      SimuSensorType.TEMPERATURE : ("temperature", 10.),
+                      SimuSensorType.ALTITUDE : ("altitude", 1.),
+                      SimuSensorType.GNSS : ("nmea", None) }
+'''
+    Quantity of the flight model and scale to the sensor unit by sensor type : pressure in Pa,
+    temperature in 0.1 degree Celsius, altitude in m and GNSS as NMEA sentences
+'''
+
+
+####################################################
+#### Functions
+
+
+def standard_pressure(altitude, qnh=ATMOSPHERE_SEA_LEVEL_PRESSURE):
+    '''
+        Compute the pressure of the standard atmosphere
+
+        @param altitude: Altitudes (m)
+        @type altitude: numpy.ndarray or float
+        @param qnh: Pressure at sea level (Pa)
+        @type qnh: float
+
+        @return: Pressures (Pa)
+        @rtype: numpy.ndarray or float
+    '''
+
+    return qnh * (1. - ATMOSPHERE_LAPSE_RATE * altitude / ATMOSPHERE_SEA_LEVEL_TEMPERATURE) ** ATMOSPHERE_PRESSURE_EXPONENT
+
+
+def standard_altitude(pressure, qnh=ATMOSPHERE_SEA_LEVEL_PRESSURE):
+    '''
+        Compute the altitude of a pressure in the standard atmosphere
+
+        @param pressure: Pressures (Pa)
+        @type pressure: numpy.ndarray or float
+        @param qnh: Pressure at sea level (Pa)
+        @type qnh: float
+
+        @return: Altitudes (m)
+        @rtype: numpy.ndarray or float
+    '''
+
+    return (ATMOSPHERE_SEA_LEVEL_TEMPERATURE / ATMOSPHERE_LAPSE_RATE *
+            (1. - (pressure / qnh) ** (1. / ATMOSPHERE_PRESSURE_EXPONENT)))
+
+
+def standard_temperature(altitude, ground_temperature=ATMOSPHERE_SEA_LEVEL_TEMPERATURE - 273.15):
+    '''
+        Compute the temperature of the standard atmosphere
+
+        @param altitude: Altitudes (m)
+        @type altitude: numpy.ndarray or float
+        @param ground_temperature: Temperature at sea level (degree Celsius)
+        @type ground_temperature: float
+
+        @return: Temperatures (degree Celsius)
+        @rtype: numpy.ndarray or float
+    '''
+
+    return ground_temperature - ATMOSPHERE_LAPSE_RATE * altitude
+
+
+def nmea_sentence(fields):
+    '''
+        Build a NMEA sentence with its checksum
+
+        @param fields: Fields of the sentence, talker and sentence identifier first
+        @type fields: [ string ]
+
+        @return: NMEA sentence without line ending
+        @rtype: string
+    '''
+
+    body = ",".join(fields)
+    checksum = 0
+    for char in bytearray(body):
+        checksum ^= char
+
+    return "$" + body + "*%02X" % checksum
+
+
+def nmea_coordinate(value, positive, negative, degree_digits):
+    '''
+        Format a latitude or a longitude as a NMEA field
+
+        @param value: Coordinate (degrees)
+        @type value: float
+        @param positive: Hemisphere of the positive coordinates : N or E
+        @type positive: string
+        @param negative: Hemisphere of the negative coordinates : S or W
+        @type negative: string
+        @param degree_digits: Number of digits of the degrees : 2 for a latitude, 3 for a longitude
+        @type degree_digits: int
+
+        @return: Coordinate and hemisphere fields
+        @rtype: (string, string)
+    '''
+
+    hemisphere = positive if value >= 0 else negative
+    value = abs(value)
+    degrees = int(value)
+    minutes = (value - degrees) * 60.
+    if minutes >= 59.99995:
+        degrees += 1
+        minutes = 0.
+
+    return ("%0*d%07.4f" % (degree_digits, degrees, minutes), hemisphere)
+
+
+def nmea_fixes(start_date, times, state):
+    '''
+        Build the GNSS sentences of a glider : a GGA and a RMC sentence per sample time
+
+        @param start_date: UTC date and time of the time origin
+        @type start_date: datetime
+        @param times: Sample times since the time origin (seconds)
+        @type times: numpy.ndarray
+        @param state: State of the glider at the sample times : latitude and longitude (degrees),
+                      altitude (m), ground speed (m/s) and track (degrees)
+        @type state: {string:numpy.ndarray}
+
+        @return: NMEA sentences separated by CR LF, one string per sample time
+        @rtype: numpy.ndarray
+    '''
+
+    ret = np.empty(len(times), dtype=object)
+    for index, (sample_time, latitude, longitude, altitude, speed, track) in enumerate(zip(
+            np.asarray(times).tolist(), state["latitude"].tolist(), state["longitude"].tolist(),
+            state["altitude"].tolist(), state["speed"].tolist(), state["track"].tolist())):
+
+        date = start_date + timedelta(seconds=sample_time)
+        utc_time = date.strftime("%H%M%S") + ".%02d" % (date.microsecond // 10000)
+        latitude = nmea_coordinate(latitude, "N", "S", 2)
+        longitude = nmea_coordinate(longitude, "E", "W", 3)
+        gga = nmea_sentence([ "GPGGA", utc_time, latitude[0], latitude[1], longitude[0], longitude[1],
+                              "1", "08", "0.9", "%.1f" % altitude, "M", "0.0", "M", "", "" ])
+        rmc = nmea_sentence([ "GPRMC", utc_time, "A", latitude[0], latitude[1], longitude[0], longitude[1],
+                              "%.1f" % (speed * KNOTS_PER_MS), "%.1f" % track, date.strftime("%d%m%y"), "", "", "A" ])
+        ret[index] = gga + "\r\n" + rmc
+
+    return ret
+
+
+####################################################
+#### Classes
+
+
+class SimuPolar(object):
+    '''
+        Speed polar of a glider : sink rate as a quadratic function of the airspeed,
+        fitted on three points of the polar curve
+    '''
+
+    def __init__(self, points=((7.5, 1.1), (10., 1.25), (14., 2.))):
+        '''
+            Constructor
+
+            @param points: Three points of the polar : [ (airspeed in m/s, sink rate in m/s) ],
+                           the default polar is the one of a paraglider
+            @type points: [ (float, float) ]
+        '''
+
+        speeds, sinks = zip(*points)
+        self.__a, self.__b, self.__c = np.polyfit(speeds, sinks, 2).tolist()
+        '''
+            Coefficients of the polar : sink = a.v^2 + b.v + c
+        '''
+
+        return
+
+    def get_sink(self, airspeed):
+        '''
+            Get the sink rate at an airspeed
+
+            @param airspeed: Airspeed (m/s)
+            @type airspeed: float
+
+            @return: Sink rate, positive downwards (m/s)
+            @rtype: float
+        '''
+
+        return (self.__a * airspeed + self.__b) * airspeed + self.__c
+
+    def get_min_sink_speed(self):
+        '''
+            Get the airspeed of the minimum sink rate
+
+            @return: Airspeed (m/s)
+            @rtype: float
+        '''
+
+        return -self.__b / (2. * self.__a)
+
+    def get_speed_to_fly(self, climb_rate=0.):
+        '''
+            Get the MacCready speed to fly in still air
+
+            @param climb_rate: Expected climb rate in the next thermal (m/s), 0 for the best glide speed
+            @type climb_rate: float
+
+            @return: Airspeed (m/s)
+            @rtype: float
+        '''
+
+        return max(self.get_min_sink_speed(), math.sqrt(max(0., (self.__c + climb_rate) / self.__a)))
+
+
+class SimuFlightModel(object):
+    '''
+        Cross-country flight of a glider alternating glides at the MacCready speed and climbs
+        circling in thermals, drifted by a constant wind. The flight is made of phases drawn
+        from a seeded random generator and integrated analytically, so the state of the glider
+        is a function of the time computed for a whole block of sample times at once, and the
+        tracks of all the sensors sample the same trajectory whatever their rate
+    '''
+
+    def __init__(self, latitude=45.2, longitude=5.7, altitude=1500., polar=None, wind_speed=3., wind_direction=270.,
+                 qnh=ATMOSPHERE_SEA_LEVEL_PRESSURE, ground_temperature=20., thermal_strength=2.5, thermal_interval=240.,
+                 thermal_radius=35., cloud_base=2500., floor_altitude=800., turbulence=0.5, start_date=None, seed=0):
+        '''
+            Constructor
+
+            @param latitude: Latitude of the start position (degrees)
+            @type latitude: float
+            @param longitude: Longitude of the start position (degrees)
+            @type longitude: float
+            @param altitude: Altitude at the start of the flight (m)
+            @type altitude: float
+            @param polar: Speed polar of the glider, None for a paraglider
+            @type polar: SimuPolar
+            @param wind_speed: Wind speed (m/s)
+            @type wind_speed: float
+            @param wind_direction: Direction the wind is blowing from (degrees)
+            @type wind_direction: float
+            @param qnh: Pressure at sea level (Pa)
+            @type qnh: float
+            @param ground_temperature: Temperature at sea level (degree Celsius)
+            @type ground_temperature: float
+            @param thermal_strength: Mean lift of the thermals (m/s)
+            @type thermal_strength: float
+            @param thermal_interval: Mean gliding time between two thermals (seconds)
+            @type thermal_interval: float
+            @param thermal_radius: Radius of the circles in the thermals (m)
+            @type thermal_radius: float
+            @param cloud_base: Top of the thermals (m)
+            @type cloud_base: float
+            @param floor_altitude: Altitude from which the glider searches for the next thermal (m)
+            @type floor_altitude: float
+            @param turbulence: Amplitude of the altitude variations due to the turbulence (m)
+            @type turbulence: float
+            @param start_date: UTC date and time of the start of the flight, None for 2017-07-01 12:00:00
+            @type start_date: datetime
+            @param seed: Seed of the random generator
+            @type seed: int
+        '''
+
+        self.__latitude = float(latitude)
+        '''
+            Latitude of the start position (degrees)
+        '''
+        self.__longitude = float(longitude)
+        '''
+            Longitude of the start position (degrees)
+        '''
+        self.__polar = polar
+        '''
+            Speed polar of the glider
+        '''
+        if polar == None:
+            self.__polar = SimuPolar()
+        self.__wind = (-wind_speed * math.sin(math.radians(wind_direction)),
+                       -wind_speed * math.cos(math.radians(wind_direction)))
+        '''
+            Wind velocity : (east, north) in m/s
+        '''
+        self.__qnh = float(qnh)
+        '''
+            Pressure at sea level (Pa)
+        '''
+        self.__ground_temperature = float(ground_temperature)
+        '''
+            Temperature at sea level (degree Celsius)
+        '''
+        self.__thermal_strength = float(thermal_strength)
+        '''
+            Mean lift of the thermals (m/s)
+        '''
+        self.__thermal_interval = float(thermal_interval)
+        '''
+            Mean gliding time between two thermals (seconds)
+        '''
+        self.__thermal_radius = float(thermal_radius)
+        '''
+            Radius of the circles in the thermals (m)
+        '''
+        self.__cloud_base = float(cloud_base)
+        '''
+            Top of the thermals (m)
+        '''
+        self.__floor_altitude = float(floor_altitude)
+        '''
+            Altitude from which the glider searches for the next thermal (m)
+        '''
+        self.__start_date = start_date
+        '''
+            UTC date and time of the start of the flight
+        '''
+        if start_date == None:
+            self.__start_date = datetime(2017, 7, 1, 12, 0, 0)
+        self.__random = np.random.RandomState(seed)
+        '''
+            Random generator of the flight phases
+        '''
+
+        # Turbulence as a sum of sines with random periods and phases, so that it is a function of the time
+        periods = self.__random.uniform(2., 20., 4)
+        self.__turbulence = (2. * np.pi / periods, self.__random.uniform(0., 2. * np.pi, 4),
+                             turbulence * self.__random.uniform(0.5, 1., 4) / 2.)
+        '''
+            Turbulence : pulsations (rad/s), phases (rad) and amplitudes (m) of the sines
+        '''
+
+        self.__phases = { "start" : [], "altitude" : [], "vz" : [], "east" : [], "north" : [],
+                          "heading" : [], "turn_rate" : [], "airspeed" : [] }
+        '''
+            Flight phases as columns : start time (s), altitude at the start (m), vertical speed (m/s),
+            position at the start relative to the start of the flight (m), heading at the start (rad),
+            turn rate (rad/s, 0 for a glide) and airspeed (m/s)
+        '''
+        self.__arrays = None
+        '''
+            Flight phases as arrays, built when the phases are extended
+        '''
+        self.__end = (0., float(altitude), 0., 0., self.__random.uniform(0., 2. * np.pi), altitude <= floor_altitude)
+        '''
+            State at the end of the last phase : time (s), altitude (m), east (m), north (m), heading (rad)
+            and indicates if the last phase is a glide, the flight starting with a climb below the floor altitude
+        '''
+
+        return
+
+    def get_qnh(self):
+        '''
+            Get the pressure at sea level
+
+            @return: Pressure at sea level (Pa)
+            @rtype: float
+        '''
+
+        return self.__qnh
+
+    def compute(self, times):
+        '''
+            Compute the state of the glider
+
+            @param times: Sample times since the start of the flight (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: State of the glider by quantity, one value per sample time : altitude (m), vario (m/s),
+                     pressure (Pa), temperature (degree Celsius), latitude and longitude (degrees),
+                     ground speed (m/s) and track (degrees)
+            @rtype: {string:numpy.ndarray}
+        '''
+
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) > 0:
+            self.__extend(times[-1])
+        phases = self.__arrays
+
+        # Phase of each sample time
+        index = np.clip(np.searchsorted(phases["start"], times, side="right") - 1, 0, len(phases["start"]) - 1)
+        dt = times - phases["start"][index]
+        airspeed = phases["airspeed"][index]
+        turn_rate = phases["turn_rate"][index]
+        heading_start = phases["heading"][index]
+        heading = heading_start + turn_rate * dt
+
+        # Vertical : constant vertical speed in each phase plus the turbulence
+        pulsations, turbulence_phases, amplitudes = self.__turbulence
+        angles = np.outer(times, pulsations) + turbulence_phases
+        altitude = phases["altitude"][index] + phases["vz"][index] * dt + np.sin(angles).dot(amplitudes)
+        vario = phases["vz"][index] + np.cos(angles).dot(amplitudes * pulsations)
+
+        # Horizontal : straight line during a glide, circle during a climb, both drifted by the wind
+        circling = turn_rate != 0.
+        radius = airspeed / np.where(circling, turn_rate, 1.)
+        east = np.where(circling, radius * (np.cos(heading_start) - np.cos(heading)), airspeed * np.sin(heading_start) * dt)
+        north = np.where(circling, radius * (np.sin(heading) - np.sin(heading_start)), airspeed * np.cos(heading_start) * dt)
+        east += phases["east"][index] + self.__wind[0] * dt
+        north += phases["north"][index] + self.__wind[1] * dt
+        ground_east = airspeed * np.sin(heading) + self.__wind[0]
+        ground_north = airspeed * np.cos(heading) + self.__wind[1]
+
+        ret = { "altitude" : altitude,
+                "vario" : vario,
+                "pressure" : standard_pressure(altitude, self.__qnh),
+                "temperature" : standard_temperature(altitude, self.__ground_temperature),
+                "latitude" : self.__latitude + np.degrees(north / EARTH_RADIUS),
+                "longitude" : self.__longitude + np.degrees(east / (EARTH_RADIUS * math.cos(math.radians(self.__latitude)))),
+                "speed" : np.hypot(ground_east, ground_north),
+                "track" : np.mod(np.degrees(np.arctan2(ground_east, ground_north)), 360.) }
+
+        return ret
+
+    def compute_nmea(self, times, state=None):
+        '''
+            Compute the GNSS sentences of the glider : a GGA and a RMC sentence per sample time
+
+            @param times: Sample times since the start of the flight (seconds), increasing
+            @type times: numpy.ndarray
+            @param state: State of the glider at the sample times if already computed
+            @type state: {string:numpy.ndarray}
+
+            @return: NMEA sentences separated by CR LF, one string per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        if state == None:
+            state = self.compute(times)
+
+        return nmea_fixes(self.__start_date, times, state)
+
+    def add_tracks(self, scenario, rates, optional=False):
+        '''
+            Add the tracks of the flight to a scenario
+
+            @param scenario: Scenario to add the tracks to
+            @type scenario: SimuScenario
+            @param rates: Update rate by sensor type (Hz)
+            @type rates: {SimuSensorType:float}
+            @param optional: Indicates if the scenario can be played without the sensors of the tracks
+            @type optional: bool
+
+            @return: Added tracks
+            @rtype: [ SimuScenarioTrack ]
+        '''
+
+        ret = []
+        for sensor_type, rate in rates.iteritems():
+            ret.append(scenario.add_track(sensor_type, SimuFlightSignal(self, sensor_type), rate, optional))
+
+        return ret
+
+    def __extend(self, end_time):
+        '''
+            Draw new flight phases until a time is covered
+
+            @param end_time: Time to cover (seconds)
+            @type end_time: float
+        '''
+
+        if (self.__arrays == None) or (self.__end[0] <= end_time):
+            polar = self.__polar
+            phases = self.__phases
+            while self.__end[0] <= end_time:
+                start, altitude, east, north, heading, gliding = self.__end
+                if not gliding:
+
+                    # Glide at the MacCready speed in sinking air towards the next thermal
+                    airspeed = polar.get_speed_to_fly(self.__thermal_strength)
+                    vz = -polar.get_sink(airspeed) - self.__random.uniform(0., 0.5)
+                    heading += self.__random.uniform(-0.5, 0.5)
+                    duration = min(self.__random.exponential(self.__thermal_interval),
+                                   (altitude - self.__floor_altitude) / -vz)
+                    turn_rate = 0.
+                    end_east = east + (airspeed * math.sin(heading) + self.__wind[0]) * max(1., duration)
+                    end_north = north + (airspeed * math.cos(heading) + self.__wind[1]) * max(1., duration)
+                    end_heading = heading
+
+                else:
+
+                    # Circle in a thermal up to a random altitude below the cloud base
+                    airspeed = polar.get_min_sink_speed()
+                    bank = math.atan(airspeed * airspeed / (GRAVITY * self.__thermal_radius))
+                    sink = polar.get_sink(airspeed) / math.cos(bank) ** 1.5
+                    vz = max(0.3, self.__thermal_strength * self.__random.uniform(0.5, 1.5) - sink)
+                    duration = self.__random.uniform(0.7, 1.) * (self.__cloud_base - altitude) / vz
+                    turn_rate = self.__random.choice((-1., 1.)) * airspeed / self.__thermal_radius
+                    end_heading = heading + turn_rate * max(1., duration)
+                    radius = airspeed / turn_rate
+                    end_east = east + radius * (math.cos(heading) - math.cos(end_heading)) + self.__wind[0] * max(1., duration)
+                    end_north = north + radius * (math.sin(end_heading) - math.sin(heading)) + self.__wind[1] * max(1., duration)
+
+                # Phases last at least 1 second so that the flight always progresses
+                duration = max(1., duration)
+                for name, value in (("start", start), ("altitude", altitude), ("vz", vz), ("east", east), ("north", north),
+                                    ("heading", heading), ("turn_rate", turn_rate), ("airspeed", airspeed)):
+                    phases[name].append(value)
+                self.__end = (start + duration, altitude + vz * duration, end_east, end_north,
+                              math.fmod(end_heading, 2. * math.pi), turn_rate == 0.)
+
+            self.__arrays = dict( (name, np.array(values, dtype=np.float64)) for name, values in phases.iteritems() )
+
+        return
+
+
+class SimuFlightSignal(SimuSignal):
+    '''
+        Values of a sensor along the flight of a flight model
+    '''
+
+    def __init__(self, model, sensor_type):
+        '''
+            Constructor
+
+            @param model: Flight model
+            @type model: SimuFlightModel
+            @param sensor_type: Type of the sensor : PRESSURE, TEMPERATURE, ALTITUDE or GNSS
+            @type sensor_type: SimuSensorType
+        '''
+
+        self.__model = model
+        '''
+            Flight model
+        '''
+        self.__quantity, self.__scale = FLIGHT_QUANTITIES[sensor_type]
+        '''
+            Quantity of the flight model and scale to the sensor unit, None for the NMEA sentences
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        if self.__scale == None:
+            ret = self.__model.compute_nmea(times)
+        else:
+            ret = self.__model.compute(times)[self.__quantity] * self.__scale
+
+        return ret
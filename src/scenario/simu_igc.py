@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import os
+from datetime import datetime
+import numpy as np
+from com.simu_protocol import SimuSensorType
+from scenario.simu_flight_model import EARTH_RADIUS, nmea_fixes, standard_pressure
+from scenario.simu_signals import SimuSignal
+
+
+####################################################
+#### Data types
+
+IGC_TAIL_SIZE = 4096
+'''
+    Size of the end of the file first read to find the last B record, doubled until a B record is found (bytes)
+'''
+
+
+####################################################
+#### Functions
+
+
+def parse_igc_fix(line):
+    '''
+        Parse an IGC B record
+
+        @param line: Line of the IGC file
+        @type line: string
+
+        @return: Time of the day (seconds), latitude and longitude (degrees), pressure altitude
+                 and GNSS altitude (m), None if the line is not a valid B record
+        @rtype: (int, float, float, int, int)
+    '''
+
+    ret = None
+    if line.startswith("B") and (len(line) >= 35):
+        try:
+            seconds = int(line[1:3]) * 3600 + int(line[3:5]) * 60 + int(line[5:7])
+            latitude = int(line[7:9]) + int(line[9:14]) / 60000.
+            if line[14] == "S":
+                latitude = -latitude
+            longitude = int(line[15:18]) + int(line[18:23]) / 60000.
+            if line[23] == "W":
+                longitude = -longitude
+            ret = (seconds, latitude, longitude, int(line[25:30]), int(line[30:35]))
+        except ValueError:
+            ret = None
+
+    return ret
+
+
+def parse_igc_date(line):
+    '''
+        Parse the date header of an IGC file : HFDTEDDMMYY or HFDTEDATE:DDMMYY,NN
+
+        @param line: Line of the IGC file
+        @type line: string
+
+        @return: Date of the flight, None if the line is not a valid date header
+        @rtype: datetime
+    '''
+
+    ret = None
+    if line.startswith("HFDTE"):
+        value = line[5:].split(":")[-1].strip()[:6]
+        try:
+            ret = datetime.strptime(value, "%d%m%y")
+        except ValueError:
+            ret = None
+
+    return ret
+
+
+####################################################
+#### Classes
+
+
+class SimuIgcTrace(object):
+    '''
+        Flight recorded in an IGC file, streamed from the file : the B records are read as the
+        sample times progress and only the records around the last requested block are kept,
+        so that the memory used does not depend on the length of the flight. The fixes are
+        linearly interpolated at the sample times. The times are counted from the first fix
+    '''
+
+    def __init__(self, path):
+        '''
+            Constructor
+
+            @param path: Path of the IGC file
+            @type path: string
+        '''
+
+        self.__path = path
+        '''
+            Path of the IGC file
+        '''
+        self.__file = None
+        '''
+            Opened IGC file
+        '''
+        self.__start_date = None
+        '''
+            UTC date and time of the first fix
+        '''
+        self.__start_seconds = 0
+        '''
+            Time of the day of the first fix (seconds)
+        '''
+        self.__day_offset = 0
+        '''
+            Offset of the times of the fixes recorded after midnight (seconds)
+        '''
+        self.__fixes = []
+        '''
+            Fixes around the last requested block : [ (time since the first fix, latitude, longitude,
+            pressure altitude, GNSS altitude) ]
+        '''
+        self.__eof = False
+        '''
+            Indicates if all the fixes of the file have been read
+        '''
+
+        return
+
+    def open(self):
+        '''
+            Open the IGC file and read its headers up to the first fix
+
+            @return: True if the file contains at least one fix, False otherwise
+            @rtype: bool
+        '''
+
+        self.close()
+        try:
+            self.__file = open(self.__path, "rb")
+            date = None
+            fix = None
+            while fix == None:
+                line = self.__file.readline()
+                if not line:
+                    break
+                fix = parse_igc_fix(line)
+                if (fix == None) and (date == None):
+                    date = parse_igc_date(line)
+        except (IOError, OSError):
+            fix = None
+
+        ret = not (fix == None)
+        if ret:
+            if date == None:
+                date = datetime(2017, 7, 1)
+            self.__start_seconds = fix[0]
+            self.__start_date = datetime(date.year, date.month, date.day, fix[0] // 3600, (fix[0] // 60) % 60, fix[0] % 60)
+            self.__day_offset = 0
+            self.__fixes = [ (0.,) + fix[1:] ]
+            self.__eof = False
+        else:
+            self.close()
+
+        return ret
+
+    def close(self):
+        '''
+            Close the IGC file
+        '''
+
+        if not (self.__file == None):
+            self.__file.close()
+            self.__file = None
+        self.__fixes = []
+        self.__eof = True
+
+        return
+
+    def get_start_date(self):
+        '''
+            Get the UTC date and time of the first fix
+
+            @return: Date and time of the first fix, None if the file is not opened
+            @rtype: datetime
+        '''
+
+        return self.__start_date
+
+    def get_duration(self):
+        '''
+            Get the duration of the flight, from the first fix to the last one. The file is read
+            backwards from its end until the last B record is found
+
+            @return: Duration of the flight (seconds), None if the file is not opened or cannot be read
+            @rtype: float
+        '''
+
+        ret = None
+        if not (self.__start_date == None):
+            try:
+                with open(self.__path, "rb") as igc_file:
+                    igc_file.seek(0, os.SEEK_END)
+                    end = igc_file.tell()
+                    size = IGC_TAIL_SIZE
+                    start = end
+                    while (ret == None) and (start > 0):
+
+                        # The first line is read again with the previous block unless the start of the file is reached
+                        start = max(0, end - size)
+                        igc_file.seek(start)
+                        lines = igc_file.read(end - start).splitlines()
+                        if start > 0:
+                            lines = lines[1:]
+                        for line in reversed(lines):
+                            fix = parse_igc_fix(line)
+                            if not (fix == None):
+                                ret = float((fix[0] - self.__start_seconds) % 86400)
+                                break
+                        size *= 2
+            except (IOError, OSError):
+                ret = None
+
+        return ret
+
+    def compute(self, times):
+        '''
+            Compute the state of the glider
+
+            @param times: Sample times since the first fix (seconds), increasing and not older
+                          than the first sample time of the previous call
+            @type times: numpy.ndarray
+
+            @return: State of the glider by quantity, one value per sample time : latitude and longitude (degrees),
+                     pressure altitude and GNSS altitude (m), ground speed (m/s) and track (degrees)
+            @rtype: {string:numpy.ndarray}
+        '''
+
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) > 0:
+            self.__slide(times[0], times[-1])
+        fixes = np.array(self.__fixes, dtype=np.float64).reshape(-1, 5)
+        fix_times = fixes[:, 0]
+
+        ret = {}
+        for name, column in (("latitude", 1), ("longitude", 2), ("pressure_altitude", 3), ("altitude", 4)):
+            ret[name] = np.interp(times, fix_times, fixes[:, column])
+
+        # Ground speed and track of the segment between the fixes surrounding each sample time
+        if len(fix_times) > 1:
+            index = np.clip(np.searchsorted(fix_times, times, side="right") - 1, 0, len(fix_times) - 2)
+            duration = fix_times[index + 1] - fix_times[index]
+            north = np.radians(fixes[index + 1, 1] - fixes[index, 1]) * EARTH_RADIUS
+            east = (np.radians(fixes[index + 1, 2] - fixes[index, 2]) * EARTH_RADIUS *
+                    np.cos(np.radians(fixes[index, 1])))
+            ret["speed"] = np.hypot(east, north) / duration
+            ret["track"] = np.mod(np.degrees(np.arctan2(east, north)), 360.)
+        else:
+            ret["speed"] = np.zeros(len(times))
+            ret["track"] = np.zeros(len(times))
+
+        return ret
+
+    def compute_nmea(self, times, state=None):
+        '''
+            Compute the GNSS sentences of the glider : a GGA and a RMC sentence per sample time
+
+            @param times: Sample times since the first fix (seconds), increasing
+            @type times: numpy.ndarray
+            @param state: State of the glider at the sample times if already computed
+            @type state: {string:numpy.ndarray}
+
+            @return: NMEA sentences separated by CR LF, one string per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        if state == None:
+            state = self.compute(times)
+
+        return nmea_fixes(self.__start_date, times, state)
+
+    def add_tracks(self, scenario, rates, optional=False):
+        '''
+            Add the tracks of the flight to a scenario
+
+            @param scenario: Scenario to add the tracks to
+            @type scenario: SimuScenario
+            @param rates: Update rate by sensor type : PRESSURE, ALTITUDE or GNSS (Hz)
+            @type rates: {SimuSensorType:float}
+            @param optional: Indicates if the scenario can be played without the sensors of the tracks
+            @type optional: bool
+
+            @return: Added tracks
+            @rtype: [ SimuScenarioTrack ]
+        '''
+
+        ret = []
+        for sensor_type, rate in rates.iteritems():
+            ret.append(scenario.add_track(sensor_type, SimuIgcSignal(self, sensor_type), rate, optional))
+
+        return ret
+
+    def __slide(self, start_time, end_time):
+        '''
+            Move the window of fixes so that it covers a block of sample times
+
+            @param start_time: First sample time of the block (seconds)
+            @type start_time: float
+            @param end_time: Last sample time of the block (seconds)
+            @type end_time: float
+        '''
+
+        # Forget the fixes preceding the last one before the block
+        fixes = self.__fixes
+        first = 0
+        while (first + 1 < len(fixes)) and (fixes[first + 1][0] <= start_time):
+            first += 1
+        if first > 0:
+            del fixes[:first]
+
+        # Read the fixes up to the first one after the block
+        while (not self.__eof) and (fixes[-1][0] < end_time):
+            line = self.__file.readline()
+            if not line:
+                self.__eof = True
+                break
+            fix = parse_igc_fix(line)
+            if not (fix == None):
+
+                # Fixes recorded after midnight, the fixes with a duplicated time are ignored
+                fix_time = fix[0] + self.__day_offset - self.__start_seconds
+                if fix_time < fixes[-1][0] - 43200:
+                    self.__day_offset += 86400
+                    fix_time += 86400
+                if fix_time > fixes[-1][0]:
+                    fixes.append( (float(fix_time),) + fix[1:] )
+
+        return
+
+
+class SimuIgcSignal(SimuSignal):
+    '''
+        Values of a sensor along the flight of an IGC file : the pressure is derived from the pressure
+        altitude, which is relative to the standard atmosphere, or from the GNSS altitude when the
+        flight recorder has no pressure sensor
+    '''
+
+    def __init__(self, trace, sensor_type):
+        '''
+            Constructor
+
+            @param trace: IGC trace, several signals can share the same trace
+            @type trace: SimuIgcTrace
+            @param sensor_type: Type of the sensor : PRESSURE, ALTITUDE or GNSS
+            @type sensor_type: SimuSensorType
+        '''
+
+        self.__trace = trace
+        '''
+            IGC trace
+        '''
+        self.__sensor_type = sensor_type
+        '''
+            Type of the sensor
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        state = self.__trace.compute(times)
+        if self.__sensor_type == SimuSensorType.GNSS:
+            ret = self.__trace.compute_nmea(times, state)
+        else:
+            altitude = np.where(state["pressure_altitude"] == 0., state["altitude"], state["pressure_altitude"])
+            if self.__sensor_type == SimuSensorType.PRESSURE:
+                ret = standard_pressure(altitude)
+            else:
+                ret = altitude
+
+        return ret
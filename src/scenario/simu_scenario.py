@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import math
+import numpy as np
+from com.simu_protocol import SimuSensorValueType
+
+
+####################################################
+#### Data types
+
+SCENARIO_INT_RANGES = { SimuSensorValueType.UINT : (0, 0xFFFFFFFF),
+                        SimuSensorValueType.INT : (-0x80000000, 0x7FFFFFFF) }
+'''
+    Range of the integer value types
+'''
+
+
+####################################################
+#### Functions
+
+
+def convert_values(values, value_type):
+    '''
+        Convert a block of signal values to the value type of a sensor
+
+        @param values: Signal values
+        @type values: numpy.ndarray
+        @param value_type: Value type of the sensor
+        @type value_type: SimuSensorValueType
+
+        @return: Values as Python objects of the value type, integers being rounded and clipped
+                 to the range of the type, None if the value type is not supported
+        @rtype: [ int or float or bool or string ]
+    '''
+
+    ret = None
+    values = np.asarray(values)
+    int_range = SCENARIO_INT_RANGES.get(value_type)
+    if not (int_range == None):
+        ret = np.clip(np.rint(values.astype(np.float64)), int_range[0], int_range[1]).astype(np.int64).tolist()
+    elif value_type in (SimuSensorValueType.FLOAT, SimuSensorValueType.DOUBLE):
+        ret = values.astype(np.float64).tolist()
+    elif value_type == SimuSensorValueType.BOOL:
+        ret = (values != 0).tolist()
+    elif value_type == SimuSensorValueType.STRING:
+        ret = [ value if isinstance(value, basestring) else str(value) for value in values.tolist() ]
+
+    return ret
+
+
+####################################################
+#### Classes
+
+
+class SimuScenarioTrack(object):
+    '''
+        Values of a sensor generated by a signal at a fixed rate
+    '''
+
+    def __init__(self, sensor, signal, rate, optional=False):
+        '''
+            Constructor
+
+            @param sensor: Id or name of the sensor, or sensor type to drive the first sensor of this type
+            @type sensor: int or string or SimuSensorType
+            @param signal: Signal generator
+            @type signal: SimuSignal
+            @param rate: Update rate (Hz)
+            @type rate: float
+            @param optional: Indicates if the scenario can be played when the instance has not the sensor
+            @type optional: bool
+        '''
+
+        self.sensor = sensor
+        '''
+            Id or name of the sensor, or sensor type to drive the first sensor of this type
+        '''
+        self.signal = signal
+        '''
+            Signal generator
+        '''
+        self.rate = float(rate)
+        '''
+            Update rate (Hz)
+        '''
+        self.optional = optional
+        '''
+            Indicates if the scenario can be played when the instance has not the sensor
+        '''
+        self.descriptor = None
+        '''
+            Sensor of the instance driven by the track, resolved when the scenario starts
+        '''
+
+        return
+
+
+class SimuScenario(object):
+    '''
+        Set of tracks played together. The values are computed in blocks with vectorised
+        signal generators, either for the whole run before it starts or one block ahead
+        during the run, so that no signal computation is left to the send loop but a
+        single block computation per block duration
+    '''
+
+    def __init__(self, duration=None, block_duration=10.):
+        '''
+            Constructor
+
+            @param duration: Duration of the scenario (seconds), None for an endless scenario
+            @type duration: float
+            @param block_duration: Duration of the blocks of values computed at once (seconds)
+            @type block_duration: float
+        '''
+
+        self.__duration = duration
+        '''
+            Duration of the scenario (seconds), None for an endless scenario
+        '''
+        self.__block_duration = float(block_duration)
+        '''
+            Duration of the blocks of values computed at once (seconds)
+        '''
+        self.__tracks = []
+        '''
+            Tracks of the scenario
+        '''
+        self.__block_index = 0
+        '''
+            Index of the next block to compute
+        '''
+        self.__blocks = None
+        '''
+            Precomputed blocks, None if the blocks are computed during the run
+        '''
+
+        return
+
+    def get_duration(self):
+        '''
+            Get the duration of the scenario
+
+            @return: Duration of the scenario (seconds), None for an endless scenario
+            @rtype: float
+        '''
+
+        return self.__duration
+
+    def get_tracks(self):
+        '''
+            Get the tracks of the scenario
+
+            @return: Tracks of the scenario
+            @rtype: [ SimuScenarioTrack ]
+        '''
+
+        return self.__tracks
+
+    def add_track(self, sensor, signal, rate, optional=False):
+        '''
+            Add a track to the scenario
+
+            @param sensor: Id or name of the sensor, or sensor type to drive the first sensor of this type
+            @type sensor: int or string or SimuSensorType
+            @param signal: Signal generator
+            @type signal: SimuSignal
+            @param rate: Update rate (Hz)
+            @type rate: float
+            @param optional: Indicates if the scenario can be played when the instance has not the sensor
+            @type optional: bool
+
+            @return: Added track
+            @rtype: SimuScenarioTrack
+        '''
+
+        track = SimuScenarioTrack(sensor, signal, rate, optional)
+        self.__tracks.append(track)
+
+        return track
+
+    def start(self, sensors, precompute=False):
+        '''
+            Resolve the sensors driven by the tracks and rewind the scenario
+
+            @param sensors: Sensor registry of the Open Vario simulated instance
+            @type sensors: SimuSensorRegistry
+            @param precompute: Indicates if the values of the whole run are computed now,
+                               ignored for an endless scenario
+            @type precompute: bool
+
+            @return: True if the sensors of all the mandatory tracks have been resolved, False otherwise
+            @rtype: bool
+        '''
+
+        ret = True
+        for track in self.__tracks:
+            track.descriptor = sensors.resolve(track.sensor)
+            if (track.descriptor == None) and (not track.optional):
+                ret = False
+            track.signal.reset()
+
+        self.__block_index = 0
+        self.__blocks = None
+        if ret and precompute and (not (self.__duration == None)):
+            blocks = []
+            block = self.next_block()
+            while not (block == None):
+                blocks.append(block)
+                block = self.next_block()
+            self.__blocks = blocks
+            self.__block_index = 0
+
+        return ret
+
+    def next_block(self):
+        '''
+            Get the updates of the next block
+
+            @return: Updates of the block sorted by time : [ (time since the start in seconds, [ (sensor id, value) ]) ],
+                     the updates of the tracks due at the same time being grouped, None at the end of the scenario
+            @rtype: [ (float, [ (int, int or float or bool or string) ]) ]
+        '''
+
+        ret = None
+        start_time = self.__block_index * self.__block_duration
+        if (self.__duration == None) or (start_time < self.__duration):
+            if self.__blocks == None:
+                end_time = start_time + self.__block_duration
+                if not (self.__duration == None):
+                    end_time = min(end_time, self.__duration)
+                ret = self.__compute_block(start_time, end_time)
+            elif self.__block_index < len(self.__blocks):
+                ret = self.__blocks[self.__block_index]
+            self.__block_index += 1
+
+        return ret
+
+    def updates(self):
+        '''
+            Iterate over the updates of the scenario
+
+            @return: Iterator over the updates sorted by time : (time since the start in seconds, [ (sensor id, value) ])
+            @rtype: iterator
+        '''
+
+        block = None
+        if self.__tracks:
+            block = self.next_block()
+        while not (block == None):
+            for update in block:
+                yield update
+            block = self.next_block()
+
+        return
+
+    def __compute_block(self, start_time, end_time):
+        '''
+            Compute the updates of a block
+
+            @param start_time: Start of the block (seconds, included)
+            @type start_time: float
+            @param end_time: End of the block (seconds, excluded)
+            @type end_time: float
+
+            @return: Updates of the block sorted by time
+            @rtype: [ (float, [ (int, int or float or bool or string) ]) ]
+        '''
+
+        times = []
+        ids = []
+        values = []
+        for track in self.__tracks:
+
+            # Sample times are computed as index / rate so that the tracks with different
+            # rates share exactly the same times when they are due together
+            first = int(math.ceil(start_time * track.rate - 1e-9))
+            last = int(math.ceil(end_time * track.rate - 1e-9))
+            if (last > first) and (not (track.descriptor == None)):
+                track_times = np.arange(first, last, dtype=np.float64) / track.rate
+                track_values = convert_values(track.signal.generate(track_times), track.descriptor.value_type)
+                if not (track_values == None):
+                    times.append(track_times)
+                    ids.extend([ track.descriptor.id ] * len(track_values))
+                    values.extend(track_values)
+
+        # Merge the tracks in time order, the order of the tracks being kept for the same time
+        ret = []
+        if times:
+            times = np.concatenate(times)
+            order = np.argsort(times, kind="mergesort")
+            sorted_times = times[order]
+            bounds = [ 0 ] + (np.flatnonzero(np.diff(sorted_times)) + 1).tolist() + [ len(order) ]
+            order = order.tolist()
+            sorted_times = sorted_times.tolist()
+            for index in range(len(bounds) - 1):
+                group = order[bounds[index]:bounds[index + 1]]
+                ret.append( (sorted_times[bounds[index]], [ (ids[i], values[i]) for i in group ]) )
+
+        return ret
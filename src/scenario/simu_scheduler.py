@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import time
+from array import array
+from collections import OrderedDict
+from enum import Enum
+from threading import Condition, Lock
+from scenario.simu_clock import SimuRealTimeClock
+
+
+####################################################
+#### Data types
+
+
+class SimuSchedulerPolicy(Enum):
+    '''
+        Handling of the updates which are late on their deadline
+    '''
+
+    CATCH_UP = 0
+    '''
+        Late updates are all sent as soon as possible, no sample is lost
+    '''
+    SKIP = 1
+    '''
+        Updates late beyond the tolerance are collapsed into a single request
+        holding the last value of each sensor, the timeline is kept
+    '''
+
+
+####################################################
+#### Classes
+
+
+class SimuSchedulerStats(object):
+    '''
+        Statistics of a scheduler run : request counters and lateness of the sent requests
+        on their deadline. The lateness percentiles are computed on the last requests only
+        so that the memory used by an endless run is bounded
+    '''
+
+    def __init__(self, history_size=4096):
+        '''
+            Constructor
+
+            @param history_size: Number of lateness values kept for the percentiles
+            @type history_size: int
+        '''
+
+        self.__counters = { "sent" : 0, "not_sent" : 0, "skipped" : 0, "late" : 0,
+                            "succeed" : 0, "failed" : 0, "lost" : 0 }
+        '''
+            Counters : sent requests, requests which could not be sent, skipped sensor values,
+            requests sent after the tolerance, and responses by status
+        '''
+        self.__history = array("d", [0.]) * max(1, history_size)
+        '''
+            Lateness of the last sent requests (seconds), circular buffer
+        '''
+        self.__history_count = 0
+        '''
+            Number of lateness values stored since the start
+        '''
+        self.__lateness_sum = 0.
+        '''
+            Sum of the lateness of all the sent requests (seconds)
+        '''
+        self.__lateness_max = 0.
+        '''
+            Maximum lateness of all the sent requests (seconds)
+        '''
+        self.__lock = Lock()
+        '''
+            Lock, the responses are counted from the receive thread of the protocol
+        '''
+
+        return
+
+    def add_sent(self, lateness, late):
+        '''
+            Count a sent request
+
+            @param lateness: Simulation time between the deadline of the request and its sending (seconds)
+            @type lateness: float
+            @param late: Indicates if the request has been sent after the tolerance
+            @type late: bool
+        '''
+
+        self.__lock.acquire()
+
+        self.__counters["sent"] += 1
+        if late:
+            self.__counters["late"] += 1
+        self.__history[self.__history_count % len(self.__history)] = lateness
+        self.__history_count += 1
+        self.__lateness_sum += lateness
+        self.__lateness_max = max(self.__lateness_max, lateness)
+
+        self.__lock.release()
+
+        return
+
+    def add_count(self, counter, count=1):
+        '''
+            Increment a counter
+
+            @param counter: Name of the counter : not_sent or skipped
+            @type counter: string
+            @param count: Increment
+            @type count: int
+        '''
+
+        self.__lock.acquire()
+        self.__counters[counter] += count
+        self.__lock.release()
+
+        return
+
+    def add_response(self, success):
+        '''
+            Count a response
+
+            @param success: Status of the update, None if no response has been received
+            @type success: bool
+        '''
+
+        self.__lock.acquire()
+
+        if success == None:
+            self.__counters["lost"] += 1
+        elif success:
+            self.__counters["succeed"] += 1
+        else:
+            self.__counters["failed"] += 1
+
+        self.__lock.release()
+
+        return
+
+    def get_count(self, counter):
+        '''
+            Get the value of a counter
+
+            @param counter: Name of the counter : sent, not_sent, skipped, late, succeed, failed or lost
+            @type counter: string
+
+            @return: Value of the counter
+            @rtype: int
+        '''
+
+        return self.__counters[counter]
+
+    def get_stats(self):
+        '''
+            Get the statistics
+
+            @return: Counters, mean and maximum lateness of all the requests (simulation microseconds) and
+                     lateness percentiles of the last requests : { "lateness_us" : { min, p50, p95, p99, max } }
+            @rtype: {string:value}
+        '''
+
+        self.__lock.acquire()
+
+        ret = dict(self.__counters)
+        count = min(self.__history_count, len(self.__history))
+        history = sorted(self.__history[:count])
+        sent = self.__counters["sent"]
+        ret["lateness_mean_us"] = 1000000. * self.__lateness_sum / sent if sent > 0 else 0.
+        ret["lateness_max_us"] = 1000000. * self.__lateness_max
+
+        self.__lock.release()
+
+        percentiles = {}
+        if history:
+            last = len(history) - 1
+            for name, ratio in (("min", 0.), ("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.)):
+                percentiles[name] = 1000000. * history[int(round(last * ratio))]
+        ret["lateness_us"] = percentiles
+
+        return ret
+
+
+class SimuScheduler(object):
+    '''
+        Sends the updates of a scenario on an absolute timeline given by a simulation clock : each
+        update has a deadline computed from the start of the run and its time in the scenario, so
+        the waiting and sending times never accumulate. The requests are sent without waiting for
+        their response, the responses are only counted in the statistics, except with a stepped
+        clock which is advanced once all the responses of the previous step are received
+    '''
+
+    MAX_SLEEP = 0.1
+    '''
+        Maximum duration of a single wait, so that a stop request is handled quickly (seconds)
+    '''
+
+    def __init__(self, send, policy=SimuSchedulerPolicy.CATCH_UP, tolerance=0.005, clock=None, poll=None):
+        '''
+            Constructor
+
+            @param send: Sends a sensor update request without waiting for its response, typically
+                         the update_sensor_values method of a SimuProtocol. Returns False if the request
+                         could not be sent and calls the callback with the update status otherwise
+            @type send: function([ (int, value) ], function(bool)) -> bool
+            @param policy: Handling of the late updates
+            @type policy: SimuSchedulerPolicy
+            @param tolerance: Lateness from which an update is considered late (simulation seconds)
+            @type tolerance: float
+            @param clock: Simulation clock, None for a real time clock
+            @type clock: SimuClock
+            @param poll: Waits for the responses and processes them when the protocol has no receive
+                         thread, typically the poll method of an AsyncSimuProtocol, None to sleep
+            @type poll: function(float)
+        '''
+
+        self.__send = send
+        '''
+            Sends a sensor update request without waiting for its response
+        '''
+        self.__policy = policy
+        '''
+            Handling of the late updates
+        '''
+        self.__tolerance = tolerance
+        '''
+            Lateness from which an update is considered late (simulation seconds)
+        '''
+        self.__clock = clock
+        '''
+            Simulation clock
+        '''
+        if clock == None:
+            self.__clock = SimuRealTimeClock()
+        self.__poll = poll
+        '''
+            Waits for the responses and processes them, None to sleep
+        '''
+        self.__stats = SimuSchedulerStats()
+        '''
+            Statistics of the current run
+        '''
+        self.__stop = False
+        '''
+            Indicates if the current run must be stopped
+        '''
+        self.__awaited = 0
+        '''
+            Number of sent requests awaiting a response
+        '''
+        self.__condition = Condition(Lock())
+        '''
+            Signaled when a response is received or when a stop is requested
+        '''
+
+        return
+
+    def get_clock(self):
+        '''
+            Get the simulation clock
+
+            @return: Simulation clock
+            @rtype: SimuClock
+        '''
+
+        return self.__clock
+
+    def get_stats(self):
+        '''
+            Get the statistics of the current or last run
+
+            @return: Statistics
+            @rtype: SimuSchedulerStats
+        '''
+
+        return self.__stats
+
+    def stop(self):
+        '''
+            Request the current run to stop, can be called from another thread
+        '''
+
+        self.__condition.acquire()
+        self.__stop = True
+        self.__condition.notify_all()
+        self.__condition.release()
+
+        return
+
+    def run(self, updates, is_running=None):
+        '''
+            Send updates on their deadline until the end of the updates, a stop request or
+            until is_running returns False
+
+            @param updates: Updates sorted by time : (time since the start in seconds, [ (sensor id, value) ]),
+                            typically the updates of a started SimuScenario
+            @type updates: iterator
+            @param is_running: Called before each update, the run stops when it returns False
+            @type is_running: function() -> bool
+
+            @return: True if all the updates have been handled, False if the run has been stopped
+            @rtype: bool
+        '''
+
+        self.__stats = SimuSchedulerStats()
+        self.__stop = False
+        self.__awaited = 0
+        stats = self.__stats
+        clock = self.__clock
+        stepped = clock.is_stepped()
+
+        ret = True
+        updates = iter(updates)
+        pending = next(updates, None)
+        clock.start()
+        while not (pending == None):
+
+            if self.__stop or ((not (is_running == None)) and (not is_running())):
+                ret = False
+                break
+
+            # The clock is advanced in lock-step once the previous step is acknowledged
+            if stepped and (self.__awaited > 0):
+                self.__wait_responses()
+                continue
+
+            # Wait for the deadline of the update
+            update_time, values = pending
+            delay = clock.get_delay(update_time)
+            if delay > 0:
+                self.__wait(min(delay, self.MAX_SLEEP))
+                continue
+            now = clock.get_time()
+            pending = next(updates, None)
+
+            # Collapse the updates which are already due into the last one
+            lateness = now - update_time
+            late = lateness > self.__tolerance
+            if late and (self.__policy == SimuSchedulerPolicy.SKIP):
+                merged = None
+                while (not (pending == None)) and (pending[0] <= now):
+                    if merged == None:
+                        merged = OrderedDict(values)
+                    count = len(merged) + len(pending[1])
+                    merged.update(pending[1])
+                    stats.add_count("skipped", count - len(merged))
+                    lateness = now - pending[0]
+                    pending = next(updates, None)
+                if not (merged == None):
+                    values = merged.items()
+                    late = lateness > self.__tolerance
+
+            # Send the update without waiting for the response. A send refused while previous
+            # updates await their response is due to a full request window, the same update
+            # is sent again once a response has been received
+            deadline = now - lateness
+            while True:
+                self.__condition.acquire()
+                self.__awaited += 1
+                self.__condition.release()
+                if self.__send(values, self.__on_response):
+                    stats.add_sent(lateness, late)
+                    break
+                self.__on_response(False, False)
+                if ((self.__awaited == 0) or self.__stop or
+                    ((not (is_running == None)) and (not is_running()))):
+                    stats.add_count("not_sent")
+                    break
+                self.__wait_responses(self.__awaited - 1)
+                lateness = clock.get_time() - deadline
+                late = lateness > self.__tolerance
+
+        # The last step is complete once acknowledged
+        while stepped and ret and (self.__awaited > 0) and (not self.__stop):
+            self.__wait_responses()
+
+        return ret
+
+    def __wait(self, timeout):
+        '''
+            Wait for a deadline, processing the responses meanwhile if the protocol has no receive thread
+
+            @param timeout: Maximum time to wait (seconds)
+            @type timeout: float
+        '''
+
+        if self.__poll == None:
+            time.sleep(timeout)
+        else:
+            self.__poll(timeout)
+
+        return
+
+    def __wait_responses(self, awaited=0):
+        '''
+            Wait for the responses of the sent requests, or for a stop request
+
+            @param awaited: Number of requests which may still await a response at the end of the wait
+            @type awaited: int
+        '''
+
+        if self.__poll == None:
+
+            # The protocol times out the requests awaiting a response, so the wait is bounded
+            # without using a wait timeout which would poll the condition on Python 2
+            self.__condition.acquire()
+            while (self.__awaited > awaited) and (not self.__stop):
+                self.__condition.wait()
+            self.__condition.release()
+
+        else:
+            self.__poll(self.MAX_SLEEP)
+
+        return
+
+    def __on_response(self, success, count=True):
+        '''
+            Called when the response of a request is received
+
+            @param success: Status of the update, None if no response has been received
+            @type success: bool
+            @param count: Indicates if the response is counted in the statistics
+            @type count: bool
+        '''
+
+        if count:
+            self.__stats.add_response(success)
+
+        self.__condition.acquire()
+        self.__awaited -= 1
+        self.__condition.notify_all()
+        self.__condition.release()
+
+        return
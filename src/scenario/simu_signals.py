@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import numpy as np
+
+
+####################################################
+#### Data types
+
+
+####################################################
+#### Classes
+
+
+class SimuSignal(object):
+    '''
+        Signal generator computing the values of a sensor for a block of sample times.
+        Blocks are requested in increasing time order, a signal instance is used by a single track
+    '''
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+        return np.zeros(len(times))
+
+    def reset(self):
+        '''
+            Rewind the signal to the start of the scenario
+        '''
+        return
+
+
+class SimuConstantSignal(SimuSignal):
+    '''
+        Constant value
+    '''
+
+    def __init__(self, value):
+        '''
+            Constructor
+
+            @param value: Value of the signal
+            @type value: float
+        '''
+
+        self.__value = value
+        '''
+            Value of the signal
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        return np.full(len(times), self.__value, dtype=np.float64)
+
+
+class SimuRampSignal(SimuSignal):
+    '''
+        Linear ramp between two values, constant before its start and after its end
+    '''
+
+    def __init__(self, start_value, end_value, duration, start_time=0.):
+        '''
+            Constructor
+
+            @param start_value: Value at the start of the ramp
+            @type start_value: float
+            @param end_value: Value at the end of the ramp
+            @type end_value: float
+            @param duration: Duration of the ramp (seconds)
+            @type duration: float
+            @param start_time: Start of the ramp since the start of the scenario (seconds)
+            @type start_time: float
+        '''
+
+        self.__start_value = float(start_value)
+        '''
+            Value at the start of the ramp
+        '''
+        self.__end_value = float(end_value)
+        '''
+            Value at the end of the ramp
+        '''
+        self.__duration = float(duration)
+        '''
+            Duration of the ramp (seconds)
+        '''
+        self.__start_time = float(start_time)
+        '''
+            Start of the ramp since the start of the scenario (seconds)
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        if self.__duration > 0:
+            ratio = np.clip((times - self.__start_time) / self.__duration, 0., 1.)
+        else:
+            ratio = (times >= self.__start_time).astype(np.float64)
+        return self.__start_value + (self.__end_value - self.__start_value) * ratio
+
+
+class SimuSineSignal(SimuSignal):
+    '''
+        Sine wave around an offset
+    '''
+
+    def __init__(self, offset, amplitude, period, phase=0.):
+        '''
+            Constructor
+
+            @param offset: Mean value of the wave
+            @type offset: float
+            @param amplitude: Amplitude of the wave
+            @type amplitude: float
+            @param period: Period of the wave (seconds)
+            @type period: float
+            @param phase: Phase of the wave at the start of the scenario (radians)
+            @type phase: float
+        '''
+
+        self.__offset = float(offset)
+        '''
+            Mean value of the wave
+        '''
+        self.__amplitude = float(amplitude)
+        '''
+            Amplitude of the wave
+        '''
+        self.__pulsation = 2. * np.pi / period
+        '''
+            Pulsation of the wave (radians per second)
+        '''
+        self.__phase = float(phase)
+        '''
+            Phase of the wave at the start of the scenario (radians)
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        return self.__offset + self.__amplitude * np.sin(self.__pulsation * times + self.__phase)
+
+
+class SimuTriangleSignal(SimuSignal):
+    '''
+        Triangle wave between a minimum and a maximum value
+    '''
+
+    def __init__(self, min_value, max_value, period, phase=0.):
+        '''
+            Constructor
+
+            @param min_value: Minimum value of the wave
+            @type min_value: float
+            @param max_value: Maximum value of the wave
+            @type max_value: float
+            @param period: Period of the wave (seconds)
+            @type period: float
+            @param phase: Time since the wave minimum at the start of the scenario (seconds)
+            @type phase: float
+        '''
+
+        self.__min_value = float(min_value)
+        '''
+            Minimum value of the wave
+        '''
+        self.__max_value = float(max_value)
+        '''
+            Maximum value of the wave
+        '''
+        self.__period = float(period)
+        '''
+            Period of the wave (seconds)
+        '''
+        self.__phase = float(phase)
+        '''
+            Time since the wave minimum at the start of the scenario (seconds)
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        # Position in the period : rising during the first half, falling during the second one
+        position = np.mod(times + self.__phase, self.__period) / self.__period
+        ratio = 1. - np.abs(2. * position - 1.)
+        return self.__min_value + (self.__max_value - self.__min_value) * ratio
+
+
+class SimuNoiseSignal(SimuSignal):
+    '''
+        Gaussian noise added to another signal, reproducible for a given seed
+    '''
+
+    def __init__(self, sigma, signal=None, seed=0):
+        '''
+            Constructor
+
+            @param sigma: Standard deviation of the noise
+            @type sigma: float
+            @param signal: Signal the noise is added to, None for a noise around 0
+            @type signal: SimuSignal
+            @param seed: Seed of the random generator
+            @type seed: int
+        '''
+
+        self.__sigma = float(sigma)
+        '''
+            Standard deviation of the noise
+        '''
+        self.__signal = signal
+        '''
+            Signal the noise is added to
+        '''
+        self.__seed = seed
+        '''
+            Seed of the random generator
+        '''
+        self.__random = np.random.RandomState(seed)
+        '''
+            Random generator, the blocks being requested in order the sequence is reproducible
+        '''
+
+        return
+
+    def reset(self):
+        '''
+            Rewind the signal to the start of the scenario
+        '''
+
+        self.__random = np.random.RandomState(self.__seed)
+        if not (self.__signal == None):
+            self.__signal.reset()
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        values = self.__random.normal(0., self.__sigma, len(times))
+        if not (self.__signal == None):
+            values += self.__signal.generate(times)
+
+        return values
+
+
+class SimuSumSignal(SimuSignal):
+    '''
+        Sum of several signals
+    '''
+
+    def __init__(self, signals):
+        '''
+            Constructor
+
+            @param signals: Signals to add
+            @type signals: [ SimuSignal ]
+        '''
+
+        self.__signals = list(signals)
+        '''
+            Signals to add
+        '''
+
+        return
+
+    def reset(self):
+        '''
+            Rewind the signal to the start of the scenario
+        '''
+
+        for signal in self.__signals:
+            signal.reset()
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        values = np.zeros(len(times))
+        for signal in self.__signals:
+            values += signal.generate(times)
+
+        return values
+
+
+class SimuPiecewiseSignal(SimuSignal):
+    '''
+        Signal defined by a table of (time, value) points, linearly interpolated or held
+        between the points and held before the first point and after the last one
+    '''
+
+    def __init__(self, points, interpolate=True):
+        '''
+            Constructor
+
+            @param points: Points of the signal sorted by time : [ (time in seconds, value) ]
+            @type points: [ (float, float) ]
+            @param interpolate: Indicates if the values are linearly interpolated between the points,
+                                otherwise the value of a point is held until the next point
+            @type interpolate: bool
+        '''
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.__times = points[:, 0].copy()
+        '''
+            Times of the points (seconds)
+        '''
+        self.__values = points[:, 1].copy()
+        '''
+            Values of the points
+        '''
+        self.__interpolate = interpolate
+        '''
+            Indicates if the values are linearly interpolated between the points
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        if self.__interpolate:
+            ret = np.interp(times, self.__times, self.__values)
+        else:
+            indexes = np.searchsorted(self.__times, times, side="right") - 1
+            ret = self.__values[np.clip(indexes, 0, len(self.__values) - 1)]
+
+        return ret
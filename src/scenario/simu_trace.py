@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import os
+import numpy as np
+from scenario.simu_signals import SimuSignal
+
+
+####################################################
+#### Data types
+
+TRACE_TAIL_SIZE = 4096
+'''
+    Size of the end of a CSV file first read to find the last valid row, doubled until one is found (bytes)
+'''
+
+TRACE_REMAP_SIZE = 8 * 1024 * 1024
+'''
+    Size of the rows of a .npy file read between two mappings of the file (bytes) : the pages
+    of a mapping stay resident once read, so the file is mapped again to release them
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuSensorTrace(object):
+    '''
+        Sensor values recorded as the columns of a CSV file or of a 2 dimensions NumPy .npy file,
+        one row per sample and a column holding the sample time in seconds. The file is read in
+        chunks of rows as the sample times progress, a .npy file being mapped in memory, and only
+        the rows around the last requested block are kept : the memory used depends on the chunk
+        size and on the block duration, not on the size of the file. The times are counted from
+        the first row. The rows of a CSV file which cannot be parsed are skipped and counted
+    '''
+
+    def __init__(self, path, names=None, time_column=0, delimiter=",", chunk_size=4096):
+        '''
+            Constructor
+
+            @param path: Path of the trace file, .npy files are mapped in memory
+            @type path: string
+            @param names: Names of the columns, None to read them from the first line of a CSV file
+                          or to name the columns of a .npy file by their index
+            @type names: [ string ]
+            @param time_column: Index of the time column
+            @type time_column: int
+            @param delimiter: Delimiter of the columns of a CSV file
+            @type delimiter: string
+            @param chunk_size: Number of rows read at once
+            @type chunk_size: int
+        '''
+
+        self.__path = path
+        '''
+            Path of the trace file
+        '''
+        self.__names = names
+        '''
+            Names of the columns
+        '''
+        self.__time_column = time_column
+        '''
+            Index of the time column
+        '''
+        self.__delimiter = delimiter
+        '''
+            Delimiter of the columns of a CSV file
+        '''
+        self.__chunk_size = max(1, chunk_size)
+        '''
+            Number of rows read at once
+        '''
+        self.__file = None
+        '''
+            Opened CSV file
+        '''
+        self.__array = None
+        '''
+            Array mapped on the .npy file
+        '''
+        self.__position = 0
+        '''
+            Index of the next row to read from the .npy file
+        '''
+        self.__start_time = 0.
+        '''
+            Time of the first row (seconds)
+        '''
+        self.__window = None
+        '''
+            Rows around the last requested block, times counted from the first row
+        '''
+        self.__eof = True
+        '''
+            Indicates if all the rows of the file have been read
+        '''
+        self.__invalid_count = 0
+        '''
+            Number of rows skipped because they cannot be parsed
+        '''
+
+        return
+
+    def open(self):
+        '''
+            Open the trace file and read its first chunk of rows
+
+            @return: True if the file contains at least one row, False otherwise
+            @rtype: bool
+        '''
+
+        self.close()
+        self.__eof = False
+        self.__invalid_count = 0
+        window = None
+        try:
+            if self.__path.lower().endswith(".npy"):
+                array = np.load(self.__path, mmap_mode="r")
+                if array.ndim == 2:
+                    self.__array = array
+                    self.__position = 0
+                    if self.__names == None:
+                        self.__names = [ str(index) for index in range(array.shape[1]) ]
+                    window = self.__read_chunk()
+            else:
+                self.__file = open(self.__path, "rb")
+                if self.__names == None:
+                    header = self.__file.readline().strip()
+                    self.__names = [ name.strip() for name in header.split(self.__delimiter) ]
+                window = self.__read_chunk()
+        except (IOError, OSError, ValueError):
+            window = None
+
+        ret = (not (window is None)) and (len(window) > 0)
+        if ret:
+            self.__start_time = float(window[0, self.__time_column])
+            window[:, self.__time_column] -= self.__start_time
+            self.__window = window
+        else:
+            self.close()
+
+        return ret
+
+    def close(self):
+        '''
+            Close the trace file
+        '''
+
+        if not (self.__file == None):
+            self.__file.close()
+            self.__file = None
+        self.__array = None
+        self.__window = None
+        self.__eof = True
+
+        return
+
+    def get_names(self):
+        '''
+            Get the names of the columns
+
+            @return: Names of the columns, None if not known before the file is opened
+            @rtype: [ string ]
+        '''
+
+        return self.__names
+
+    def get_invalid_count(self):
+        '''
+            Get the number of rows of a CSV file skipped because they cannot be parsed, for the
+            rows read so far
+
+            @return: Number of skipped rows
+            @rtype: int
+        '''
+
+        return self.__invalid_count
+
+    def get_duration(self):
+        '''
+            Get the duration of the trace, from the first row to the last valid one. A CSV file is
+            read backwards from its end until a valid row is found
+
+            @return: Duration of the trace (seconds), None if the file is not opened or cannot be read
+            @rtype: float
+        '''
+
+        ret = None
+        if not (self.__array is None):
+            ret = float(self.__array[-1, self.__time_column]) - self.__start_time
+        elif not (self.__window is None):
+            try:
+                with open(self.__path, "rb") as trace_file:
+                    trace_file.seek(0, os.SEEK_END)
+                    end = trace_file.tell()
+                    size = TRACE_TAIL_SIZE
+                    start = end
+                    while (ret == None) and (start > 0):
+
+                        # The first line is either partial or the header at the start of the file
+                        start = max(0, end - size)
+                        trace_file.seek(start)
+                        lines = trace_file.read(end - start).splitlines()[1:]
+                        for line in reversed(lines):
+                            row = self.__parse_lines([ line ])[0]
+                            if len(row) > 0:
+                                ret = float(row[0, self.__time_column]) - self.__start_time
+                                break
+                        size *= 2
+            except (IOError, OSError):
+                ret = None
+
+        return ret
+
+    def compute(self, times, column, interpolate=True):
+        '''
+            Compute the values of a column at sample times
+
+            @param times: Sample times since the first row (seconds), increasing and not older
+                          than the first sample time of the previous call
+            @type times: numpy.ndarray
+            @param column: Index of the column
+            @type column: int
+            @param interpolate: Indicates if the values are linearly interpolated between the rows,
+                                otherwise the value of a row is held until the next row
+            @type interpolate: bool
+
+            @return: Values of the column, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) > 0:
+            self.__slide(times[0], times[-1])
+        window = self.__window
+        row_times = window[:, self.__time_column]
+
+        if interpolate:
+            ret = np.interp(times, row_times, window[:, column])
+        else:
+            indexes = np.searchsorted(row_times, times, side="right") - 1
+            ret = window[np.clip(indexes, 0, len(row_times) - 1), column]
+
+        return ret
+
+    def add_tracks(self, scenario, rate, columns=None, interpolate=True):
+        '''
+            Add the tracks of the columns to a scenario, the sensors being resolved when
+            the scenario starts. Must be called once the trace is opened
+
+            @param scenario: Scenario to add the tracks to
+            @type scenario: SimuScenario
+            @param rate: Update rate of the sensors (Hz)
+            @type rate: float
+            @param columns: Sensor driven by each column : { column name : sensor id or name }, None to
+                            drive the sensors named as the columns, the columns without such sensor
+                            being ignored when the scenario starts
+            @type columns: {string:int or string}
+            @param interpolate: Indicates if the values are linearly interpolated between the rows,
+                                otherwise the value of a row is held until the next row
+            @type interpolate: bool
+
+            @return: Added tracks, None if a column does not exist
+            @rtype: [ SimuScenarioTrack ]
+        '''
+
+        optional = (columns == None)
+        if optional:
+            columns = dict( (name, name) for index, name in enumerate(self.__names) if not (index == self.__time_column) )
+
+        ret = None
+        if all( (name in self.__names) for name in columns ):
+            ret = []
+            for name in sorted(columns):
+                signal = SimuSensorTraceSignal(self, self.__names.index(name), interpolate)
+                ret.append(scenario.add_track(columns[name], signal, rate, optional))
+
+        return ret
+
+    def __slide(self, start_time, end_time):
+        '''
+            Move the window of rows so that it covers a block of sample times
+
+            @param start_time: First sample time of the block (seconds)
+            @type start_time: float
+            @param end_time: Last sample time of the block (seconds)
+            @type end_time: float
+        '''
+
+        # Forget the rows preceding the last one before the block
+        window = self.__window
+        first = np.searchsorted(window[:, self.__time_column], start_time, side="right") - 1
+        if first > 0:
+            window = window[first:]
+
+        # Read the rows up to the first one after the block
+        chunks = [ window ]
+        last_time = window[-1, self.__time_column]
+        while (not self.__eof) and (last_time < end_time):
+            chunk = self.__read_chunk()
+            if (chunk is None) or (len(chunk) == 0):
+                self.__eof = True
+            else:
+                chunk[:, self.__time_column] -= self.__start_time
+                chunks.append(chunk)
+                last_time = chunk[-1, self.__time_column]
+
+        # The window is copied so that the rows which are not needed anymore are released
+        if (len(chunks) > 1) or (first > 0):
+            self.__window = np.concatenate(chunks)
+
+        return
+
+    def __read_chunk(self):
+        '''
+            Read the next chunk of rows
+
+            @return: Rows as float64, an empty array at the end of the file
+            @rtype: numpy.ndarray
+        '''
+
+        if not (self.__array is None):
+            array = self.__array
+            position = self.__position
+            chunk = np.array(array[position:position + self.__chunk_size], dtype=np.float64)
+            self.__position += len(chunk)
+            if (self.__position * array.strides[0]) // TRACE_REMAP_SIZE > (position * array.strides[0]) // TRACE_REMAP_SIZE:
+                self.__array = np.load(self.__path, mmap_mode="r")
+        else:
+
+            # Chunks whose rows are all invalid are skipped, only the end of the file gives an empty chunk
+            chunk = np.empty((0, len(self.__names)))
+            while len(chunk) == 0:
+                lines = []
+                for _ in range(self.__chunk_size):
+                    line = self.__file.readline()
+                    if not line:
+                        break
+                    lines.append(line)
+                if not lines:
+                    break
+                chunk, invalid_count = self.__parse_lines(lines)
+                self.__invalid_count += invalid_count
+
+        return chunk
+
+    def __parse_lines(self, lines):
+        '''
+            Parse lines of a CSV file, the lines which cannot be parsed are skipped
+
+            @param lines: Lines of the file
+            @type lines: [ string ]
+
+            @return: Rows as float64 and number of skipped lines
+            @rtype: (numpy.ndarray, int)
+        '''
+
+        # All the lines are parsed at once by NumPy, the line endings being replaced by delimiters.
+        # The parsing stops at the first field which is not a number, so all the fields must have
+        # been parsed, otherwise the lines are parsed one by one to skip the invalid ones
+        delimiter = self.__delimiter
+        if delimiter.strip():
+            count_fields = lambda text: text.count(delimiter) + 1
+        else:
+            count_fields = lambda text: len(text.split())
+        count = len(self.__names)
+        lines = [ line.strip() for line in lines if line.strip() ]
+        text = delimiter.join(lines)
+        values = np.fromstring(text, dtype=np.float64, sep=delimiter) if text else np.empty(0)
+        invalid_count = 0
+        if (not text) or (len(values) == len(lines) * count == count_fields(text)):
+            rows = values.reshape(-1, count)
+        else:
+            rows = []
+            for line in lines:
+                row = np.fromstring(line, dtype=np.float64, sep=delimiter)
+                if len(row) == count == count_fields(line):
+                    rows.append(row)
+                else:
+                    invalid_count += 1
+            rows = np.array(rows, dtype=np.float64).reshape(-1, count)
+
+        # The time must be a finite number to locate the rows
+        valid = np.isfinite(rows[:, self.__time_column])
+        if not valid.all():
+            invalid_count += len(rows) - np.count_nonzero(valid)
+            rows = rows[valid]
+
+        return (rows, invalid_count)
+
+
+class SimuSensorTraceSignal(SimuSignal):
+    '''
+        Values of a column of a sensor trace
+    '''
+
+    def __init__(self, trace, column, interpolate=True):
+        '''
+            Constructor
+
+            @param trace: Sensor trace, several signals can share the same trace
+            @type trace: SimuSensorTrace
+            @param column: Index of the column
+            @type column: int
+            @param interpolate: Indicates if the values are linearly interpolated between the rows,
+                                otherwise the value of a row is held until the next row
+            @type interpolate: bool
+        '''
+
+        self.__trace = trace
+        '''
+            Sensor trace
+        '''
+        self.__column = column
+        '''
+            Index of the column
+        '''
+        self.__interpolate = interpolate
+        '''
+            Indicates if the values are linearly interpolated between the rows
+        '''
+
+        return
+
+    def generate(self, times):
+        '''
+            Compute the values of the signal
+
+            @param times: Sample times since the start of the scenario (seconds), increasing
+            @type times: numpy.ndarray
+
+            @return: Values of the signal, one per sample time
+            @rtype: numpy.ndarray
+        '''
+
+        return self.__trace.compute(times, self.__column, self.__interpolate)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from com.simu_capture import SimuCaptureRecorder, SimuCaptureMap
+
+
+####################################################
+#### Classes
+
+
+class SimuCaptureMapTest(unittest.TestCase):
+    '''
+        Index of the capture files mapped by SimuCaptureMap
+    '''
+
+    def setUp(self):
+        '''
+            Create the directory of the capture files
+        '''
+
+        self.__directory = tempfile.mkdtemp()
+
+        return
+
+    def tearDown(self):
+        '''
+            Remove the directory of the capture files
+        '''
+
+        shutil.rmtree(self.__directory)
+
+        return
+
+    def test_index_rewritten_capture(self):
+        '''
+            The index of a capture is rebuilt when the capture is rewritten with the same size
+        '''
+
+        path = os.path.join(self.__directory, "capture.ovs")
+
+        # First capture, all the frames are recorded at once
+        self.__record(path, 0)
+        capture_map = SimuCaptureMap(4)
+        self.assertTrue(capture_map.open(path))
+        capture_map.close()
+
+        # Second capture of the same size with spread timestamps
+        self.__record(path, 0.02)
+        capture_map = SimuCaptureMap(4)
+        self.assertTrue(capture_map.open(path))
+        try:
+            frames = list(capture_map.frames())
+            start = frames[len(frames) // 2][1]
+            self.assertEqual(list(capture_map.frames(start)), [ frame for frame in frames if frame[1] >= start ])
+        finally:
+            capture_map.close()
+
+        return
+
+    def __record(self, path, period):
+        '''
+            Record a capture file
+
+            @param path: Path of the capture file
+            @type path: string
+            @param period: Time between two frames (seconds)
+            @type period: float
+        '''
+
+        recorder = SimuCaptureRecorder(4)
+        self.assertTrue(recorder.open(path))
+        for index in range(12):
+            recorder.record_tx("R" + chr(index))
+            if period > 0:
+                time.sleep(period)
+        recorder.close()
+
+        return
+
+
+if  __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import unittest
+from com.simu_config import SimuConfigValue
+from com.simu_fake_instance import SimuFakeInstance, SIMU_FAKE_CONFIG
+from com.simu_protocol import SimuProtocol
+from com.simu_sync_protocol import SimuSyncProtocol, SimuSyncProtocolListener
+
+
+####################################################
+#### Data types
+
+TEST_TARGET_PORT = 46678
+'''
+    Port of the fake instance
+'''
+
+TEST_HOST_PORT = 46679
+'''
+    Port of the simulator
+'''
+
+TEST_REQUEST_TIMEOUT = 0.5
+'''
+    Request timeout of the protocol, shorter than the latency of the late responses (seconds)
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuConfigDumpTest(unittest.TestCase):
+    '''
+        Configuration dumps against a fake instance, the values must be read under their
+        group ID and value ID whatever the impairments
+    '''
+
+    def test_dump(self):
+        '''
+            Dump without impairments
+        '''
+
+        self.__check_dump()
+
+        return
+
+    def test_dump_late(self):
+        '''
+            Dump with responses received after the request timeout
+        '''
+
+        for seed in (1, 3, 4):
+            self.__check_dump(latency=0.2, jitter=0.6, seed=seed)
+
+        return
+
+    def test_dump_lossy(self):
+        '''
+            Dump with lost and late responses
+        '''
+
+        # With these seeds the connect response is not lost
+        for seed in (3, 7):
+            self.__check_dump(latency=0.1, jitter=0.6, loss=0.2, seed=seed)
+
+        return
+
+    def __check_dump(self, **impairments):
+        '''
+            Dump the configuration of a fake instance and compare it with the configuration of the instance
+
+            @param impairments: Impairments of the fake instance
+            @type impairments: {string:value}
+        '''
+
+        instance = SimuFakeInstance(TEST_TARGET_PORT, notification_period=0, **impairments)
+        self.assertTrue(instance.start())
+        protocol = SimuProtocol("127.0.0.1", TEST_TARGET_PORT, TEST_HOST_PORT, request_timeout=TEST_REQUEST_TIMEOUT)
+        sync_protocol = SimuSyncProtocol(protocol, timeout=4 * TEST_REQUEST_TIMEOUT)
+        try:
+
+            self.assertTrue(sync_protocol.connect(SimuSyncProtocolListener()), str(impairments))
+
+            values = sync_protocol.dump_config()
+            self.assertFalse(values == None, str(impairments))
+            dumped = [ (value.group_id, value.value_id, value.group_name, value.name, value.value) for value in values ]
+            expected = [ (group_id, value_id, group_name, value[0], value[2])
+                         for group_id, (group_name, group_values) in enumerate(SIMU_FAKE_CONFIG)
+                         for value_id, value in enumerate(group_values) ]
+            self.assertEqual(dumped, expected, str(impairments))
+
+        finally:
+            sync_protocol.close()
+            instance.stop()
+
+        return
+
+
+class SimuConfigRestoreTest(unittest.TestCase):
+    '''
+        Configuration restores against a fake instance
+    '''
+
+    def test_restore(self):
+        '''
+            Restore writing only the value which differs
+        '''
+
+        values = self.__get_snapshot()
+        values[4].value = -2.
+        self.assertEqual(self.__restore(values), [ (1, 1, -2., values[4].value_type) ])
+
+        return
+
+    def test_restore_retried(self):
+        '''
+            Restore refused since a read of the dump has been sent again
+        '''
+
+        values = self.__get_snapshot()
+        values[4].value = -2.
+        self.assertEqual(self.__restore(values, latency=0.1, jitter=0.6, loss=0.2, seed=3), None)
+
+        return
+
+    def __get_snapshot(self):
+        '''
+            Build the configuration values of the fake instance
+
+            @return: Configuration values of the fake instance
+            @rtype: [ SimuConfigValue ]
+        '''
+
+        return [ SimuConfigValue(group_id, value_id, group_name, value[0], "", 0, value[1], value[2], value[3], value[4], value[5])
+                 for group_id, (group_name, group_values) in enumerate(SIMU_FAKE_CONFIG)
+                 for value_id, value in enumerate(group_values) ]
+
+    def __restore(self, values, **impairments):
+        '''
+            Restore configuration values to a fake instance
+
+            @param values: Configuration values to apply
+            @type values: [ SimuConfigValue ]
+            @param impairments: Impairments of the fake instance
+            @type impairments: {string:value}
+
+            @return: Result of the restore
+            @rtype: [ (int, int, int or float or bool or string, SimuSensorValueType) ]
+        '''
+
+        instance = SimuFakeInstance(TEST_TARGET_PORT, notification_period=0, **impairments)
+        self.assertTrue(instance.start())
+        protocol = SimuProtocol("127.0.0.1", TEST_TARGET_PORT, TEST_HOST_PORT, request_timeout=TEST_REQUEST_TIMEOUT)
+        sync_protocol = SimuSyncProtocol(protocol, timeout=4 * TEST_REQUEST_TIMEOUT)
+        try:
+            self.assertTrue(sync_protocol.connect(SimuSyncProtocolListener()), str(impairments))
+            ret = sync_protocol.restore_config(values)
+        finally:
+            sync_protocol.close()
+            instance.stop()
+
+        return ret
+
+
+if  __name__ == '__main__':
+    unittest.main()
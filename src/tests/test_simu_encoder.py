@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import unittest
+from api.requests_pb2 import SimuRequest
+from com.simu_protocol import SimuSensorValueType
+from com.simu_encoder import SimuUpdateSensorEncoder
+
+
+####################################################
+#### Data types
+
+TEST_ENCODER_VALUES = [ ("uint_value", SimuSensorValueType.UINT, [ 0, 1, 127, 128, 16383, 16384, 101325, 0xFFFFFFFF ]),
+                        ("int_value", SimuSensorValueType.INT, [ 0, 1, -1, 63, -64, 64, -65, -8192, 0x7FFFFFFF, -0x7FFFFFFF, -0x80000000 ]),
+                        ("float_value", SimuSensorValueType.FLOAT, [ 0., -0., 1., -21.5, 0.1, 1e-45, -1e-45, 1.1754943508222875e-38,
+                                                                     3.4028234663852886e38, -3.4028234663852886e38,
+                                                                     float("inf"), float("-inf") ]),
+                        ("double_value", SimuSensorValueType.DOUBLE, [ 0., -0., 45.18765, 0.1, 5e-324, -5e-324, 1.7976931348623157e308,
+                                                                       -1.7976931348623157e308, float("inf"), float("-inf") ]),
+                        ("string_value", SimuSensorValueType.STRING, [ "", u"", "a", "x" * 127, "x" * 128, "x" * 16384, u"\u00b0C" ]),
+                        ("bool_value", SimuSensorValueType.BOOL, [ True, False ]) ]
+'''
+    Values of the encoder tests : [ (name of the oneof field, value type, [ values ]) ]
+'''
+
+TEST_ENCODER_IDS = [ 0, 1, 127, 128, 0xFFFFFFFF ]
+'''
+    Sensor ids of the encoder tests
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuUpdateSensorEncoderTest(unittest.TestCase):
+    '''
+        The output of SimuUpdateSensorEncoder must be identical to the protobuf serialization
+    '''
+
+    def test_update_sensor(self):
+        '''
+            A request per sensor value
+        '''
+
+        encoder = SimuUpdateSensorEncoder()
+        for field, value_type, values in TEST_ENCODER_VALUES:
+            for id in TEST_ENCODER_IDS:
+                for value in values:
+                    req = SimuRequest()
+                    req.update_sensor.id = id
+                    setattr(req.update_sensor, field, value)
+                    expected = req.SerializeToString()
+                    self.assertEqual(encoder.encode_update_sensor(id, value, value_type), expected, repr((id, value, value_type)))
+
+                    # Checked encoding of the protocol
+                    inner = encoder.get_sensor_encoder(id, value_type).encode_checked(value)
+                    self.assertEqual(encoder.encode_update_sensor_fields(inner), expected, repr((id, value, value_type)))
+
+        return
+
+    def test_update_sensors(self):
+        '''
+            A single request for all the sensor values
+        '''
+
+        encoder = SimuUpdateSensorEncoder()
+        req = SimuRequest()
+        updates = []
+        for field, value_type, values in TEST_ENCODER_VALUES:
+            for id in TEST_ENCODER_IDS:
+                for value in values:
+                    update_sensor = req.update_sensors.sensors.add()
+                    update_sensor.id = id
+                    setattr(update_sensor, field, value)
+                    updates.append((id, value, value_type))
+        self.assertEqual(encoder.encode_update_sensors(updates), req.SerializeToString())
+
+        return
+
+    def test_rejected_values(self):
+        '''
+            Out of range values are rejected
+        '''
+
+        encoder = SimuUpdateSensorEncoder()
+        for id, value, value_type in ((1, -1, SimuSensorValueType.UINT), (1, 0x100000000, SimuSensorValueType.UINT),
+                                      (1, 0x80000000, SimuSensorValueType.INT), (1, -0x80000001, SimuSensorValueType.INT),
+                                      (1, "x", SimuSensorValueType.DOUBLE), (-1, 0, SimuSensorValueType.UINT)):
+            self.assertEqual(encoder.encode_update_sensor(id, value, value_type), None, repr((id, value, value_type)))
+
+        return
+
+
+if  __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+'''
+
+Copyright(c) 2017 Cedric Jimenez
+
+This file is part of Open-Vario Simulator.
+
+Open-Vario Simulator is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Open-Vario Simulator is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with Open-Vario Simulator.  If not, see <http://www.gnu.org/licenses/>.
+
+'''
+
+
+####################################################
+#### Imports
+import unittest
+from com.simu_fake_instance import SimuFakeInstance
+from com.simu_reactor import SimuReactor
+
+
+####################################################
+#### Data types
+
+TEST_TARGET_PORT = 46678
+'''
+    Port of the fake instance
+'''
+
+TEST_HOST_PORT = 46679
+'''
+    Port of the simulator
+'''
+
+
+####################################################
+#### Classes
+
+
+class SimuProtocolTimeoutTest(unittest.TestCase):
+    '''
+        Timeouts of the protocol driven by a reactor
+    '''
+
+    def test_next_timeout_in_flight(self):
+        '''
+            The keep-alive period does not bound the wait of a request awaiting a response
+        '''
+
+        instance = SimuFakeInstance(TEST_TARGET_PORT, notification_period=0, latency=2.2)
+        self.assertTrue(instance.start())
+        reactor = SimuReactor()
+        try:
+            protocol = reactor.create_protocol("127.0.0.1", TEST_TARGET_PORT, TEST_HOST_PORT, request_timeout=3.0)
+            future = protocol.connect()
+            while not future.done():
+                reactor.run_once(5.)
+            self.assertTrue(future.result())
+
+            # The response is received after the keep-alive period
+            future = protocol.read_config(0, 0)
+            loops = 0
+            while not future.done():
+                reactor.run_once(5.)
+                loops += 1
+            self.assertFalse(future.result() == None)
+            self.assertTrue(loops < 10, str(loops))
+
+        finally:
+            reactor.close()
+            instance.stop()
+
+        return
+
+
+if  __name__ == '__main__':
+    unittest.main()